@@ -1,16 +1,59 @@
+from typing import TYPE_CHECKING
+
 from browser_use.logging_config import setup_logging
 
 logger = setup_logging()
 
-from browser_use.agent.prompts import SystemPrompt
-from browser_use.agent.service import Agent
-from browser_use.agent.views import ActionModel, ActionResult, AgentHistoryList
-from browser_use.browser import Browser, BrowserConfig, BrowserContext, BrowserContextConfig, BrowserProfile, BrowserSession
-from browser_use.controller.service import Controller
-from browser_use.dom.service import DomService
+if TYPE_CHECKING:
+	from browser_use.agent.prompts import SystemPrompt
+	from browser_use.agent.replay import BatchReplayer
+	from browser_use.agent.scheduler import AgentScheduler
+	from browser_use.agent.service import Agent
+	from browser_use.agent.views import ActionModel, ActionResult, AgentHistoryList
+	from browser_use.browser import Browser, BrowserConfig, BrowserContext, BrowserContextConfig, BrowserProfile, BrowserSession
+	from browser_use.controller.service import Controller
+	from browser_use.dom.service import DomService
+
+# Public names and the modules they are imported from on first access (PEP 562), so that e.g. a worker which only
+# uses BrowserSession does not pay for importing the agent, langchain and the controller
+_LAZY_IMPORTS = {
+	'Agent': 'browser_use.agent.service',
+	'AgentScheduler': 'browser_use.agent.scheduler',
+	'BatchReplayer': 'browser_use.agent.replay',
+	'Browser': 'browser_use.browser',
+	'BrowserConfig': 'browser_use.browser',
+	'BrowserSession': 'browser_use.browser',
+	'BrowserProfile': 'browser_use.browser',
+	'Controller': 'browser_use.controller.service',
+	'DomService': 'browser_use.dom.service',
+	'SystemPrompt': 'browser_use.agent.prompts',
+	'ActionResult': 'browser_use.agent.views',
+	'ActionModel': 'browser_use.agent.views',
+	'AgentHistoryList': 'browser_use.agent.views',
+	'BrowserContext': 'browser_use.browser',
+	'BrowserContextConfig': 'browser_use.browser',
+}
+
+
+def __getattr__(name: str):
+	if name not in _LAZY_IMPORTS:
+		raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+	import importlib
+
+	value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+	globals()[name] = value  # cache it, later lookups do not go through __getattr__
+	return value
+
+
+def __dir__() -> list[str]:
+	return sorted([*globals(), *_LAZY_IMPORTS])
+
 
 __all__ = [
 	'Agent',
+	'AgentScheduler',
+	'BatchReplayer',
 	'Browser',
 	'BrowserConfig',
 	'BrowserSession',
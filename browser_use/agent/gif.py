@@ -5,15 +5,30 @@ import io
 import logging
 import os
 import platform
+import shutil
+import subprocess
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
 from typing import TYPE_CHECKING
 
-from browser_use.agent.views import AgentHistoryList
-
 if TYPE_CHECKING:
 	from PIL import Image, ImageFont
 
+	from browser_use.agent.views import AgentHistoryList
+
 logger = logging.getLogger(__name__)
 
+# ffmpeg encoder arguments for video output, chosen by the extension of output_path
+VIDEO_CODECS = {
+	'.mp4': ['-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-movflags', '+faststart'],
+	'.webm': ['-c:v', 'libvpx-vp9', '-pix_fmt', 'yuv420p', '-b:v', '0', '-crf', '40'],
+}
+
 
 def decode_unicode_escapes_to_utf8(text: str) -> str:
 	"""Handle decoding any unicode escape sequences embedded in a string (needed to render non-ASCII languages like chinese or arabic in the GIF overlay text)"""
@@ -30,6 +45,22 @@ def decode_unicode_escapes_to_utf8(text: str) -> str:
 		return text
 
 
+@dataclass
+class _FrameJob:
+	"""Everything needed to render one frame"""
+
+	screenshot: str
+	text: str | None  # task for the task frame, goal for a step frame, None for a step without overlay
+	step_number: int | None  # None for the task frame
+	font_size: int
+	title_font_size: int
+	goal_font_size: int
+	margin: int
+	line_spacing: float
+	show_logo: bool
+	video: bool
+
+
 def create_history_gif(
 	task: str,
 	history: AgentHistoryList,
@@ -44,21 +75,185 @@ def create_history_gif(
 	goal_font_size: int = 44,
 	margin: int = 40,
 	line_spacing: float = 1.5,
+	workers: int | None = None,
 ) -> None:
-	"""Create a GIF from the agent's history with overlaid task and goal text."""
+	"""
+	Create a GIF from the agent's history with overlaid task and goal text.
+	If output_path ends in .mp4 or .webm a video is encoded with ffmpeg instead, which is far smaller.
+
+	Frames are rendered by `workers` threads (default up to 4, 0 renders inline) and streamed to the output in order,
+	so only a few decoded screenshots are held in memory at a time. Pillow releases the GIL while it decodes,
+	quantizes and encodes images, which is most of the work. Threads rather than processes, because spawned worker
+	processes would re-run user scripts that start the agent without an `if __name__ == '__main__'` guard.
+	"""
 	if not history.history:
 		logger.warning('No history to create GIF from')
 		return
 
-	from PIL import Image, ImageFont
-
-	images = []
-
 	# if history is empty or first screenshot is None, we can't create a gif
-	if not history.history or not history.history[0].state.screenshot:
+	first_screenshot = history.history[0].state.get_screenshot() if history.history else None
+	if not first_screenshot:
 		logger.warning('No history or first screenshot to create GIF from')
 		return
 
+	video = Path(output_path).suffix.lower() in VIDEO_CODECS
+	if video and not shutil.which('ffmpeg'):
+		logger.warning(f'ffmpeg is required to create {output_path}, install it and re-run or use a .gif output path')
+		return
+
+	def make_job(screenshot: str, text: str | None, step_number: int | None) -> _FrameJob:
+		return _FrameJob(
+			screenshot=screenshot,
+			text=text,
+			step_number=step_number,
+			font_size=font_size,
+			title_font_size=title_font_size,
+			goal_font_size=goal_font_size,
+			margin=margin,
+			line_spacing=line_spacing,
+			show_logo=show_logo,
+			video=video,
+		)
+
+	def iter_jobs() -> Iterator[_FrameJob]:
+		# Create task frame if requested
+		if show_task and task:
+			yield make_job(first_screenshot, task, None)
+
+		# Screenshots are read one by one as the renderer asks for more frames, e.g. from disk if they were moved there
+		for i, item in enumerate(history.history, 1):
+			screenshot = item.state.get_screenshot()
+			if not screenshot:
+				continue
+			goal = item.model_output.current_state.next_goal if show_goals and item.model_output else None
+			yield make_job(screenshot, goal, i)
+
+	if workers is None:
+		workers = min(4, os.cpu_count() or 1)
+	if len(history.history) < 4:
+		workers = 0  # not worth a thread pool for a few frames
+	frames = _render_frames(iter_jobs(), workers)
+
+	if video:
+		written = _write_video(frames, output_path, duration)
+	else:
+		first_frame = next(frames, None)
+		if first_frame is not None:
+			# Pillow pulls the remaining frames from the iterator one at a time while it writes the GIF
+			first_frame.save(output_path, save_all=True, append_images=frames, duration=duration, loop=0, optimize=False)
+		written = first_frame is not None
+
+	if written:
+		logger.info(f'Created {"video" if video else "GIF"} at {output_path}')
+	else:
+		logger.warning('No images found in history to create GIF')
+
+
+def _render_frames(jobs: Iterable[_FrameJob], workers: int) -> Iterator[Image.Image | bytes]:
+	"""Renders the frames in order, at most two per worker ahead of the one being written"""
+	if workers <= 0:
+		for job in jobs:
+			yield _render_frame(job)
+		return
+
+	with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='browser_use_gif') as executor:
+		pending: deque[Future] = deque()
+		for job in jobs:
+			pending.append(executor.submit(_render_frame, job))
+			if len(pending) >= workers * 2:
+				yield pending.popleft().result()
+		while pending:
+			yield pending.popleft().result()
+
+
+def _render_frame(job: _FrameJob) -> Image.Image | bytes:
+	"""Renders one frame, as a palette image ready for the GIF encoder or as PNG bytes for ffmpeg"""
+	from PIL import Image
+
+	regular_font, title_font, _ = _load_fonts(job.font_size, job.title_font_size, job.goal_font_size)
+	logo = _load_logo() if job.show_logo else None
+
+	if job.step_number is None:
+		image = _create_task_frame(job.text or '', job.screenshot, title_font, regular_font, logo, job.line_spacing)  # type: ignore
+	else:
+		image = Image.open(io.BytesIO(base64.b64decode(job.screenshot)))
+		if job.text is not None:
+			image = _add_overlay_to_image(
+				image=image,
+				step_number=job.step_number,
+				goal_text=job.text,
+				regular_font=regular_font,  # type: ignore
+				title_font=title_font,  # type: ignore
+				margin=job.margin,
+				logo=logo,
+			)
+
+	image = image.convert('RGB')
+	if job.video:
+		buffer = io.BytesIO()
+		image.save(buffer, format='PNG', compress_level=1)
+		return buffer.getvalue()
+	# quantize in the worker, so the GIF encoder only keeps the 1 byte per pixel palette image of each frame
+	return image.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+
+
+def _write_video(frames: Iterator[Image.Image | bytes], output_path: str, duration: int) -> bool:
+	"""Pipes PNG frames into ffmpeg, each shown for duration milliseconds, returns whether any frame was written"""
+	command = [
+		'ffmpeg',
+		'-y',
+		'-loglevel',
+		'error',
+		'-f',
+		'image2pipe',
+		'-framerate',
+		f'1000/{duration}',
+		'-c:v',
+		'png',
+		'-i',
+		'-',
+		# video encoders need even dimensions
+		'-vf',
+		'scale=trunc(iw/2)*2:trunc(ih/2)*2',
+		*VIDEO_CODECS[Path(output_path).suffix.lower()],
+		output_path,
+	]
+	process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+	assert process.stdin is not None
+	written = False
+	try:
+		for frame in frames:
+			process.stdin.write(frame)  # type: ignore
+			written = True
+	except BrokenPipeError:
+		pass  # ffmpeg exited early, its error is raised below
+	finally:
+		process.stdin.close()
+		_, stderr = process.communicate()
+	if process.returncode != 0:
+		raise RuntimeError(f'ffmpeg failed to create {output_path}: {stderr.decode(errors="replace").strip()}')
+	return written
+
+
+_thread_fonts = threading.local()
+
+
+def _load_fonts(
+	font_size: int, title_font_size: int, goal_font_size: int
+) -> tuple[ImageFont.FreeTypeFont, ImageFont.FreeTypeFont, ImageFont.FreeTypeFont]:
+	"""Loads the regular, title and goal fonts once per thread and size, a FreeType face must not be shared between threads"""
+	fonts = _thread_fonts.__dict__.setdefault('fonts', {})
+	key = (font_size, title_font_size, goal_font_size)
+	if key not in fonts:
+		fonts[key] = _find_fonts(font_size, title_font_size, goal_font_size)
+	return fonts[key]
+
+
+def _find_fonts(
+	font_size: int, title_font_size: int, goal_font_size: int
+) -> tuple[ImageFont.FreeTypeFont, ImageFont.FreeTypeFont, ImageFont.FreeTypeFont]:
+	from PIL import ImageFont
+
 	# Try to load nicer fonts
 	try:
 		# Try different font options in order of preference
@@ -74,7 +269,6 @@ def create_history_gif(
 			'DejaVuSans',
 			'Verdana',
 		]
-		font_loaded = False
 
 		for font_name in font_options:
 			try:
@@ -84,80 +278,34 @@ def create_history_gif(
 				regular_font = ImageFont.truetype(font_name, font_size)
 				title_font = ImageFont.truetype(font_name, title_font_size)
 				goal_font = ImageFont.truetype(font_name, goal_font_size)
-				font_loaded = True
-				break
+				return regular_font, title_font, goal_font
 			except OSError:
 				continue
 
-		if not font_loaded:
-			raise OSError('No preferred fonts found')
+		raise OSError('No preferred fonts found')
 
 	except OSError:
 		regular_font = ImageFont.load_default()
 		title_font = ImageFont.load_default()
 
-		goal_font = regular_font
-
-	# Load logo if requested
-	logo = None
-	if show_logo:
-		try:
-			logo = Image.open('./static/browser-use.png')
-			# Resize logo to be small (e.g., 40px height)
-			logo_height = 150
-			aspect_ratio = logo.width / logo.height
-			logo_width = int(logo_height * aspect_ratio)
-			logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
-		except Exception as e:
-			logger.warning(f'Could not load logo: {e}')
-
-	# Create task frame if requested
-	if show_task and task:
-		task_frame = _create_task_frame(
-			task,
-			history.history[0].state.screenshot,
-			title_font,  # type: ignore
-			regular_font,  # type: ignore
-			logo,
-			line_spacing,
-		)
-		images.append(task_frame)
+		return regular_font, title_font, regular_font  # type: ignore
 
-	# Process each history item
-	for i, item in enumerate(history.history, 1):
-		if not item.state.screenshot:
-			continue
 
-		# Convert base64 screenshot to PIL Image
-		img_data = base64.b64decode(item.state.screenshot)
-		image = Image.open(io.BytesIO(img_data))
+@cache
+def _load_logo() -> Image.Image | None:
+	"""Loads the logo once, frames only read from it"""
+	from PIL import Image
 
-		if show_goals and item.model_output:
-			image = _add_overlay_to_image(
-				image=image,
-				step_number=i,
-				goal_text=item.model_output.current_state.next_goal,
-				regular_font=regular_font,  # type: ignore
-				title_font=title_font,  # type: ignore
-				margin=margin,
-				logo=logo,
-			)
-
-		images.append(image)
-
-	if images:
-		# Save the GIF
-		images[0].save(
-			output_path,
-			save_all=True,
-			append_images=images[1:],
-			duration=duration,
-			loop=0,
-			optimize=False,
-		)
-		logger.info(f'Created GIF at {output_path}')
-	else:
-		logger.warning('No images found in history to create GIF')
+	try:
+		logo = Image.open('./static/browser-use.png')
+		# Resize logo to be small (e.g., 40px height)
+		logo_height = 150
+		aspect_ratio = logo.width / logo.height
+		logo_width = int(logo_height * aspect_ratio)
+		return logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
+	except Exception as e:
+		logger.warning(f'Could not load logo: {e}')
+		return None
 
 
 def _create_task_frame(
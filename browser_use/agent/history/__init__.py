@@ -0,0 +1,3 @@
+from browser_use.agent.history.service import HistoryWriter, ScreenshotRetention, iter_history, load_history
+
+__all__ = ['HistoryWriter', 'ScreenshotRetention', 'iter_history', 'load_history']
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO
+
+from browser_use.agent.views import AgentHistory, AgentHistoryList, AgentOutput
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FILE_NAME = 'history.jsonl'
+SCREENSHOTS_DIR_NAME = 'screenshots'
+
+
+def _resolve_paths(path: str | Path) -> tuple[Path, Path]:
+	"""Returns the JSONL file and the screenshots directory for a history directory or a path to its history.jsonl"""
+	path = Path(path).expanduser()
+	history_file = path if path.suffix == '.jsonl' and not path.is_dir() else path / HISTORY_FILE_NAME
+	return history_file, history_file.parent / SCREENSHOTS_DIR_NAME
+
+
+def store_screenshot(directory: Path, screenshot_b64: str) -> Path:
+	"""Stores a base64 screenshot as <directory>/<sha256>.png, once per distinct image, and returns its path"""
+	image = base64.b64decode(screenshot_b64)
+	path = directory / f'{hashlib.sha256(image).hexdigest()}.png'
+	if not path.exists():
+		directory.mkdir(parents=True, exist_ok=True)
+		tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+		tmp_path.write_bytes(image)
+		tmp_path.replace(path)  # readers never see a partly written screenshot
+	return path
+
+
+class HistoryWriter:
+	"""
+	Appends agent history to disk one step at a time, instead of rewriting the whole history as one JSON document.
+
+	Every step is written as one line of <path>/history.jsonl and flushed right away, so a crashed run keeps all
+	finished steps. Screenshots are stored once per distinct image as <path>/screenshots/<sha256>.png and the step
+	only references their hash, which keeps the JSONL small and dedupes identical screenshots of unchanged pages.
+
+	Usage:
+		with HistoryWriter('runs/checkout') as writer:
+			writer.append(history_item)
+		for item in iter_history('runs/checkout', agent.AgentOutput):
+			...
+	"""
+
+	def __init__(self, path: str | Path):
+		self.history_file, self.screenshots_dir = _resolve_paths(path)
+		self._file: IO[str] | None = None
+		self.steps_written = 0
+
+	def append(self, item: AgentHistory) -> None:
+		"""Write one step to the end of the history file"""
+		data = item.model_dump()
+		data['state'].pop('screenshot_path', None)
+		data['state']['screenshot'] = None
+		screenshot = item.state.get_screenshot()
+		if screenshot:
+			data['state']['screenshot_hash'] = store_screenshot(self.screenshots_dir, screenshot).stem
+
+		if self._file is None:
+			self._open()
+		self._file.write(json.dumps(data, ensure_ascii=False) + '\n')
+		self._file.flush()
+		self.steps_written += 1
+
+	def _open(self) -> None:
+		self.history_file.parent.mkdir(parents=True, exist_ok=True)
+		# end a line left partly written by a crashed run, so that it does not swallow the first new step
+		needs_newline = False
+		if self.history_file.exists() and self.history_file.stat().st_size:
+			with open(self.history_file, 'rb') as f:
+				f.seek(-1, os.SEEK_END)
+				needs_newline = f.read(1) != b'\n'
+		self._file = open(self.history_file, 'a', encoding='utf-8')
+		if needs_newline:
+			self._file.write('\n')
+
+	def close(self) -> None:
+		if self._file is not None:
+			self._file.close()
+			self._file = None
+
+	def __enter__(self) -> HistoryWriter:
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		self.close()
+
+
+class ScreenshotRetention:
+	"""
+	Bounds how many screenshots a history keeps in memory, as each step holds a full-size base64 PNG.
+
+	Only the newest keep_last steps keep their screenshot in memory. Older screenshots are moved to spill_dir as
+	content-addressed PNG files, from where AgentHistoryList.screenshots() and create_history_gif read them back
+	on demand, or dropped if spill_dir is None.
+	"""
+
+	def __init__(self, keep_last: int, spill_dir: str | Path | None = None):
+		self.keep_last = keep_last
+		self.spill_dir = Path(spill_dir).expanduser() if spill_dir else None
+		self._applied_until = 0  # steps before this index have been handled already
+
+	def apply(self, history: AgentHistoryList) -> None:
+		"""Moves or drops the screenshots of all but the newest keep_last steps"""
+		end = max(len(history.history) - self.keep_last, 0)
+		for item in history.history[self._applied_until : end]:
+			state = item.state
+			if state.screenshot is None:
+				continue
+			if self.spill_dir:
+				try:
+					state.screenshot_path = str(store_screenshot(self.spill_dir, state.screenshot))
+				except OSError as e:
+					logger.warning(f'Failed to move screenshot to {self.spill_dir}, dropping it: {type(e).__name__}: {e}')
+			state.screenshot = None
+		self._applied_until = max(self._applied_until, end)
+
+
+def iter_history(path: str | Path, output_model: type[AgentOutput], load_screenshots: bool = True) -> Iterator[AgentHistory]:
+	"""
+	Streams the steps written by HistoryWriter, parsing one line at a time.
+	Replay does not need the screenshots, pass load_screenshots=False to skip reading them from disk.
+	Lines left partly written by a run that crashed mid-write are skipped.
+	"""
+	history_file, screenshots_dir = _resolve_paths(path)
+	with open(history_file, encoding='utf-8') as f:
+		for line_number, line in enumerate(f, start=1):
+			if not line.strip():
+				continue
+			try:
+				data = json.loads(line)
+			except json.JSONDecodeError:
+				logger.warning(f'Skipping unreadable step on line {line_number} of {history_file}')
+				continue
+
+			screenshot_hash = data['state'].pop('screenshot_hash', None)
+			if screenshot_hash and load_screenshots:
+				try:
+					image = (screenshots_dir / f'{screenshot_hash}.png').read_bytes()
+					data['state']['screenshot'] = base64.b64encode(image).decode('utf-8')
+				except OSError as e:
+					logger.warning(f'Missing screenshot {screenshot_hash} for line {line_number} of {history_file}: {e}')
+
+			yield AgentHistoryList.load_from_dict({'history': [data]}, output_model).history[0]
+
+
+def load_history(path: str | Path, output_model: type[AgentOutput], load_screenshots: bool = True) -> AgentHistoryList:
+	"""Loads all steps written by HistoryWriter into an AgentHistoryList"""
+	return AgentHistoryList(history=list(iter_history(path, output_model, load_screenshots=load_screenshots)))
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import (
@@ -13,10 +15,13 @@ from langchain_core.messages.utils import convert_to_openai_messages
 from browser_use.agent.memory.views import MemoryConfig
 from browser_use.agent.message_manager.service import MessageManager
 from browser_use.agent.message_manager.views import ManagedMessage, MessageMetadata
-from browser_use.utils import time_execution_sync
+from browser_use.utils import time_execution_async, time_execution_sync
 
 logger = logging.getLogger(__name__)
 
+# Shared by all agents in the process so background memory creation can't pile up threads
+_MEMORY_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='browser_use_memory')
+
 
 class Memory:
 	"""
@@ -28,6 +33,9 @@ class Memory:
 	yet comprehensive memory constructs that preserve essential operational knowledge.
 	"""
 
+	_background_task: asyncio.Task[str | None] | None = None
+	_background_messages: list[ManagedMessage] | None = None  # the snapshot the background task summarizes
+
 	def __init__(
 		self,
 		message_manager: MessageManager,
@@ -91,48 +99,125 @@ class Memory:
 		"""
 		logger.debug(f'Creating procedural memory at step {current_step}')
 
-		# Get all messages
-		all_messages = self.message_manager.state.history.messages
+		messages_to_process = self._get_messages_to_process()
+		if messages_to_process is None:
+			return
+
+		memory_content = self._create([m.message for m in messages_to_process if len(m.message.content) > 0], current_step)
+		self._apply_procedural_memory(memory_content, messages_to_process)
+
+	@time_execution_async('--acreate_procedural_memory')
+	async def acreate_procedural_memory(self, current_step: int) -> None:
+		"""
+		Same as create_procedural_memory, but the blocking mem0 summarization runs in a bounded thread pool.
+
+		The messages to consolidate are picked when this coroutine starts running, messages added while the summary is
+		created are kept after the memory. To run it as a background task next to the agent's steps, use
+		start_background_procedural_memory() instead, which snapshots synchronously and applies at step boundaries.
+
+		Args:
+		    current_step: The current step number of the agent
+		"""
+		logger.debug(f'Creating procedural memory at step {current_step}')
+
+		messages_to_process = self._get_messages_to_process()
+		if messages_to_process is None:
+			return
+
+		memory_content = await self._asummarize(messages_to_process, current_step)
+		self._apply_procedural_memory(memory_content, messages_to_process)
 
-		# Separate messages into those to keep as-is and those to process for memory
-		new_messages = []
-		messages_to_process = []
+	def start_background_procedural_memory(self, current_step: int) -> bool:
+		"""
+		Snapshot the messages to consolidate right now and summarize them in a background task.
 
-		for msg in all_messages:
-			if isinstance(msg, ManagedMessage) and msg.metadata.message_type in {'init', 'memory'}:
-				# Keep system and memory messages as they are
-				new_messages.append(msg)
-			else:
-				if len(msg.message.content) > 0:
-					messages_to_process.append(msg)
+		The summary is only swapped into the history by apply_background_procedural_memory(), which the agent calls at
+		the start of a step. So a state message added later in this step is neither summarized nor can the memory end
+		up as the last message while the state message is removed again.
+		Returns False if the previous summary is still being created or there is not enough to summarize.
+		"""
+		self.apply_background_procedural_memory()
+		if self._background_task is not None:
+			logger.debug('Previous procedural memory is still being created, skipping this interval')
+			return False
+
+		messages_to_process = self._get_messages_to_process()
+		if messages_to_process is None:
+			return False
+
+		logger.debug(f'Creating procedural memory in the background at step {current_step}')
+		self._background_task = asyncio.create_task(self._asummarize(messages_to_process, current_step))
+		self._background_messages = messages_to_process
+		return True
+
+	@property
+	def creating_procedural_memory(self) -> bool:
+		"""True while a background summary is being created or waits to be applied"""
+		return self._background_task is not None
+
+	def apply_background_procedural_memory(self) -> bool:
+		"""Swap a finished background summary into the history, returns True if one was applied"""
+		task = self._background_task
+		if task is None or not task.done():
+			return False
+		self._background_task = None
+		messages_to_process, self._background_messages = self._background_messages or [], None
+		if task.cancelled():
+			return False
+		if task.exception() is not None:
+			logger.error(f'Error creating procedural memory: {type(task.exception()).__name__}: {task.exception()}')
+			return False
+		self._apply_procedural_memory(task.result(), messages_to_process)
+		return True
+
+	def cancel_background_procedural_memory(self) -> None:
+		"""Don't leave a pending summary task on the loop"""
+		if self._background_task is not None and not self._background_task.done():
+			self._background_task.cancel()
+		self._background_task = None
+		self._background_messages = None
+
+	async def _asummarize(self, messages_to_process: list[ManagedMessage], current_step: int) -> str | None:
+		loop = asyncio.get_running_loop()
+		return await loop.run_in_executor(
+			_MEMORY_EXECUTOR, self._create, [m.message for m in messages_to_process if len(m.message.content) > 0], current_step
+		)
+
+	def _get_messages_to_process(self) -> list[ManagedMessage] | None:
+		"""Snapshot the messages that the memory will replace, None if there is not enough to summarize"""
+		messages_to_process = [
+			msg for msg in self.message_manager.state.history.messages if msg.metadata.message_type not in {'init', 'memory'}
+		]
 
 		# Need at least 2 messages to create a meaningful summary
-		if len(messages_to_process) <= 1:
+		if len([m for m in messages_to_process if len(m.message.content) > 0]) <= 1:
 			logger.debug('Not enough non-memory messages to summarize')
-			return
-		# Create a procedural memory
-		memory_content = self._create([m.message for m in messages_to_process], current_step)
+			return None
+		return messages_to_process
 
+	def _apply_procedural_memory(self, memory_content: str | None, messages_to_process: list[ManagedMessage]) -> None:
+		"""Replace the processed messages with the consolidated memory, keeping any message added in the meantime"""
 		if not memory_content:
 			logger.warning('Failed to create procedural memory')
 			return
 
-		# Replace the processed messages with the consolidated memory
 		memory_message = HumanMessage(content=memory_content)
 		memory_tokens = self.message_manager._count_tokens(memory_message)
 		memory_metadata = MessageMetadata(tokens=memory_tokens, message_type='memory')
 
-		# Calculate the total tokens being removed
-		removed_tokens = sum(m.metadata.tokens for m in messages_to_process)
-
-		# Add the memory message
-		new_messages.append(ManagedMessage(message=memory_message, metadata=memory_metadata))
+		# Keep system and memory messages first, then the memory, then everything that was not processed
+		processed_ids = {id(m) for m in messages_to_process}
+		history = self.message_manager.state.history
+		kept = [m for m in history.messages if m.metadata.message_type in {'init', 'memory'}]
+		remaining = [
+			m for m in history.messages if m.metadata.message_type not in {'init', 'memory'} and id(m) not in processed_ids
+		]
+		new_messages = kept + [ManagedMessage(message=memory_message, metadata=memory_metadata)] + remaining
 
 		# Update the history
-		self.message_manager.state.history.messages = new_messages
-		self.message_manager.state.history.current_tokens -= removed_tokens
-		self.message_manager.state.history.current_tokens += memory_tokens
-		logger.info(f'Messages consolidated: {len(messages_to_process)} messages converted to procedural memory')
+		history.messages = new_messages
+		history.current_tokens = sum(m.metadata.tokens for m in new_messages)
+		logger.info(f'Messages consolidated: {len(processed_ids)} messages converted to procedural memory')
 
 	def _create(self, messages: list[BaseMessage], current_step: int) -> str | None:
 		parsed_messages = convert_to_openai_messages(messages)
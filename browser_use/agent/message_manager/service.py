@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import logging
 import re
 import shutil
@@ -13,7 +14,8 @@ from langchain_core.messages import (
 )
 from pydantic import BaseModel
 
-from browser_use.agent.message_manager.views import MessageMetadata
+from browser_use.agent.message_manager.utils import SensitiveDataRedactor
+from browser_use.agent.message_manager.views import ManagedMessage, MessageMetadata
 from browser_use.agent.prompts import AgentMessagePrompt
 from browser_use.agent.views import ActionResult, AgentOutput, AgentStepInfo, MessageManagerState
 from browser_use.browser.views import BrowserStateSummary
@@ -183,6 +185,29 @@ def _log_format_message_line(
 # ========== End of Logging Helper Functions ==========
 
 
+def _summarize_step_group(group: list[ManagedMessage]) -> list[str]:
+	"""Reduce one step group to summary lines: goal and actions of the model output, plus its results and errors"""
+	lines: list[str] = []
+	for m in group:
+		message = m.message
+		if isinstance(message, AIMessage) and message.tool_calls:
+			args = message.tool_calls[0].get('args', {})
+			next_goal = (args.get('current_state') or {}).get('next_goal', '')
+			actions = []
+			for action in args.get('action') or []:
+				for name, params in action.items():
+					actions.append(f'{name}({json.dumps(params, ensure_ascii=False)})')
+			lines.append(f'- {_log_clean_whitespace(next_goal) or "step"} -> {", ".join(actions) or "no action"}')
+		elif isinstance(message, HumanMessage) and isinstance(message.content, str):
+			if message.content.startswith('Action result: '):
+				lines.append('  ' + message.content)
+			elif message.content.startswith('Action error: '):
+				lines.append('  ' + message.content[:300])
+			elif message.content.startswith('Your new ultimate task is'):
+				lines.append(message.content)
+	return lines
+
+
 class MessageManagerSettings(BaseModel):
 	max_input_tokens: int = 128000
 	estimated_characters_per_token: int = 3
@@ -192,6 +217,10 @@ class MessageManagerSettings(BaseModel):
 	# Support both old format {key: value} and new format {domain: {key: value}}
 	sensitive_data: dict[str, str | dict[str, str]] | None = None
 	available_file_paths: list[str] | None = None
+	# Rolling history compaction: once the history exceeds compaction_max_tokens (default: 3/4 of max_input_tokens),
+	# older steps are folded into one summary message, the last compaction_keep_last_steps steps stay verbatim
+	compaction_max_tokens: int | None = None
+	compaction_keep_last_steps: int = 5
 
 
 class MessageManager:
@@ -206,6 +235,8 @@ class MessageManager:
 		self.settings = settings
 		self.state = state
 		self.system_prompt = system_message
+		self._redactor: SensitiveDataRedactor | None = None
+		self._redactor_key: tuple | None = None
 
 		# Only initialize messages if state is empty
 		if len(self.state.history.messages) == 0:
@@ -270,7 +301,7 @@ class MessageManager:
 		self.add_tool_message(content='Browser started', message_type='init')
 
 		placeholder_message = HumanMessage(content='[Your task history memory starts here]')
-		self._add_message_with_tokens(placeholder_message)
+		self._add_message_with_tokens(placeholder_message, message_type='init')
 
 		if self.settings.available_file_paths:
 			filepaths_msg = HumanMessage(content=f'Here are file paths you can use: {self.settings.available_file_paths}')
@@ -289,8 +320,12 @@ class MessageManager:
 		result: list[ActionResult] | None = None,
 		step_info: AgentStepInfo | None = None,
 		use_vision=True,
+		elements_text: str | None = None,
 	) -> None:
-		"""Add browser state as human message"""
+		"""Add browser state as human message
+
+		elements_text: precomputed clickable_elements_to_string() of the state, computed here if not given
+		"""
 
 		# if keep in memory, add to directly to history and add state without result
 		if result:
@@ -316,6 +351,7 @@ class MessageManager:
 			result=result,
 			include_attributes=self.settings.include_attributes,
 			step_info=step_info,
+			elements_text=elements_text,
 		).get_user_message(use_vision)
 		self._add_message_with_tokens(state_message)
 
@@ -405,45 +441,34 @@ class MessageManager:
 	@time_execution_sync('--filter_sensitive_data')
 	def _filter_sensitive_data(self, message: BaseMessage) -> BaseMessage:
 		"""Filter out sensitive data from the message"""
+		if not self.settings.sensitive_data:
+			return message
 
-		def replace_sensitive(value: str) -> str:
-			if not self.settings.sensitive_data:
-				return value
-
-			# Collect all sensitive values, immediately converting old format to new format
-			sensitive_values: dict[str, str] = {}
-
-			# Process all sensitive data entries
-			for key_or_domain, content in self.settings.sensitive_data.items():
-				if isinstance(content, dict):
-					# Already in new format: {domain: {key: value}}
-					for key, val in content.items():
-						if val:  # Skip empty values
-							sensitive_values[key] = val
-				elif content:  # Old format: {key: value} - convert to new format internally
-					# We treat this as if it was {'http*://*': {key_or_domain: content}}
-					sensitive_values[key_or_domain] = content
-
-			# If there are no valid sensitive data entries, just return the original value
-			if not sensitive_values:
-				logger.warning('No valid entries found in sensitive_data dictionary')
-				return value
-
-			# Replace all valid sensitive data values with their placeholder tags
-			for key, val in sensitive_values.items():
-				value = value.replace(val, f'<secret>{key}</secret>')
-
-			return value
+		redactor = self._get_sensitive_data_redactor(self.settings.sensitive_data)
+		# If there are no valid sensitive data entries, just return the original message
+		if not redactor.placeholders:
+			logger.warning('No valid entries found in sensitive_data dictionary')
+			return message
 
 		if isinstance(message.content, str):
-			message.content = replace_sensitive(message.content)
+			message.content = redactor.redact(message.content)
 		elif isinstance(message.content, list):
 			for i, item in enumerate(message.content):
 				if isinstance(item, dict) and 'text' in item:
-					item['text'] = replace_sensitive(item['text'])
+					item['text'] = redactor.redact(item['text'])
 					message.content[i] = item
 		return message
 
+	def _get_sensitive_data_redactor(self, sensitive_data: dict[str, str | dict[str, str]]) -> SensitiveDataRedactor:
+		"""The compiled redactor for sensitive_data, rebuilt only when its keys or values change"""
+		cache_key = tuple(
+			(key, tuple(content.items()) if isinstance(content, dict) else content) for key, content in sensitive_data.items()
+		)
+		if self._redactor is None or self._redactor_key != cache_key:
+			self._redactor = SensitiveDataRedactor(sensitive_data)
+			self._redactor_key = cache_key
+		return self._redactor
+
 	def _count_tokens(self, message: BaseMessage) -> int:
 		"""Count tokens in a message using the model's tokenizer"""
 		tokens = 0
@@ -465,6 +490,67 @@ class MessageManager:
 		tokens = len(text) // self.settings.estimated_characters_per_token  # Rough estimate if no tokenizer available
 		return tokens
 
+	@time_execution_sync('--compact_history')
+	def compact_history(self) -> bool:
+		"""Fold old step groups into a single summary message once the history exceeds the compaction budget.
+
+		A step group is everything added between two model outputs: action results, the AIMessage tool call
+		and its ToolMessage. The last `compaction_keep_last_steps` groups stay verbatim, older groups are reduced
+		to their goals, actions and results. If the summary alone still exceeds the budget, its oldest lines are dropped.
+		Returns True if the history was changed.
+		"""
+		history = self.state.history
+		budget = self.settings.compaction_max_tokens or int(self.settings.max_input_tokens * 0.75)
+		if history.current_tokens <= budget:
+			return False
+
+		kept: list[ManagedMessage] = []
+		summary_lines: list[str] = []
+		groups: list[list[ManagedMessage]] = []
+		current: list[ManagedMessage] = []
+		for m in history.messages:
+			if m.metadata.message_type in {'init', 'memory'}:
+				kept.append(m)
+			elif m.metadata.message_type == 'compacted':
+				summary_lines.extend(str(m.message.content).split('\n')[1:])
+			else:
+				current.append(m)
+				if isinstance(m.message, ToolMessage):
+					groups.append(current)
+					current = []
+
+		keep_last = max(self.settings.compaction_keep_last_steps, 0)
+		to_compact = groups[: len(groups) - keep_last] if keep_last else groups
+		if not to_compact:
+			logger.debug('History over compaction budget but no step groups are old enough to compact')
+			return False
+
+		for group in to_compact:
+			summary_lines.extend(_summarize_step_group(group))
+
+		recent = [m for group in groups[len(to_compact) :] for m in group] + current
+		recent_tokens = sum(m.metadata.tokens for m in kept + recent)
+
+		def build_summary() -> ManagedMessage:
+			message = HumanMessage(content='\n'.join(['[Summary of earlier steps]', *summary_lines]))
+			return ManagedMessage(
+				message=message, metadata=MessageMetadata(tokens=self._count_tokens(message), message_type='compacted')
+			)
+
+		summary = build_summary()
+		while summary_lines and recent_tokens + summary.metadata.tokens > budget:
+			summary_lines.pop(0)
+			summary = build_summary()
+
+		new_messages = kept + ([summary] if summary_lines else []) + recent
+		old_tokens = history.current_tokens
+		history.messages = new_messages
+		history.current_tokens = sum(m.metadata.tokens for m in new_messages)
+		logger.debug(
+			f'Compacted {len(to_compact)} old steps into a summary - tokens {old_tokens} -> {history.current_tokens}/{budget}'
+		)
+		return True
+
 	def cut_messages(self):
 		"""Get current message list, potentially trimmed to max tokens"""
 		diff = self.state.history.current_tokens - self.settings.max_input_tokens
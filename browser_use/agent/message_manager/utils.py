@@ -147,3 +147,84 @@ def _write_response_to_file(f: Any, response: Any) -> None:
 	"""Write model response to conversation file"""
 	f.write(' RESPONSE\n')
 	f.write(json.dumps(json.loads(response.model_dump_json(exclude_unset=True)), indent=2))
+
+
+class SensitiveDataRedactor:
+	"""
+	Replaces every sensitive data value in a text with its <secret>key</secret> placeholder, compiled once per
+	sensitive_data dict and applied in one pass over the text.
+
+	Matches are leftmost-longest and never overlap, so a secret containing another secret is replaced as a whole and
+	the inserted placeholders are never rewritten by later secrets. Matches are found with one C-level str.find scan
+	per secret, or with a single regex scan over a trie of all secrets once there are so many secrets that one
+	regex pass is faster than that many scans.
+	"""
+
+	REGEX_MIN_SECRETS = 500  # below this, CPython's str.find scans beat a single re scan
+
+	def __init__(self, sensitive_data: dict[str, str | dict[str, str]]):
+		# value -> placeholder key, for both the old {key: value} and the new {domain: {key: value}} format
+		self.placeholders: dict[str, str] = {}
+		for key_or_domain, content in sensitive_data.items():
+			if isinstance(content, dict):
+				for key, val in content.items():
+					if val:  # Skip empty values
+						self.placeholders.setdefault(val, key)
+			elif content:
+				self.placeholders.setdefault(content, key_or_domain)
+
+		self._values = sorted(self.placeholders, key=len, reverse=True)
+		self._pattern = _compile_trie_regex(self._values) if len(self._values) >= self.REGEX_MIN_SECRETS else None
+
+	def redact(self, text: str) -> str:
+		if self._pattern is not None:
+			return self._pattern.sub(lambda match: f'<secret>{self.placeholders[match.group()]}</secret>', text)
+
+		matches: list[tuple[int, int, str]] = []  # (start, -length, value), sorts leftmost first, then longest first
+		for value in self._values:
+			start = text.find(value)
+			while start != -1:
+				matches.append((start, -len(value), value))
+				start = text.find(value, start + 1)  # overlapping occurrences too, the sort below picks which ones to keep
+		if not matches:
+			return text
+
+		matches.sort()
+		parts: list[str] = []
+		end = 0
+		for start, negative_length, value in matches:
+			if start < end:
+				continue  # overlaps a longer or earlier match
+			parts.append(text[end:start])
+			parts.append(f'<secret>{self.placeholders[value]}</secret>')
+			end = start - negative_length
+		parts.append(text[end:])
+		return ''.join(parts)
+
+
+def _compile_trie_regex(values: list[str]) -> re.Pattern[str]:
+	"""Compiles the values into one regex shaped like their prefix trie, which prefers the longest value at each position"""
+	trie: dict[str, dict] = {}
+	for value in values:
+		node = trie
+		for char in value:
+			node = node.setdefault(char, {})
+		node[''] = {}  # a value ends here
+
+	def to_regex(node: dict[str, dict]) -> str:
+		branches = []
+		for char, child in node.items():
+			if not char:
+				continue
+			# runs of single-child nodes become one literal, so long secrets like keys do not recurse per character
+			literal = char
+			while len(child) == 1 and '' not in child:
+				next_char, child = next(iter(child.items()))
+				literal += next_char
+			branches.append(re.escape(literal) + to_regex(child))
+		if not branches:
+			return ''
+		regex = branches[0] if len(branches) == 1 else f'(?:{"|".join(branches)})'
+		return f'(?:{regex})?' if '' in node else regex
+
+	return re.compile(to_regex(trie))
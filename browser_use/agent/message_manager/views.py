@@ -121,7 +121,12 @@ class MessageHistory(BaseModel):
 
 	def remove_last_state_message(self) -> None:
 		"""Remove last state message from history"""
-		if len(self.messages) > 2 and isinstance(self.messages[-1].message, HumanMessage):
+		# never drop consolidated history, e.g. a procedural memory that was swapped in as the last message
+		if (
+			len(self.messages) > 2
+			and isinstance(self.messages[-1].message, HumanMessage)
+			and self.messages[-1].metadata.message_type not in {'memory', 'compacted'}
+		):
 			self.current_tokens -= self.messages[-1].metadata.tokens
 			self.messages.pop()
 
@@ -0,0 +1,4 @@
+from browser_use.agent.replay.service import BatchReplayer
+from browser_use.agent.replay.views import QueuedReplay, ReplayMetrics, ReplayResult
+
+__all__ = ['BatchReplayer', 'QueuedReplay', 'ReplayMetrics', 'ReplayResult']
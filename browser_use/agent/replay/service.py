@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from browser_use.agent.replay.views import QueuedReplay, ReplayMetrics, ReplayResult
+from browser_use.agent.service import Agent
+from browser_use.agent.views import AgentHistory, AgentHistoryList
+from browser_use.browser import BrowserProfile, BrowserSession
+
+logger = logging.getLogger(__name__)
+
+
+class BatchReplayer:
+	"""
+	Replays many saved agent histories concurrently over a pool of browsers, e.g. as regression tests of recorded flows.
+
+	Each browser slot owns one BrowserSession of the pool and one Agent, and replays queued histories one after another
+	on them. Before each replay after the first, the slot's extra tabs are closed and the cookies and storage left by
+	the previous replay are cleared, so replays do not see each other's logins, carts or open tabs.
+	Instead of sleeping a fixed delay after every step, steps wait for the page to be ready and failed steps are
+	retried as soon as the page changes, see Agent.rerun_history(delay_between_actions=None). Every result reports
+	the timing, attempts and element match failures of each step, the metrics add them up over all replays.
+
+	Usage:
+		replayer = BatchReplayer(llm=llm, max_browsers=8)
+		for path in Path('flows').glob('*.json'):
+			replayer.submit(path)
+		results = await replayer.run()
+		print(replayer.metrics.failed, [(r.name, r.failed_steps) for r in results if not r.success])
+	"""
+
+	def __init__(
+		self,
+		llm: BaseChatModel,
+		max_browsers: int = 3,
+		browser_profile: BrowserProfile | None = None,
+		browser_sessions: list[BrowserSession] | None = None,
+		max_retries: int = 3,
+		skip_failures: bool = False,
+		retry_timeout: float = 5.0,
+		timeout: float | None = None,
+		on_result: Callable[[ReplayResult], None] | None = None,
+		reset_between_replays: bool = True,
+		**agent_kwargs: Any,
+	):
+		"""
+		Args:
+			llm: LLM for the replaying agents, used by actions like extract_content
+			max_browsers: number of browser sessions in the pool, ignored if browser_sessions are passed
+			browser_profile: profile for the pooled browser sessions
+			browser_sessions: use these existing sessions as the pool instead of launching new ones, they are left running
+			max_retries: attempts per step before it fails
+			skip_failures: keep replaying the following steps of a history after a step failed
+			retry_timeout: max seconds to wait for the page to change before retrying a failed step
+			timeout: default timeout in seconds per replay, None = no timeout
+			on_result: called with each result as soon as its replay finishes
+			reset_between_replays: close extra tabs and clear cookies and storage between the replays of a browser slot,
+				the cookies a session had before its first replay (e.g. a login loaded from storage_state) are kept
+			agent_kwargs: extra Agent(...) kwargs, e.g. controller or sensitive_data
+		"""
+		self.llm = llm
+		self.max_retries = max_retries
+		self.skip_failures = skip_failures
+		self.retry_timeout = retry_timeout
+		self.timeout = timeout
+		self.on_result = on_result
+		self.reset_between_replays = reset_between_replays
+		self.agent_kwargs = agent_kwargs
+
+		self._owns_sessions = browser_sessions is None
+		if browser_sessions is None:
+			assert max_browsers >= 1, 'max_browsers must be at least 1'
+			# keep_alive so replays finishing a history don't close the pooled browser for the next one
+			profile = (browser_profile or BrowserProfile()).model_copy(update={'keep_alive': True})
+			browser_sessions = [BrowserSession(browser_profile=profile) for _ in range(max_browsers)]
+		self.browser_sessions = browser_sessions
+
+		self.metrics = ReplayMetrics()
+		self.results: list[ReplayResult] = []
+
+		self._queue: asyncio.Queue[tuple[float, QueuedReplay]] = asyncio.Queue()
+		self._counter = itertools.count(1)
+
+	def submit(self, history: AgentHistoryList | str | Path, name: str | None = None, timeout: float | None = None) -> str:
+		"""
+		Queue a history to replay, either loaded or as a path to a history file (.json) or a history directory or .jsonl
+		file written with Agent(save_history_path=...). Returns its replay_id.
+		"""
+		number = next(self._counter)
+		if isinstance(history, AgentHistoryList):
+			queued = QueuedReplay(name=name or f'history {number}', history=history, timeout=timeout)
+		else:
+			queued = QueuedReplay(name=name or Path(history).stem, history_file=str(history), timeout=timeout)
+		self._queue.put_nowait((time.monotonic(), queued))
+		self.metrics.submitted += 1
+		return queued.replay_id
+
+	async def run(self) -> list[ReplayResult]:
+		"""Replay queued histories until the queue is empty, returns the results of this run in completion order"""
+		self.metrics.started_at = self.metrics.started_at or time.monotonic()
+		self.metrics.finished_at = None
+		results_before = len(self.results)
+		try:
+			await asyncio.gather(*(self._worker(session) for session in self.browser_sessions))
+		finally:
+			self.metrics.finished_at = time.monotonic()
+		logger.info(
+			f'📊 Replayed {self.metrics.finished} histories ({self.metrics.passed} passed, {self.metrics.failed} failed) with '
+			f'{self.metrics.total_steps} steps, {self.metrics.failed_steps} failed steps and {self.metrics.match_failures} '
+			f'element match failures, {self.metrics.avg_step_seconds:.2f}s per step on average'
+		)
+		return self.results[results_before:]
+
+	async def close(self) -> None:
+		"""Kill the browsers launched by the replayer"""
+		if self._owns_sessions:
+			await asyncio.gather(*(session.kill() for session in self.browser_sessions), return_exceptions=True)
+
+	async def _worker(self, browser_session: BrowserSession) -> None:
+		"""Replay histories from the queue on one pooled browser session until the queue is empty"""
+		agent: Agent | None = None  # reused for all replays of this slot, rerun_history keeps no state between histories
+		initial_cookies: list | None = None  # cookies of the session before its first replay, restored on every reset
+		visited_urls: set[str] = set()  # pages whose storage the previous replay may have changed
+
+		async def replay(queued: QueuedReplay, result: ReplayResult) -> None:
+			nonlocal agent, initial_cookies
+			if agent is None:
+				agent = self._make_agent(browser_session)
+			if self.reset_between_replays:
+				if initial_cookies is None:
+					await browser_session.start()
+					assert browser_session.browser_context is not None
+					initial_cookies = list(await browser_session.browser_context.cookies())
+				else:
+					await browser_session.reset_browsing_state(visited_urls, initial_cookies)
+					visited_urls.clear()
+			await self._replay(queued, agent, result, visited_urls)
+
+		while True:
+			try:
+				queued_at, queued = self._queue.get_nowait()
+			except asyncio.QueueEmpty:
+				return
+			self.metrics.running += 1
+			start = time.monotonic()
+			result = ReplayResult(replay_id=queued.replay_id, name=queued.name, queued_seconds=start - queued_at)
+			timeout = queued.timeout or self.timeout
+			try:
+				await asyncio.wait_for(replay(queued, result), timeout=timeout)
+			except TimeoutError:
+				result.error = f'Replay timed out after {timeout}s'
+				result.timed_out = True
+				logger.warning(f'⏱️ Replay of {queued.name} timed out')
+			except Exception as e:
+				result.error = f'{type(e).__name__}: {e}'
+				logger.error(f'❌ Replay of {queued.name} failed: {result.error}')
+			finally:
+				result.run_seconds = time.monotonic() - start
+				self.metrics.running -= 1
+				self.metrics.add(result)
+				self.results.append(result)
+				self._queue.task_done()
+				if self.on_result:
+					try:
+						self.on_result(result)
+					except Exception as e:
+						logger.error(f'❌ on_result callback failed for replay {queued.name}: {type(e).__name__}: {e}')
+
+	def _make_agent(self, browser_session: BrowserSession) -> Agent:
+		return Agent(task='Replay saved histories', llm=self.llm, browser_session=browser_session, **self.agent_kwargs)
+
+	async def _replay(self, queued: QueuedReplay, agent: Agent, result: ReplayResult, visited_urls: set[str]) -> None:
+		"""Replay one history with the slot's Agent, filling in the result as it goes"""
+		history = queued.history
+		if history is None:
+			# parsing a whole .json history would block the other slots, .jsonl histories are streamed
+			history = await asyncio.to_thread(agent._load_history_to_rerun, queued.history_file)
+		if isinstance(history, AgentHistoryList):
+			visited_urls.update(url for url in history.urls() if url)
+		else:
+			history = _record_urls(history, visited_urls)
+		result.results = await agent.rerun_history(
+			history,
+			max_retries=self.max_retries,
+			skip_failures=self.skip_failures,
+			delay_between_actions=None,
+			stats=result.steps,
+			retry_timeout=self.retry_timeout,
+		)
+
+
+def _record_urls(steps: Iterable[AgentHistory], urls: set[str]) -> Iterator[AgentHistory]:
+	"""Passes streamed history steps through, adding the url of each step's page to urls"""
+	for step in steps:
+		if step.state.url:
+			urls.add(step.state.url)
+		yield step
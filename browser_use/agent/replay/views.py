@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import time
+
+from pydantic import BaseModel, ConfigDict, Field
+from uuid_extensions import uuid7str
+
+from browser_use.agent.views import ActionResult, AgentHistoryList, ReplayStepStats
+
+
+class QueuedReplay(BaseModel):
+	"""A history waiting in the BatchReplayer queue"""
+
+	model_config = ConfigDict(arbitrary_types_allowed=True)
+
+	replay_id: str = Field(default_factory=uuid7str)
+	name: str
+	history: AgentHistoryList | None = None  # either the history itself or the file to load it from
+	history_file: str | None = None
+	timeout: float | None = None  # seconds for the whole replay, None = replayer default
+
+
+class ReplayResult(BaseModel):
+	"""Outcome of one replayed history"""
+
+	replay_id: str
+	name: str
+	steps: list[ReplayStepStats] = Field(default_factory=list)
+	results: list[ActionResult] = Field(default_factory=list)
+	error: str | None = None  # the replay was aborted, e.g. by a failed step, a timeout or an unreadable file
+	timed_out: bool = False
+	queued_seconds: float = 0.0
+	run_seconds: float = 0.0
+
+	@property
+	def failed_steps(self) -> list[ReplayStepStats]:
+		return [step for step in self.steps if step.error]
+
+	@property
+	def match_failures(self) -> int:
+		"""Attempts that failed because an element of the history was not found on the page"""
+		return sum(step.match_failures for step in self.steps)
+
+	@property
+	def success(self) -> bool:
+		"""True if every step of the history was replayed"""
+		return self.error is None and not self.failed_steps
+
+
+class ReplayMetrics(BaseModel):
+	"""Counters of a BatchReplayer, updated live while it runs"""
+
+	submitted: int = 0
+	running: int = 0
+	passed: int = 0
+	failed: int = 0  # replays with an error or a failed step, including timeouts
+	timed_out: int = 0
+	total_steps: int = 0
+	failed_steps: int = 0
+	retried_steps: int = 0
+	match_failures: int = 0
+	total_step_seconds: float = 0.0
+	max_step_seconds: float = 0.0
+	started_at: float | None = None
+	finished_at: float | None = None
+
+	@property
+	def finished(self) -> int:
+		return self.passed + self.failed
+
+	@property
+	def elapsed_seconds(self) -> float:
+		if self.started_at is None:
+			return 0.0
+		return (self.finished_at or time.monotonic()) - self.started_at
+
+	@property
+	def replays_per_minute(self) -> float:
+		elapsed = self.elapsed_seconds
+		return self.finished / elapsed * 60 if elapsed else 0.0
+
+	@property
+	def avg_step_seconds(self) -> float:
+		return self.total_step_seconds / self.total_steps if self.total_steps else 0.0
+
+	def add(self, result: ReplayResult) -> None:
+		"""Count a finished replay"""
+		if result.success:
+			self.passed += 1
+		else:
+			self.failed += 1
+		self.timed_out += result.timed_out
+		for step in result.steps:
+			if step.skipped:
+				continue
+			self.total_steps += 1
+			self.failed_steps += step.error is not None
+			self.retried_steps += step.attempts > 1
+			self.match_failures += step.match_failures
+			self.total_step_seconds += step.seconds
+			self.max_step_seconds = max(self.max_step_seconds, step.seconds)
@@ -0,0 +1,4 @@
+from browser_use.agent.scheduler.service import AgentScheduler, ProcessAgentRunner
+from browser_use.agent.scheduler.views import ScheduledTask, ScheduledTaskResult, SchedulerMetrics
+
+__all__ = ['AgentScheduler', 'ProcessAgentRunner', 'ScheduledTask', 'ScheduledTaskResult', 'SchedulerMetrics']
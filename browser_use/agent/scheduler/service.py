@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from browser_use.agent.scheduler.views import ScheduledTask, ScheduledTaskResult, SchedulerMetrics
+from browser_use.agent.service import Agent
+from browser_use.agent.views import AgentHistoryList, AgentOutput
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.controller.service import Controller
+
+logger = logging.getLogger(__name__)
+
+
+class AgentScheduler:
+	"""
+	Runs a queue of agent tasks in one process with separate limits for browsers and LLM calls.
+
+	Each browser slot owns one BrowserSession from the pool and runs queued tasks one after another on it, highest
+	priority first. All agents share one semaphore around their LLM calls, so max_llm_calls can be set lower (or
+	higher) than max_browsers: browsers keep working on page state while other agents wait for the model. The limit
+	covers the agents' next-action and planner calls, extract_content and memory summarization calls are not bounded.
+	Between tasks each session is reset (extra tabs closed, cookies and storage cleared) unless reset_between_tasks=False.
+
+	Usage:
+		scheduler = AgentScheduler(llm=llm, max_browsers=4, max_llm_calls=2)
+		scheduler.submit('Find the price of ...', priority=1, timeout=300)
+		results = await scheduler.run()
+		print(scheduler.metrics.tasks_per_minute)
+	"""
+
+	def __init__(
+		self,
+		llm: BaseChatModel,
+		max_browsers: int = 3,
+		max_llm_calls: int | None = None,
+		browser_profile: BrowserProfile | None = None,
+		browser_sessions: list[BrowserSession] | None = None,
+		max_steps: int = 100,
+		timeout: float | None = None,
+		on_result: Callable[[ScheduledTaskResult], None] | None = None,
+		reset_between_tasks: bool = True,
+		**agent_kwargs: Any,
+	):
+		"""
+		Args:
+			llm: default LLM for all agents, can be overridden per task with submit(..., llm=...)
+			max_browsers: number of browser sessions in the pool, ignored if browser_sessions are passed
+			max_llm_calls: max concurrent LLM calls across all agents, None = one per browser
+			browser_profile: profile for the pooled browser sessions
+			browser_sessions: use these existing sessions as the pool instead of launching new ones, they are left running
+			max_steps: default max steps per task
+			timeout: default timeout in seconds per task, None = no timeout
+			on_result: called with each result as soon as its task finishes
+			reset_between_tasks: close extra tabs and clear the cookies and storage a task left in its pooled session before
+				the next task starts, False = tasks on the same session share their login state
+			agent_kwargs: default extra Agent(...) kwargs for all tasks
+		"""
+		self.llm = llm
+		self.max_steps = max_steps
+		self.timeout = timeout
+		self.on_result = on_result
+		self.reset_between_tasks = reset_between_tasks
+		self.agent_kwargs = agent_kwargs
+
+		self._owns_sessions = browser_sessions is None
+		if browser_sessions is None:
+			assert max_browsers >= 1, 'max_browsers must be at least 1'
+			# keep_alive so agents finishing a task don't close the pooled browser for the next one
+			profile = (browser_profile or BrowserProfile()).model_copy(update={'keep_alive': True})
+			browser_sessions = [BrowserSession(browser_profile=profile) for _ in range(max_browsers)]
+		self.browser_sessions = browser_sessions
+
+		self.llm_semaphore = asyncio.Semaphore(max_llm_calls or len(self.browser_sessions))
+		self.metrics = SchedulerMetrics()
+		self.results: list[ScheduledTaskResult] = []
+
+		self._queue: asyncio.PriorityQueue[tuple[int, int, float, ScheduledTask]] = asyncio.PriorityQueue()
+		self._counter = itertools.count()
+
+	def submit(
+		self,
+		task: str,
+		priority: int = 0,
+		timeout: float | None = None,
+		max_steps: int | None = None,
+		**agent_kwargs: Any,
+	) -> str:
+		"""Queue a task, returns its task_id. Tasks can be submitted before or while run() is running."""
+		scheduled = ScheduledTask(task=task, priority=priority, timeout=timeout, max_steps=max_steps, agent_kwargs=agent_kwargs)
+		return self.submit_task(scheduled)
+
+	def submit_task(self, scheduled: ScheduledTask) -> str:
+		"""Queue an already built ScheduledTask, returns its task_id"""
+		self._queue.put_nowait((-scheduled.priority, next(self._counter), time.monotonic(), scheduled))
+		self.metrics.submitted += 1
+		return scheduled.task_id
+
+	async def run(self) -> list[ScheduledTaskResult]:
+		"""Run queued tasks until the queue is empty, returns the results of this run in completion order"""
+		self.metrics.started_at = self.metrics.started_at or time.monotonic()
+		self.metrics.finished_at = None
+		results_before = len(self.results)
+		try:
+			await asyncio.gather(*(self._worker(session) for session in self.browser_sessions))
+		finally:
+			self.metrics.finished_at = time.monotonic()
+		logger.info(
+			f'📊 Scheduler finished {self.metrics.finished} tasks ({self.metrics.completed} completed, {self.metrics.failed} failed, '
+			f'{self.metrics.timed_out} timed out) at {self.metrics.tasks_per_minute:.1f} tasks/min'
+		)
+		return self.results[results_before:]
+
+	async def close(self) -> None:
+		"""Kill the browsers launched by the scheduler"""
+		if self._owns_sessions:
+			await asyncio.gather(*(session.kill() for session in self.browser_sessions), return_exceptions=True)
+
+	async def _worker(self, browser_session: BrowserSession) -> None:
+		"""Run tasks from the queue on one pooled browser session until the queue is empty"""
+		initial_cookies: list | None = None  # cookies of the session before its first task, restored on every reset
+		visited_urls: set[str] = set()  # pages whose storage the previous task may have changed
+		while True:
+			try:
+				_, _, queued_at, scheduled = self._queue.get_nowait()
+			except asyncio.QueueEmpty:
+				return
+			queued_seconds = time.monotonic() - queued_at
+			self.metrics.running += 1
+			start = time.monotonic()
+			result = ScheduledTaskResult(task_id=scheduled.task_id, task=scheduled.task, queued_seconds=queued_seconds)
+			try:
+				if self.reset_between_tasks:
+					if initial_cookies is None:
+						await browser_session.start()
+						assert browser_session.browser_context is not None
+						initial_cookies = list(await browser_session.browser_context.cookies())
+					else:
+						await browser_session.reset_browsing_state(visited_urls, initial_cookies)
+						visited_urls.clear()
+				result.history = await asyncio.wait_for(
+					self._run_task(scheduled, browser_session), timeout=scheduled.timeout or self.timeout
+				)
+				self.metrics.completed += 1
+				self.metrics.total_steps += result.history.number_of_steps()
+				visited_urls.update(url for url in result.history.urls() if url)
+			except TimeoutError:
+				result.error = f'Task timed out after {scheduled.timeout or self.timeout}s'
+				result.timed_out = True
+				self.metrics.timed_out += 1
+				logger.warning(f'⏱️ Scheduled task {scheduled.task_id} timed out')
+			except Exception as e:
+				result.error = f'{type(e).__name__}: {e}'
+				self.metrics.failed += 1
+				logger.error(f'❌ Scheduled task {scheduled.task_id} failed: {result.error}')
+			finally:
+				result.run_seconds = time.monotonic() - start
+				self.metrics.running -= 1
+				self.metrics.total_run_seconds += result.run_seconds
+				self.metrics.total_queued_seconds += queued_seconds
+				self.results.append(result)
+				self._queue.task_done()
+				if self.on_result:
+					try:
+						self.on_result(result)
+					except Exception as e:
+						logger.error(f'❌ on_result callback failed for task {scheduled.task_id}: {type(e).__name__}: {e}')
+
+	async def _run_task(self, scheduled: ScheduledTask, browser_session: BrowserSession) -> AgentHistoryList:
+		"""Run one task with an Agent on the given browser session"""
+		agent_kwargs = {'llm': self.llm, **self.agent_kwargs, **scheduled.agent_kwargs}
+		agent = Agent(
+			task=scheduled.task,
+			browser_session=browser_session,
+			llm_semaphore=self.llm_semaphore,
+			**agent_kwargs,
+		)
+		return await agent.run(max_steps=scheduled.max_steps or self.max_steps)
+
+
+def _serialize_result(result: ScheduledTaskResult) -> dict[str, Any]:
+	"""Make a result picklable, dynamically created AgentOutput models can't cross process boundaries"""
+	data = result.model_dump(exclude={'history'})
+	data['history'] = result.history.model_dump() if result.history is not None else None
+	return data
+
+
+def _merge_shard_kwargs(agent_kwargs: dict[str, Any], scheduler_kwargs: dict[str, Any]) -> dict[str, Any]:
+	"""
+	Merge the factory's agent kwargs with the runner's AgentScheduler kwargs into one dict. The runner's own settings
+	(llm, max_steps, timeout, browser_profile, ...) take precedence over colliding keys returned by agent_kwargs_factory.
+	"""
+	ignored = sorted(key for key in agent_kwargs if key in scheduler_kwargs)
+	if ignored:
+		logger.warning(
+			f'⚠️ Ignoring {", ".join(ignored)} returned by agent_kwargs_factory, pass them to ProcessAgentRunner(...) instead'
+		)
+	return {**agent_kwargs, **scheduler_kwargs}
+
+
+def _run_shard(
+	tasks: list[ScheduledTask],
+	llm_factory: Callable[[], BaseChatModel],
+	agent_kwargs_factory: Callable[[], dict[str, Any]] | None,
+	scheduler_kwargs: dict[str, Any],
+	sink: Any,
+) -> None:
+	"""Entrypoint of a ProcessAgentRunner worker process: run one shard on its own AgentScheduler"""
+
+	async def run_shard() -> None:
+		agent_kwargs = agent_kwargs_factory() if agent_kwargs_factory else {}
+		scheduler = AgentScheduler(
+			**_merge_shard_kwargs(
+				agent_kwargs,
+				{**scheduler_kwargs, 'llm': llm_factory(), 'on_result': lambda result: sink.put(_serialize_result(result))},
+			)
+		)
+		for scheduled in tasks:
+			scheduler.submit_task(scheduled)
+		try:
+			await scheduler.run()
+		finally:
+			await scheduler.close()
+
+	asyncio.run(run_shard())
+
+
+class ProcessAgentRunner:
+	"""
+	Shards agent tasks across worker processes so a fleet of agents can use all CPU cores.
+
+	Every worker process runs its shard on its own AgentScheduler (browser pool + LLM limit), results are streamed
+	back through one shared queue as soon as each task finishes. Processes are started with the 'spawn' method,
+	so the LLM and any extra Agent kwargs are built inside each worker by picklable (module-level) factories.
+
+	Usage:
+		def make_llm():
+			return ChatOpenAI(model='gpt-4o')
+
+		runner = ProcessAgentRunner(llm_factory=make_llm, processes=4, max_browsers_per_process=3)
+		for task in tasks:
+			runner.submit(task)
+		results = await runner.run()
+		history = runner.combined_history()
+	"""
+
+	def __init__(
+		self,
+		llm_factory: Callable[[], BaseChatModel],
+		processes: int | None = None,
+		max_browsers_per_process: int = 2,
+		max_llm_calls_per_process: int | None = None,
+		max_steps: int = 100,
+		timeout: float | None = None,
+		agent_kwargs_factory: Callable[[], dict[str, Any]] | None = None,
+		on_result: Callable[[ScheduledTaskResult], None] | None = None,
+		browser_profile: BrowserProfile | None = None,
+	):
+		"""
+		Args:
+			llm_factory: picklable callable returning the LLM, called once in each worker process
+			processes: number of worker processes, None = number of CPU cores (never more than there are tasks)
+			max_browsers_per_process: browser pool size of each worker's AgentScheduler
+			max_llm_calls_per_process: LLM call limit of each worker's AgentScheduler
+			max_steps: default max steps per task
+			timeout: default timeout in seconds per task
+			agent_kwargs_factory: picklable callable returning extra Agent(...) kwargs (e.g. a controller with custom actions),
+				keys that are also arguments of this runner (max_steps, timeout, browser_profile, ...) are ignored
+			on_result: called in this process with each result as soon as it arrives
+			browser_profile: profile for the pooled browser sessions of all workers
+		"""
+		self.llm_factory = llm_factory
+		self.processes = processes or os.cpu_count() or 1
+		self.agent_kwargs_factory = agent_kwargs_factory
+		self.on_result = on_result
+		self.scheduler_kwargs: dict[str, Any] = {
+			'max_browsers': max_browsers_per_process,
+			'max_llm_calls': max_llm_calls_per_process,
+			'browser_profile': browser_profile,
+			'max_steps': max_steps,
+			'timeout': timeout,
+		}
+		self.metrics = SchedulerMetrics()
+		self.results: list[ScheduledTaskResult] = []
+		self._tasks: list[ScheduledTask] = []
+
+	def submit(
+		self,
+		task: str,
+		priority: int = 0,
+		timeout: float | None = None,
+		max_steps: int | None = None,
+		**agent_kwargs: Any,
+	) -> str:
+		"""Queue a task before run(), returns its task_id. Extra Agent kwargs must be picklable."""
+		scheduled = ScheduledTask(task=task, priority=priority, timeout=timeout, max_steps=max_steps, agent_kwargs=agent_kwargs)
+		self._tasks.append(scheduled)
+		self.metrics.submitted += 1
+		return scheduled.task_id
+
+	def shard(self) -> list[list[ScheduledTask]]:
+		"""Split the queued tasks round-robin by priority, so every worker gets a similar mix"""
+		tasks = sorted(self._tasks, key=lambda t: -t.priority)
+		n_shards = max(1, min(self.processes, len(tasks)))
+		return [shard for shard in (tasks[i::n_shards] for i in range(n_shards)) if shard]
+
+	async def run(self) -> list[ScheduledTaskResult]:
+		"""Run all queued tasks across the worker processes, returns the results in completion order"""
+		shards = self.shard()
+		self._tasks = []
+		self.metrics.started_at = time.monotonic()
+		self.metrics.finished_at = None
+		loop = asyncio.get_running_loop()
+		output_model = self._output_model()
+		results: list[ScheduledTaskResult] = []
+
+		mp_context = multiprocessing.get_context('spawn')
+		with mp_context.Manager() as manager, ProcessPoolExecutor(max_workers=len(shards) or 1, mp_context=mp_context) as pool:
+			sink = manager.Queue()
+			futures = [
+				loop.run_in_executor(
+					pool, _run_shard, shard, self.llm_factory, self.agent_kwargs_factory, self.scheduler_kwargs, sink
+				)
+				for shard in shards
+			]
+
+			async def close_sink_when_done() -> list[BaseException | None]:
+				outcomes = await asyncio.gather(*futures, return_exceptions=True)
+				sink.put(None)
+				return outcomes
+
+			shards_done = asyncio.create_task(close_sink_when_done())
+			while (data := await loop.run_in_executor(None, sink.get)) is not None:
+				results.append(self._collect(data, output_model))
+			outcomes = await shards_done
+
+		# tasks of a crashed worker process never report back, record them as failed
+		reported = {r.task_id for r in results}
+		for shard, outcome in zip(shards, outcomes):
+			if isinstance(outcome, BaseException):
+				logger.error(f'❌ Worker process crashed: {type(outcome).__name__}: {outcome}')
+				for scheduled in shard:
+					if scheduled.task_id not in reported:
+						error = f'Worker process crashed: {type(outcome).__name__}: {outcome}'
+						results.append(
+							self._record(ScheduledTaskResult(task_id=scheduled.task_id, task=scheduled.task, error=error))
+						)
+
+		self.metrics.finished_at = time.monotonic()
+		logger.info(
+			f'📊 {len(shards)} worker processes finished {self.metrics.finished} tasks ({self.metrics.completed} completed, '
+			f'{self.metrics.failed} failed, {self.metrics.timed_out} timed out) at {self.metrics.tasks_per_minute:.1f} tasks/min'
+		)
+		return results
+
+	def combined_history(self) -> AgentHistoryList:
+		"""All steps of all finished tasks in one AgentHistoryList, in completion order"""
+		return AgentHistoryList(history=[step for r in self.results if r.history for step in r.history.history])
+
+	def _output_model(self) -> type[AgentOutput]:
+		"""AgentOutput model used to rebuild the histories sent back by the workers"""
+		agent_kwargs = self.agent_kwargs_factory() if self.agent_kwargs_factory else {}
+		controller = agent_kwargs.get('controller') or Controller()
+		return AgentOutput.type_with_custom_actions(controller.registry.create_action_model())
+
+	def _collect(self, data: dict[str, Any], output_model: type[AgentOutput]) -> ScheduledTaskResult:
+		"""Rebuild a result sent back by a worker and record it"""
+		history = data.pop('history')
+		result = ScheduledTaskResult(**data)
+		if history is not None:
+			result.history = AgentHistoryList.load_from_dict(history, output_model)
+		return self._record(result)
+
+	def _record(self, result: ScheduledTaskResult) -> ScheduledTaskResult:
+		if result.timed_out:
+			self.metrics.timed_out += 1
+		elif result.error is not None:
+			self.metrics.failed += 1
+		else:
+			self.metrics.completed += 1
+			self.metrics.total_steps += result.history.number_of_steps() if result.history else 0
+		self.metrics.total_run_seconds += result.run_seconds
+		self.metrics.total_queued_seconds += result.queued_seconds
+		self.results.append(result)
+		if self.on_result:
+			try:
+				self.on_result(result)
+			except Exception as e:
+				logger.error(f'❌ on_result callback failed for task {result.task_id}: {type(e).__name__}: {e}')
+		return result
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
+from uuid_extensions import uuid7str
+
+from browser_use.agent.views import AgentHistoryList
+
+
+class ScheduledTask(BaseModel):
+	"""A task waiting in the AgentScheduler queue"""
+
+	model_config = ConfigDict(arbitrary_types_allowed=True)
+
+	task_id: str = Field(default_factory=uuid7str)
+	task: str
+	priority: int = 0  # higher runs first, equal priorities run in submission order
+	timeout: float | None = None  # seconds for the whole agent run, None = scheduler default
+	max_steps: int | None = None  # None = scheduler default
+	agent_kwargs: dict[str, Any] = Field(default_factory=dict)  # extra Agent(...) kwargs, e.g. llm, controller, sensitive_data
+
+
+class ScheduledTaskResult(BaseModel):
+	"""Outcome of one scheduled task"""
+
+	model_config = ConfigDict(arbitrary_types_allowed=True)
+
+	task_id: str
+	task: str
+	history: AgentHistoryList | None = None
+	error: str | None = None
+	timed_out: bool = False
+	queued_seconds: float = 0.0
+	run_seconds: float = 0.0
+
+	@property
+	def success(self) -> bool:
+		"""True if the agent finished its task successfully"""
+		return self.error is None and self.history is not None and bool(self.history.is_successful())
+
+
+class SchedulerMetrics(BaseModel):
+	"""Throughput counters of an AgentScheduler, updated live while it runs"""
+
+	submitted: int = 0
+	running: int = 0
+	completed: int = 0
+	failed: int = 0
+	timed_out: int = 0
+	total_steps: int = 0
+	total_run_seconds: float = 0.0
+	total_queued_seconds: float = 0.0
+	started_at: float | None = None
+	finished_at: float | None = None
+
+	@property
+	def finished(self) -> int:
+		return self.completed + self.failed + self.timed_out
+
+	@property
+	def elapsed_seconds(self) -> float:
+		if self.started_at is None:
+			return 0.0
+		return (self.finished_at or time.monotonic()) - self.started_at
+
+	@property
+	def tasks_per_minute(self) -> float:
+		elapsed = self.elapsed_seconds
+		return self.finished / elapsed * 60 if elapsed else 0.0
+
+	@property
+	def steps_per_second(self) -> float:
+		elapsed = self.elapsed_seconds
+		return self.total_steps / elapsed if elapsed else 0.0
+
+	@property
+	def avg_run_seconds(self) -> float:
+		return self.total_run_seconds / self.finished if self.finished else 0.0
+
+	@property
+	def avg_queued_seconds(self) -> float:
+		return self.total_queued_seconds / self.finished if self.finished else 0.0
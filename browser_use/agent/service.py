@@ -8,7 +8,8 @@ import re
 import shutil
 import sys
 import time
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable, Sized
+from contextlib import nullcontext
 from pathlib import Path
 from threading import Thread
 from typing import Any, Generic, TypeVar
@@ -29,6 +30,7 @@ from playwright.async_api import Browser, BrowserContext, Page
 from pydantic import BaseModel, ValidationError
 
 from browser_use.agent.gif import create_history_gif
+from browser_use.agent.history.service import HistoryWriter, ScreenshotRetention, iter_history
 from browser_use.agent.memory import Memory, MemoryConfig
 from browser_use.agent.message_manager.service import MessageManager, MessageManagerSettings
 from browser_use.agent.message_manager.utils import (
@@ -48,6 +50,8 @@ from browser_use.agent.views import (
 	AgentState,
 	AgentStepInfo,
 	BrowserStateHistory,
+	HistoryElementNotFoundError,
+	ReplayStepStats,
 	StepMetadata,
 	ToolCallingMethod,
 )
@@ -66,7 +70,7 @@ from browser_use.telemetry.service import ProductTelemetry
 from browser_use.telemetry.views import (
 	AgentTelemetryEvent,
 )
-from browser_use.utils import time_execution_async, time_execution_sync
+from browser_use.utils import run_cpu_bound, time_execution_async, time_execution_sync
 
 logger = logging.getLogger(__name__)
 
@@ -126,11 +130,16 @@ class Agent(Generic[Context]):
 		use_vision_for_planner: bool = False,
 		save_conversation_path: str | None = None,
 		save_conversation_path_encoding: str | None = 'utf-8',
+		save_history_path: str | None = None,
+		max_screenshots_in_memory: int | None = None,
+		screenshot_spill_dir: str | None = None,
 		max_failures: int = 3,
 		retry_delay: int = 10,
 		override_system_message: str | None = None,
 		extend_system_message: str | None = None,
 		max_input_tokens: int = 128000,
+		compaction_max_tokens: int | None = None,
+		compaction_keep_last_steps: int = 5,
 		validate_output: bool = False,
 		message_context: str | None = None,
 		generate_gif: bool | str = False,
@@ -162,6 +171,7 @@ class Agent(Generic[Context]):
 		save_playwright_script_path: str | None = None,
 		enable_memory: bool = True,
 		memory_config: MemoryConfig | None = None,
+		llm_semaphore: asyncio.Semaphore | None = None,
 		source: str | None = None,
 	):
 		if page_extraction_llm is None:
@@ -172,17 +182,25 @@ class Agent(Generic[Context]):
 		self.llm = llm
 		self.controller = controller
 		self.sensitive_data = sensitive_data
+		# Optional limit on concurrent LLM calls shared between agents, e.g. by the AgentScheduler. It bounds the
+		# next-action and planner calls, extract_content (page_extraction_llm) and memory summarization run unbounded
+		self.llm_semaphore = llm_semaphore
 
 		self.settings = AgentSettings(
 			use_vision=use_vision,
 			use_vision_for_planner=use_vision_for_planner,
 			save_conversation_path=save_conversation_path,
 			save_conversation_path_encoding=save_conversation_path_encoding,
+			save_history_path=save_history_path,
+			max_screenshots_in_memory=max_screenshots_in_memory,
+			screenshot_spill_dir=screenshot_spill_dir,
 			max_failures=max_failures,
 			retry_delay=retry_delay,
 			override_system_message=override_system_message,
 			extend_system_message=extend_system_message,
 			max_input_tokens=max_input_tokens,
+			compaction_max_tokens=compaction_max_tokens,
+			compaction_keep_last_steps=compaction_keep_last_steps,
 			validate_output=validate_output,
 			message_context=message_context,
 			generate_gif=generate_gif,
@@ -198,6 +216,14 @@ class Agent(Generic[Context]):
 			extend_planner_system_message=extend_planner_system_message,
 		)
 
+		# Each step is appended to <save_history_path>/history.jsonl as soon as it is recorded
+		self._history_writer = HistoryWriter(save_history_path) if save_history_path else None
+		# Older screenshots are moved next to the saved history if there is one, so each image is stored only once
+		self._screenshot_retention = None
+		if max_screenshots_in_memory is not None:
+			spill_dir = screenshot_spill_dir or (self._history_writer.screenshots_dir if self._history_writer else None)
+			self._screenshot_retention = ScreenshotRetention(max_screenshots_in_memory, spill_dir)
+
 		# Memory settings
 		self.enable_memory = enable_memory
 		self.memory_config = memory_config
@@ -263,6 +289,8 @@ class Agent(Generic[Context]):
 			).get_system_message(),
 			settings=MessageManagerSettings(
 				max_input_tokens=self.settings.max_input_tokens,
+				compaction_max_tokens=self.settings.compaction_max_tokens,
+				compaction_keep_last_steps=self.settings.compaction_keep_last_steps,
 				include_attributes=self.settings.include_attributes,
 				message_context=self.settings.message_context,
 				sensitive_data=sensitive_data,
@@ -788,9 +816,7 @@ class Agent(Generic[Context]):
 
 			self._log_step_context(current_page, browser_state_summary)
 
-			# generate procedural memory if needed
-			if self.enable_memory and self.memory and self.state.n_steps % self.memory.config.memory_interval == 0:
-				self.memory.create_procedural_memory(self.state.n_steps)
+			self._consolidate_history()
 
 			await self._raise_if_stopped_or_paused()
 
@@ -822,11 +848,17 @@ class Agent(Generic[Context]):
 					updated_context = f'Available actions: {all_actions}'
 				self._message_manager.settings.message_context = updated_context
 
+			# serializing the element tree is proportional to the page size, run it off the loop if a CPU executor is set
+			elements_text = await run_cpu_bound(
+				browser_state_summary.element_tree.clickable_elements_to_string,
+				include_attributes=self._message_manager.settings.include_attributes,
+			)
 			self._message_manager.add_state_message(
 				browser_state_summary=browser_state_summary,
 				result=self.state.last_result,
 				step_info=step_info,
 				use_vision=self.settings.use_vision,
+				elements_text=elements_text,
 			)
 
 			# Run planner at specified intervals if planner is configured
@@ -849,7 +881,8 @@ class Agent(Generic[Context]):
 			tokens = self._message_manager.state.history.current_tokens
 
 			try:
-				model_output = await self.get_next_action(input_messages)
+				async with self.llm_semaphore or nullcontext():
+					model_output = await self.get_next_action(input_messages)
 				if (
 					not model_output.action
 					or not isinstance(model_output.action, list)
@@ -862,7 +895,8 @@ class Agent(Generic[Context]):
 					)
 
 					retry_messages = input_messages + [clarification_message]
-					model_output = await self.get_next_action(retry_messages)
+					async with self.llm_semaphore or nullcontext():
+						model_output = await self.get_next_action(retry_messages)
 
 					if not model_output.action or all(action.model_dump() == {} for action in model_output.action):
 						logger.warning('Model still returned empty after retry. Inserting safe noop action.')
@@ -914,7 +948,12 @@ class Agent(Generic[Context]):
 			if len(result) > 0 and result[-1].is_done:
 				logger.info(f'📄 Result: {result[-1].extracted_content}')
 
-			self.state.consecutive_failures = 0
+			if result and all(r.error for r in result):
+				# every action failed, e.g. all actions of a concurrent batch raised, count it like a raised action error
+				self.state.consecutive_failures += 1
+				logger.error(f'❌ All actions failed {self.state.consecutive_failures}/{self.settings.max_failures} times')
+			else:
+				self.state.consecutive_failures = 0
 
 		except InterruptedError:
 			# logger.debug('Agent paused')
@@ -945,7 +984,7 @@ class Agent(Generic[Context]):
 					step_end_time=step_end_time,
 					input_tokens=tokens,
 				)
-				self._make_history_item(model_output, browser_state_summary, result, metadata)
+				await self._make_history_item(model_output, browser_state_summary, result, metadata)
 
 			# Log step completion summary
 			self._log_step_completion_summary(step_start_time, result)
@@ -995,7 +1034,7 @@ class Agent(Generic[Context]):
 
 		return [ActionResult(error=error_msg, include_in_memory=True)]
 
-	def _make_history_item(
+	async def _make_history_item(
 		self,
 		model_output: AgentOutput | None,
 		browser_state_summary: BrowserStateSummary,
@@ -1020,6 +1059,19 @@ class Agent(Generic[Context]):
 		history_item = AgentHistory(model_output=model_output, result=result, state=state_history, metadata=metadata)
 
 		self.state.history.history.append(history_item)
+		if self._history_writer or self._screenshot_retention:
+			# decoding, hashing and writing the screenshots to disk would block the event loop every step
+			await asyncio.to_thread(self._store_history_item, history_item)
+
+	def _store_history_item(self, history_item: AgentHistory) -> None:
+		"""Append the step to the history file and move old screenshots out of memory, runs in a worker thread"""
+		if self._history_writer:
+			try:
+				self._history_writer.append(history_item)
+			except Exception as e:
+				logger.warning(f'Failed to append step to the history file: {type(e).__name__}: {e}')
+		if self._screenshot_retention:
+			self._screenshot_retention.apply(self.state.history)
 
 	THINK_TAGS = re.compile(r'<think>.*?</think>', re.DOTALL)
 	STRAY_CLOSE_TAG = re.compile(r'.*?</think>', re.DOTALL)
@@ -1457,59 +1509,88 @@ class Agent(Generic[Context]):
 		actions: list[ActionModel],
 		check_for_new_elements: bool = True,
 	) -> list[ActionResult]:
-		"""Execute multiple actions"""
-		results = []
+		"""
+		Execute multiple actions.
+		Consecutive actions registered as READ_ONLY or EXTERNAL cannot change the page for each other and run concurrently.
+		"""
+		results: list[ActionResult] = []
 
 		cached_selector_map = await self.browser_session.get_selector_map()
 		cached_path_hashes = {e.hash.branch_path_hash for e in cached_selector_map.values()}
+		new_selector_map = cached_selector_map
 
 		await self.browser_session.remove_highlights()
 
-		for i, action in enumerate(actions):
-			if action.get_index() is not None and i != 0:
+		async def check_page_unchanged(i: int, action: ActionModel) -> str | None:
+			"""Returns why the action must not run if the page changed since its element index was chosen"""
+			nonlocal new_selector_map
+			if action.get_index() is None or i == 0:
+				return None
+
+			# only take a new snapshot if the page probe saw the interactive elements change since the last one
+			if await self.browser_session.has_interactive_changes():
 				new_browser_state_summary = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=False)
 				new_selector_map = new_browser_state_summary.selector_map
 
-				# Detect index change after previous action
-				orig_target = cached_selector_map.get(action.get_index())  # type: ignore
-				orig_target_hash = orig_target.hash.branch_path_hash if orig_target else None
-				new_target = new_selector_map.get(action.get_index())  # type: ignore
-				new_target_hash = new_target.hash.branch_path_hash if new_target else None
-				if orig_target_hash != new_target_hash:
-					msg = f'Element index changed after action {i} / {len(actions)}, because page changed.'
-					logger.info(msg)
-					results.append(ActionResult(extracted_content=msg, include_in_memory=True))
-					break
+			# Detect index change after previous action
+			orig_target = cached_selector_map.get(action.get_index())  # type: ignore
+			orig_target_hash = orig_target.hash.branch_path_hash if orig_target else None
+			new_target = new_selector_map.get(action.get_index())  # type: ignore
+			new_target_hash = new_target.hash.branch_path_hash if new_target else None
+			if orig_target_hash != new_target_hash:
+				return f'Element index changed after action {i} / {len(actions)}, because page changed.'
+
+			new_path_hashes = {e.hash.branch_path_hash for e in new_selector_map.values()}
+			if check_for_new_elements and not new_path_hashes.issubset(cached_path_hashes):
+				# next action requires index but there are new elements on the page
+				return f'Something new appeared after action {i} / {len(actions)}'
+			return None
 
-				new_path_hashes = {e.hash.branch_path_hash for e in new_selector_map.values()}
-				if check_for_new_elements and not new_path_hashes.issubset(cached_path_hashes):
-					# next action requires index but there are new elements on the page
-					msg = f'Something new appeared after action {i} / {len(actions)}'
-					logger.info(msg)
-					results.append(ActionResult(extracted_content=msg, include_in_memory=True))
-					break
+		i = 0
+		while i < len(actions):
+			# the actions of a batch do not change the page, so all of them are checked against it before any runs
+			batch_end = self._concurrent_batch_end(actions, i)
+			stop_msg = None
+			runnable_end = i
+			while runnable_end < batch_end and not (stop_msg := await check_page_unchanged(runnable_end, actions[runnable_end])):
+				runnable_end += 1
 
 			try:
 				await self._raise_if_stopped_or_paused()
 
-				result = await self.controller.act(
-					action=action,
-					browser_session=self.browser_session,
-					page_extraction_llm=self.settings.page_extraction_llm,
-					sensitive_data=self.sensitive_data,
-					available_file_paths=self.settings.available_file_paths,
-					context=self.context,
-				)
-
-				results.append(result)
-
-				# Get action name from the action model
-				action_data = action.model_dump(exclude_unset=True)
-				action_name = next(iter(action_data.keys())) if action_data else 'unknown'
-				logger.info(f'☑️ Executed action {i + 1}/{len(actions)}: {action_name}')
-				if results[-1].is_done or results[-1].error or i == len(actions) - 1:
+				batch_results = []
+				if runnable_end - i == 1:
+					batch_results = [await self._act(actions[i])]
+				elif runnable_end - i > 1:
+					logger.info(f'⏩ Running actions {i + 1}-{runnable_end}/{len(actions)} concurrently')
+					outcomes = await asyncio.gather(
+						*(self._act(action) for action in actions[i:runnable_end]), return_exceptions=True
+					)
+					for outcome in outcomes:
+						if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+							raise outcome
+					# all actions of the batch ran, so a failed one is reported next to the results of the others
+					batch_results = [
+						ActionResult(error=AgentError.format_error(outcome), include_in_memory=True)
+						if isinstance(outcome, Exception)
+						else outcome
+						for outcome in outcomes
+					]
+
+				for j, result in enumerate(batch_results, start=i):
+					results.append(result)
+					logger.info(f'☑️ Executed action {j + 1}/{len(actions)}: {self._action_name(actions[j])}')
+				if any(result.is_done or result.error for result in batch_results):
+					return results
+
+				if stop_msg:
+					logger.info(stop_msg)
+					results.append(ActionResult(extracted_content=stop_msg, include_in_memory=True))
 					break
 
+				i = runnable_end
+				if i == len(actions):
+					break
 				await asyncio.sleep(self.browser_profile.wait_between_actions)
 				# hash all elements. if it is a subset of cached_state its fine - else break (new elements on page)
 
@@ -1523,6 +1604,34 @@ class Agent(Generic[Context]):
 
 		return results
 
+	async def _act(self, action: ActionModel) -> ActionResult:
+		return await self.controller.act(
+			action=action,
+			browser_session=self.browser_session,
+			page_extraction_llm=self.settings.page_extraction_llm,
+			sensitive_data=self.sensitive_data,
+			available_file_paths=self.settings.available_file_paths,
+			context=self.context,
+		)
+
+	@staticmethod
+	def _action_name(action: ActionModel) -> str:
+		action_data = action.model_dump(exclude_unset=True)
+		return next(iter(action_data.keys())) if action_data else 'unknown'
+
+	def _concurrent_batch_end(self, actions: list[ActionModel], start: int) -> int:
+		"""The end of the run of actions from start on that may run concurrently, start + 1 if the first may not"""
+
+		def runs_concurrently(action: ActionModel) -> bool:
+			registered = self.controller.registry.registry.actions.get(self._action_name(action))
+			return registered is not None and registered.side_effect.runs_concurrently
+
+		end = start + 1
+		if runs_concurrently(actions[start]):
+			while end < len(actions) and runs_concurrently(actions[end]):
+				end += 1
+		return end
+
 	async def _validate_output(self) -> bool:
 		"""Validate the output of the last action is what the user wanted"""
 		system_msg = (
@@ -1587,19 +1696,25 @@ class Agent(Generic[Context]):
 
 	async def rerun_history(
 		self,
-		history: AgentHistoryList,
+		history: AgentHistoryList | Iterable[AgentHistory],
 		max_retries: int = 3,
 		skip_failures: bool = True,
-		delay_between_actions: float = 2.0,
+		delay_between_actions: float | None = 2.0,
+		stats: list[ReplayStepStats] | None = None,
+		retry_timeout: float = 5.0,
 	) -> list[ActionResult]:
 		"""
 		Rerun a saved history of actions with error handling and retry logic.
 
 		Args:
-				history: The history to replay
+				history: The history to replay, or an iterable of steps, e.g. streamed with iter_history()
 				max_retries: Maximum number of retries per action
 				skip_failures: Whether to skip failed actions or stop execution
-				delay_between_actions: Delay between actions in seconds
+				delay_between_actions: Delay between actions in seconds. None replaces the fixed delays with readiness
+					checks: each step waits for the page to finish loading, only snapshots the DOM if it targets elements,
+					and a failed step is retried as soon as the interactive elements of the page change
+				stats: If given, per-step timing and retry statistics are appended to it
+				retry_timeout: Max seconds to wait for the page to change before a retry, if delay_between_actions is None
 
 		Returns:
 				List of action results
@@ -1610,10 +1725,15 @@ class Agent(Generic[Context]):
 			self.state.last_result = result
 
 		results = []
+		steps = history.history if isinstance(history, AgentHistoryList) else history
+		total = f'/{len(steps)}' if isinstance(steps, Sized) else ''
 
-		for i, history_item in enumerate(history.history):
+		for i, history_item in enumerate(steps):
 			goal = history_item.model_output.current_state.next_goal if history_item.model_output else ''
-			logger.info(f'Replaying step {i + 1}/{len(history.history)}: goal: {goal}')
+			logger.info(f'Replaying step {i + 1}{total}: goal: {goal}')
+			step_stats = ReplayStepStats(step=i + 1)
+			if stats is not None:
+				stats.append(step_stats)
 
 			if (
 				not history_item.model_output
@@ -1622,33 +1742,55 @@ class Agent(Generic[Context]):
 			):
 				logger.warning(f'Step {i + 1}: No action to replay, skipping')
 				results.append(ActionResult(error='No action to replay'))
+				step_stats.skipped = True
 				continue
 
+			step_stats.actions = [self._action_name(action) for action in history_item.model_output.action if action]
+			step_start = time.monotonic()
 			retry_count = 0
 			while retry_count < max_retries:
+				step_stats.attempts += 1
 				try:
 					result = await self._execute_history_step(history_item, delay_between_actions)
 					results.extend(result)
 					break
 
 				except Exception as e:
+					if isinstance(e, HistoryElementNotFoundError):
+						step_stats.match_failures += 1
 					retry_count += 1
 					if retry_count == max_retries:
 						error_msg = f'Step {i + 1} failed after {max_retries} attempts: {str(e)}'
 						logger.error(error_msg)
+						step_stats.error = error_msg
 						if not skip_failures:
+							step_stats.seconds = time.monotonic() - step_start
 							results.append(ActionResult(error=error_msg))
 							raise RuntimeError(error_msg)
 					else:
 						logger.warning(f'Step {i + 1} failed (attempt {retry_count}/{max_retries}), retrying...')
-						await asyncio.sleep(delay_between_actions)
+						if delay_between_actions is None:
+							await self._wait_for_interactive_changes(retry_timeout)
+						else:
+							await asyncio.sleep(delay_between_actions)
+			step_stats.seconds = time.monotonic() - step_start
 
 		return results
 
-	async def _execute_history_step(self, history_item: AgentHistory, delay: float) -> list[ActionResult]:
+	async def _execute_history_step(self, history_item: AgentHistory, delay: float | None) -> list[ActionResult]:
 		"""Execute a single step from history with element validation"""
-		state = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=False)
-		if not state or not history_item.model_output:
+		if not history_item.model_output:
+			raise ValueError('Invalid state or model output')
+
+		if delay is None and not any(history_item.state.interacted_element):
+			# nothing to look up on the page, only wait until it is ready
+			await self.browser_session._wait_for_page_and_frames_load()
+			return await self.multi_act(history_item.model_output.action)
+
+		state = await self.browser_session.get_state_summary(
+			cache_clickable_elements_hashes=False, include_screenshot=delay is not None
+		)
+		if not state:
 			raise ValueError('Invalid state or model output')
 		updated_actions = []
 		for i, action in enumerate(history_item.model_output.action):
@@ -1660,13 +1802,42 @@ class Agent(Generic[Context]):
 			updated_actions.append(updated_action)
 
 			if updated_action is None:
-				raise ValueError(f'Could not find matching element {i} in current page')
+				raise HistoryElementNotFoundError(f'Could not find matching element {i} in current page')
 
 		result = await self.multi_act(updated_actions)
 
-		await asyncio.sleep(delay)
+		if delay is not None:
+			await asyncio.sleep(delay)
 		return result
 
+	async def _wait_for_interactive_changes(self, timeout: float, poll_interval: float = 0.1, min_wait: float = 0.5) -> None:
+		"""
+		Waits until the interactive elements of the page change, e.g. a missing element renders, or the timeout.
+		Without a snapshot of the current page to compare with, e.g. after a failed navigation, it waits for the page to
+		load and at least min_wait instead, so retries do not fire back to back.
+		"""
+		deadline = time.monotonic() + timeout
+		try:
+			has_probe = await self.browser_session.has_change_probe()
+		except Exception:
+			has_probe = False
+		if not has_probe:
+			try:
+				page = await self.browser_session.get_current_page()
+				await page.wait_for_load_state(timeout=timeout * 1000)
+			except Exception:
+				pass  # the retry reports the actual error
+			await asyncio.sleep(max(0.0, min(min_wait, deadline - time.monotonic())))
+			return
+
+		while time.monotonic() < deadline:
+			try:
+				if await self.browser_session.has_interactive_changes():
+					return
+			except Exception:
+				return  # e.g. no page to probe, the retry reports the actual error
+			await asyncio.sleep(poll_interval)
+
 	async def _update_action_indices(
 		self,
 		historical_element: DOMHistoryElement | None,
@@ -1699,13 +1870,20 @@ class Agent(Generic[Context]):
 		Load history from file and rerun it.
 
 		Args:
-				history_file: Path to the history file
+				history_file: Path to the history file, or to a directory or .jsonl file written with save_history_path
 				**kwargs: Additional arguments passed to rerun_history
 		"""
 		if not history_file:
 			history_file = 'AgentHistory.json'
-		history = AgentHistoryList.load_from_file(history_file, self.AgentOutput)
-		return await self.rerun_history(history, **kwargs)
+		return await self.rerun_history(self._load_history_to_rerun(history_file), **kwargs)
+
+	def _load_history_to_rerun(self, history_file: str | Path) -> AgentHistoryList | Iterable[AgentHistory]:
+		"""Loads a history file for rerun_history, the steps of a history directory or .jsonl file are streamed"""
+		history_path = Path(history_file)
+		if history_path.is_dir() or history_path.suffix == '.jsonl':
+			# stream the steps, screenshots are not needed to replay actions
+			return iter_history(history_file, self.AgentOutput, load_screenshots=False)
+		return AgentHistoryList.load_from_file(history_file, self.AgentOutput)
 
 	def save_history(self, file_path: str | Path | None = None) -> None:
 		"""Save the history to a file"""
@@ -1784,6 +1962,20 @@ class Agent(Generic[Context]):
 			self.llm._verified_api_keys = True
 			return True
 
+	def _consolidate_history(self) -> None:
+		"""Apply or start procedural memory and compact old steps, at the step boundary while no state message is in the history"""
+		if self.enable_memory and self.memory:
+			# a finished background memory is swapped in here, a new one is started every memory_interval steps
+			self.memory.apply_background_procedural_memory()
+			if self.state.n_steps % self.memory.config.memory_interval == 0:
+				self.memory.start_background_procedural_memory(self.state.n_steps)
+			if self.memory.creating_procedural_memory:
+				# the pending memory replaces the old steps, compacting them as well would leave both summaries behind
+				return
+
+		# fold old steps into a summary once the history grows past the compaction budget
+		self._message_manager.compact_history()
+
 	async def _run_planner(self) -> str | None:
 		"""Run the planner to analyze state and suggest next steps"""
 		# Skip planning if no planner_llm is set
@@ -1830,7 +2022,8 @@ class Agent(Generic[Context]):
 
 		# Get planner output
 		try:
-			response = await self.settings.planner_llm.ainvoke(planner_messages)
+			async with self.llm_semaphore or nullcontext():
+				response = await self.settings.planner_llm.ainvoke(planner_messages)
 		except Exception as e:
 			logger.error(f'Failed to invoke planner: {str(e)}')
 			raise LLMException(401, 'LLM API call failed') from e
@@ -1859,6 +2052,13 @@ class Agent(Generic[Context]):
 	async def close(self):
 		"""Close all resources"""
 		try:
+			# Don't leave a background memory task pending on the loop
+			if self.memory:
+				self.memory.cancel_background_procedural_memory()
+
+			if self._history_writer:
+				self._history_writer.close()
+
 			# First close browser resources
 			await self.browser_session.stop()
 
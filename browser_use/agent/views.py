@@ -41,9 +41,14 @@ class AgentSettings(BaseModel):
 	use_vision_for_planner: bool = False
 	save_conversation_path: str | None = None
 	save_conversation_path_encoding: str | None = 'utf-8'
+	save_history_path: str | None = None  # directory to append each step to as history.jsonl, see HistoryWriter
+	max_screenshots_in_memory: int | None = None  # older screenshots in the history are moved to disk or dropped
+	screenshot_spill_dir: str | None = None  # where older screenshots go, defaults to the save_history_path screenshots
 	max_failures: int = 3
 	retry_delay: int = 10
 	max_input_tokens: int = 128000
+	compaction_max_tokens: int | None = None
+	compaction_keep_last_steps: int = 5
 	validate_output: bool = False
 	message_context: str | None = None
 	generate_gif: bool | str = False
@@ -309,6 +314,11 @@ class AgentHistoryList(BaseModel):
 		"""Load history from JSON file"""
 		with open(filepath, encoding='utf-8') as f:
 			data = json.load(f)
+		return cls.load_from_dict(data, output_model)
+
+	@classmethod
+	def load_from_dict(cls, data: dict[str, Any], output_model: type[AgentOutput]) -> AgentHistoryList:
+		"""Load history from a dict as produced by model_dump()"""
 		# loop through history and validate output_model actions to enrich with custom actions
 		for h in data['history']:
 			if h['model_output']:
@@ -367,8 +377,8 @@ class AgentHistoryList(BaseModel):
 		return [h.state.url if h.state.url is not None else None for h in self.history]
 
 	def screenshots(self) -> list[str | None]:
-		"""Get all screenshots from history"""
-		return [h.state.screenshot if h.state.screenshot is not None else None for h in self.history]
+		"""Get all screenshots from history, including ones that were moved to disk"""
+		return [h.state.get_screenshot() for h in self.history]
 
 	def action_names(self) -> list[str]:
 		"""Get all action names from history"""
@@ -431,6 +441,22 @@ class AgentHistoryList(BaseModel):
 		return len(self.history)
 
 
+class ReplayStepStats(BaseModel):
+	"""Timing and outcome of one replayed history step, see Agent.rerun_history(stats=...)"""
+
+	step: int  # 1-based position in the replayed history
+	actions: list[str] = Field(default_factory=list)
+	attempts: int = 0
+	match_failures: int = 0  # attempts that failed because an interacted element was not found on the page
+	seconds: float = 0.0  # wall time of all attempts, including waits between them
+	error: str | None = None  # set if the step still failed after the last attempt
+	skipped: bool = False  # the step had no action to replay
+
+
+class HistoryElementNotFoundError(ValueError):
+	"""An element a history step interacted with cannot be found on the current page"""
+
+
 class AgentError:
 	"""Container for agent error handling"""
 
@@ -1,6 +1,35 @@
-from .browser import Browser, BrowserConfig
-from .context import BrowserContext, BrowserContextConfig
-from .profile import BrowserProfile
-from .session import BrowserSession
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from .browser import Browser, BrowserConfig
+	from .context import BrowserContext, BrowserContextConfig
+	from .profile import BrowserProfile
+	from .session import BrowserSession
+
+# Imported on first access (PEP 562), so that importing e.g. browser_use.browser.views does not load playwright
+_LAZY_IMPORTS = {
+	'Browser': 'browser_use.browser.browser',
+	'BrowserConfig': 'browser_use.browser.browser',
+	'BrowserContext': 'browser_use.browser.context',
+	'BrowserContextConfig': 'browser_use.browser.context',
+	'BrowserSession': 'browser_use.browser.session',
+	'BrowserProfile': 'browser_use.browser.profile',
+}
+
+
+def __getattr__(name: str):
+	if name not in _LAZY_IMPORTS:
+		raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+	import importlib
+
+	value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+	globals()[name] = value
+	return value
+
+
+def __dir__() -> list[str]:
+	return sorted([*globals(), *_LAZY_IMPORTS])
+
 
 __all__ = ['Browser', 'BrowserConfig', 'BrowserContext', 'BrowserContextConfig', 'BrowserSession', 'BrowserProfile']
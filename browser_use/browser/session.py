@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import importlib.util
+import inspect
+import io
 import json
 import logging
 import os
 import re
 import time
+from collections.abc import AsyncIterator, Iterable
 from dataclasses import dataclass
 from functools import wraps
 from pathlib import Path
@@ -20,20 +24,28 @@ import psutil
 from patchright.async_api import Playwright as PatchrightPlaywright
 from playwright.async_api import Browser as PlaywrightBrowser
 from playwright.async_api import BrowserContext as PlaywrightBrowserContext
-from playwright.async_api import ElementHandle, FrameLocator, Page, Playwright, async_playwright
+from playwright.async_api import ElementHandle, Frame, FrameLocator, Page, Playwright, async_playwright
 from pydantic import AliasChoices, BaseModel, ConfigDict, Field, InstanceOf, PrivateAttr, model_validator
 
 from browser_use.browser.profile import BrowserProfile
 from browser_use.browser.views import (
 	BrowserError,
 	BrowserStateSummary,
+	PageProbe,
+	ScreenshotTile,
 	TabInfo,
 	URLNotAllowedError,
 )
 from browser_use.dom.clickable_element_processor.service import ClickableElementProcessor
 from browser_use.dom.service import DomService
 from browser_use.dom.views import DOMElementNode, SelectorMap
-from browser_use.utils import match_url_with_domain_pattern, merge_dicts, time_execution_async, time_execution_sync
+from browser_use.utils import (
+	get_domain_matcher,
+	merge_dicts,
+	run_cpu_bound,
+	time_execution_async,
+	time_execution_sync,
+)
 
 # Check if running in Docker
 IN_DOCKER = os.environ.get('IN_DOCKER', 'false').lower()[0] in 'ty1'
@@ -41,6 +53,77 @@ IN_DOCKER = os.environ.get('IN_DOCKER', 'false').lower()[0] in 'ty1'
 logger = logging.getLogger('browser_use.browser.session')
 
 
+# Collects everything BrowserSession.probe_page() needs in one round-trip
+PAGE_PROBE_JS = """(includeTransferSize) => {
+	const root = document.documentElement;
+	let transferBytes = null;
+	if (includeTransferSize) {
+		transferBytes = 0;
+		for (const entry of performance.getEntriesByType('resource')) transferBytes += entry.transferSize || 0;
+		for (const nav of performance.getEntriesByType('navigation')) transferBytes += nav.transferSize || 0;
+	}
+	return {
+		url: location.href,
+		title: document.title,
+		scroll_x: Math.round(window.scrollX),
+		scroll_y: Math.round(window.scrollY),
+		viewport_width: window.innerWidth,
+		viewport_height: window.innerHeight,
+		scroll_width: root ? root.scrollWidth : 0,
+		scroll_height: root ? root.scrollHeight : 0,
+		device_pixel_ratio: window.devicePixelRatio || 1,
+		transfer_bytes: transferBytes,
+	};
+}"""
+
+# Fills the given fields by highlight index, returns an error message or null for each field in order.
+# Values are set through the native value setter so that frameworks which track it (e.g. React) see the change.
+FILL_FORM_FIELDS_JS = """(fields) => fields.map(({ index, xpath, value }) => {
+	const entry = (window._browserUseElementRefs || [])[index];
+	const el = entry && entry.xpath === xpath ? entry.ref.deref() : null;
+	if (!el || !el.isConnected) return 'not found';
+	if (el.disabled || el.readOnly) return 'element is disabled or read-only';
+
+	const tagName = el.tagName.toLowerCase();
+	const fire = type => el.dispatchEvent(new Event(type, { bubbles: true }));
+	const setValue = v => Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set.call(el, v);
+	try {
+		el.focus();
+		if (tagName === 'select') {
+			const option = [...el.options].find(o => o.text.trim() === value.trim() || o.value === value);
+			if (!option) return `no option of the select at index ${index} matches the given value`;
+			setValue(option.value);
+			fire('input');
+			fire('change');
+		} else if (tagName === 'input' && (el.type === 'checkbox' || el.type === 'radio')) {
+			const checked = /^(true|1|yes|on|checked)$/i.test(value.trim());
+			if (el.type === 'radio' && el.checked && !checked) return 'a radio button cannot be unchecked, check another option instead';
+			if (el.checked !== checked) el.click();
+		} else if (tagName === 'input' || tagName === 'textarea') {
+			setValue(value);
+			fire('input');
+			fire('change');
+		} else if (el.isContentEditable) {
+			window.getSelection().selectAllChildren(el);
+			if (!document.execCommand('insertText', false, value)) {
+				el.textContent = value;
+				fire('input');
+			}
+		} else {
+			return `element is a ${tagName}, not a form field`;
+		}
+		el.blur();
+		return null;
+	} catch (e) {
+		return String(e);
+	}
+})"""
+
+# full-page screenshots of pages longer than this many viewports are captured in tiles, see take_stitched_screenshot()
+TILED_SCREENSHOT_MIN_VIEWPORTS = 4
+# default bound of tiled captures in viewports, taller pages are cut off at the bottom
+TILED_SCREENSHOT_MAX_TILES = 10
+
 _GLOB_WARNING_SHOWN = False  # used inside _is_url_allowed to avoid spamming the logs with the same warning multiple times
 
 
@@ -78,44 +161,70 @@ def _log_pretty_path(path: Path | None) -> str:
 	return str(path).replace(str(Path.home()), '~').replace(str(Path.cwd().resolve()), '.')
 
 
+def _has_iframe_ancestor(element: DOMElementNode) -> bool:
+	current = element.parent
+	while current is not None:
+		if current.tag_name == 'iframe':
+			return True
+		current = current.parent
+	return False
+
+
 def require_initialization(func):
 	"""decorator for BrowserSession methods to require the BrowserSession be already active"""
 
-	assert asyncio.iscoroutinefunction(func), '@require_initialization only supports decorating async methods on BrowserSession'
+	assert asyncio.iscoroutinefunction(func) or inspect.isasyncgenfunction(func), (
+		'@require_initialization only supports decorating async methods and async generators on BrowserSession'
+	)
 
-	@wraps(func)
-	async def wrapper(self, *args, **kwargs):
-		try:
-			if not self.initialized:
-				# raise RuntimeError('BrowserSession(...).start() must be called first to launch or connect to the browser')
-				await self.start()  # just start it automatically if not already started
+	async def ensure_initialized(self) -> None:
+		if not self.initialized:
+			# raise RuntimeError('BrowserSession(...).start() must be called first to launch or connect to the browser')
+			await self.start()  # just start it automatically if not already started
 
-			if not self.agent_current_page or self.agent_current_page.is_closed():
-				self.agent_current_page = (
-					self.browser_context.pages[0] if (self.browser_context and self.browser_context.pages) else None
-				)
+		if not self.agent_current_page or self.agent_current_page.is_closed():
+			self.agent_current_page = (
+				self.browser_context.pages[0] if (self.browser_context and self.browser_context.pages) else None
+			)
 
-			if not self.agent_current_page or self.agent_current_page.is_closed():
-				await self.create_new_tab()
+		if not self.agent_current_page or self.agent_current_page.is_closed():
+			await self.create_new_tab()
 
-			assert self.agent_current_page and not self.agent_current_page.is_closed()
+		assert self.agent_current_page and not self.agent_current_page.is_closed()
 
-			if not hasattr(self, '_cached_browser_state_summary'):
-				raise RuntimeError('BrowserSession(...).start() must be called first to initialize the browser session')
+		if not hasattr(self, '_cached_browser_state_summary'):
+			raise RuntimeError('BrowserSession(...).start() must be called first to initialize the browser session')
 
-			return await func(self, *args, **kwargs)
+	def handle_error(self, e: Exception) -> None:
+		# Check if this is a TargetClosedError or similar connection error
+		if 'TargetClosedError' in str(type(e)) or 'context or browser has been closed' in str(e):
+			logger.debug(f'Detected closed browser connection in {func.__name__}, resetting connection state')
+			self._reset_connection_state()
+		# Re-raise the error so the caller can handle it appropriately, other exceptions unchanged
 
-		except Exception as e:
-			# Check if this is a TargetClosedError or similar connection error
-			if 'TargetClosedError' in str(type(e)) or 'context or browser has been closed' in str(e):
-				logger.debug(f'Detected closed browser connection in {func.__name__}, resetting connection state')
-				self._reset_connection_state()
-				# Re-raise the error so the caller can handle it appropriately
-				raise
-			else:
-				# Re-raise other exceptions unchanged
+	if inspect.isasyncgenfunction(func):
+
+		@wraps(func)
+		async def generator_wrapper(self, *args, **kwargs):
+			try:
+				await ensure_initialized(self)
+				async for item in func(self, *args, **kwargs):
+					yield item
+			except Exception as e:
+				handle_error(self, e)
 				raise
 
+		return generator_wrapper
+
+	@wraps(func)
+	async def wrapper(self, *args, **kwargs):
+		try:
+			await ensure_initialized(self)
+			return await func(self, *args, **kwargs)
+		except Exception as e:
+			handle_error(self, e)
+			raise
+
 	return wrapper
 
 
@@ -1462,22 +1571,13 @@ class BrowserSession(BaseModel):
 		elapsed = time.time() - start_time
 		remaining = max((timeout_overwrite or self.browser_profile.minimum_wait_page_load_time) - elapsed, 0)
 
-		# just for logging, calculate how much data was downloaded
-		try:
-			bytes_used = await page.evaluate("""
-				() => {
-					let total = 0;
-					for (const entry of performance.getEntriesByType('resource')) {
-						total += entry.transferSize || 0;
-					}
-					for (const nav of performance.getEntriesByType('navigation')) {
-						total += nav.transferSize || 0;
-					}
-					return total;
-				}
-			""")
-		except Exception:
-			bytes_used = None
+		# just for logging, calculate how much data was downloaded (skip the round-trip if nobody reads the log line)
+		bytes_used = None
+		if logger.isEnabledFor(logging.DEBUG):
+			try:
+				bytes_used = (await self.probe_page(page, include_transfer_size=True)).transfer_bytes
+			except Exception:
+				pass
 
 		tab_idx = self.tabs.index(page)
 		if bytes_used is not None:
@@ -1511,21 +1611,18 @@ class BrowserSession(BaseModel):
 		if url == 'about:blank':
 			return True
 
-		for allowed_domain in self.browser_profile.allowed_domains:
-			try:
-				if match_url_with_domain_pattern(url, allowed_domain, log_warnings=True):
-					# If it's a pattern with wildcards, show a warning
-					if '*' in allowed_domain:
-						parsed_url = urlparse(url)
-						domain = parsed_url.hostname.lower() if parsed_url.hostname else ''
-						_log_glob_warning(domain, allowed_domain)
-					return True
-			except AssertionError:
-				# This would only happen if about:blank is passed to match_url_with_domain_pattern,
-				# which shouldn't occur since we check for it above
-				continue
+		# compiled once per allowed_domains list, each check parses the url once and looks up its host
+		matcher = get_domain_matcher(tuple(self.browser_profile.allowed_domains), log_warnings=True)
+		allowed_domain = matcher.match(url)
+		if allowed_domain is None:
+			return False
 
-		return False
+		# If it's a pattern with wildcards, show a warning
+		if '*' in allowed_domain:
+			parsed_url = urlparse(url)
+			domain = parsed_url.hostname.lower() if parsed_url.hostname else ''
+			_log_glob_warning(domain, allowed_domain)
+		return True
 
 	async def _check_and_handle_navigation(self, page: Page) -> None:
 		"""Check if current page URL is allowed and handle if not."""
@@ -1683,8 +1780,74 @@ class BrowserSession(BaseModel):
 		structure = await page.evaluate(debug_script)
 		return structure
 
+	@require_initialization
+	async def reset_browsing_state(self, visited_urls: Iterable[str] = (), cookies: list[dict[str, Any]] | None = None) -> None:
+		"""
+		Close all tabs but one, clear cookies and storage and go to about:blank, e.g. between unrelated tasks on a pooled
+		session. Storage is cleared for the origins of visited_urls and of the open tabs, the cookies are replaced by
+		`cookies`, e.g. the ones the session had before its first task.
+		"""
+		assert self.browser_context is not None, 'Browser session was closed'
+		context = self.browser_context
+		pages = context.pages
+		origins = set()
+		for url in [*visited_urls, *(page.url for page in pages)]:
+			parsed = urlparse(url)
+			if parsed.scheme in ('http', 'https') and parsed.netloc:
+				origins.add(f'{parsed.scheme}://{parsed.netloc}')
+
+		page = pages[0] if pages else await context.new_page()
+		for extra_page in pages[1:]:
+			await extra_page.close()
+		self.agent_current_page = self.human_current_page = page
+
+		try:
+			await page.evaluate('() => { localStorage.clear(); sessionStorage.clear() }')
+		except Exception:
+			pass  # the page has no storage, e.g. about:blank
+		try:
+			# local storage, IndexedDB, caches and service workers of every origin
+			cdp_session = await context.new_cdp_session(page)
+			try:
+				for origin in origins:
+					await cdp_session.send('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+			finally:
+				await cdp_session.detach()
+		except Exception as e:
+			logger.warning(f'⚠️ Failed to clear the browser storage: {type(e).__name__}: {e}')
+
+		await context.clear_cookies()
+		if cookies:
+			await context.add_cookies(cookies)  # type: ignore
+		await page.goto('about:blank')
+
+	@require_initialization
+	async def has_change_probe(self) -> bool:
+		"""Whether a DOM snapshot of the current page installed the probe that has_interactive_changes() asks"""
+		page = await self.get_current_page()
+		try:
+			return await page.evaluate('() => Boolean(window._browserUseHasChanged)')
+		except Exception:
+			return False
+
+	@require_initialization
+	@time_execution_async('--has_interactive_changes')
+	async def has_interactive_changes(self) -> bool:
+		"""
+		Cheap check whether the interactive elements of the current page changed since the last DOM snapshot.
+		Returns True if that is unknown, e.g. after a navigation or when the page cannot be evaluated.
+		"""
+		page = await self.get_current_page()
+		try:
+			return await page.evaluate('() => window._browserUseHasChanged ? window._browserUseHasChanged() : true')
+		except Exception as e:
+			logger.debug(f'Failed to probe the page for changes, assuming it changed: {type(e).__name__}: {e}')
+			return True
+
 	@time_execution_sync('--get_state_summary')  # This decorator might need to be updated to handle async
-	async def get_state_summary(self, cache_clickable_elements_hashes: bool) -> BrowserStateSummary:
+	async def get_state_summary(
+		self, cache_clickable_elements_hashes: bool, include_screenshot: bool = True
+	) -> BrowserStateSummary:
 		"""Get a summary of the current browser state
 
 		This method builds a BrowserStateSummary object that captures the current state
@@ -1696,27 +1859,34 @@ class BrowserSession(BaseModel):
 			If True, cache the clickable elements hashes for the current state.
 			This is used to calculate which elements are new to the LLM since the last message,
 			which helps reduce token usage.
+		include_screenshot: bool
+			If False, skip the screenshot, e.g. when only the DOM is needed to replay a history.
 		"""
 		await self._wait_for_page_and_frames_load()
-		updated_state = await self._get_updated_state()
+		updated_state = await self._get_updated_state(include_screenshot=include_screenshot)
 
 		# Find out which elements are new
 		# Do this only if url has not changed
 		if cache_clickable_elements_hashes:
 			# if we are on the same url as the last state, we can use the cached hashes
-			if self._cached_clickable_element_hashes and self._cached_clickable_element_hashes.url == updated_state.url:
+			cached_hashes = self._cached_clickable_element_hashes
+			previous_hashes = cached_hashes.hashes if cached_hashes and cached_hashes.url == updated_state.url else None
+
+			def hash_clickable_elements() -> set[str]:
 				# Pointers, feel free to edit in place
-				updated_state_clickable_elements = ClickableElementProcessor.get_clickable_elements(updated_state.element_tree)
+				hashes = set()
+				for dom_element in ClickableElementProcessor.get_clickable_elements(updated_state.element_tree):
+					element_hash = ClickableElementProcessor.hash_dom_element(dom_element)
+					if previous_hashes is not None:
+						# see which elements are new from the last state where we cached the hashes
+						dom_element.is_new = element_hash not in previous_hashes
+					hashes.add(element_hash)
+				return hashes
 
-				for dom_element in updated_state_clickable_elements:
-					dom_element.is_new = (
-						ClickableElementProcessor.hash_dom_element(dom_element)
-						not in self._cached_clickable_element_hashes.hashes  # see which elements are new from the last state where we cached the hashes
-					)
 			# in any case, we need to cache the new hashes
 			self._cached_clickable_element_hashes = CachedClickableElementHashes(
 				url=updated_state.url,
-				hashes=ClickableElementProcessor.get_clickable_elements_hashes(updated_state.element_tree),
+				hashes=await run_cpu_bound(hash_clickable_elements),
 			)
 
 		assert updated_state
@@ -1728,15 +1898,15 @@ class BrowserSession(BaseModel):
 
 		return self._cached_browser_state_summary
 
-	async def _get_updated_state(self, focus_element: int = -1) -> BrowserStateSummary:
+	async def _get_updated_state(self, focus_element: int = -1, include_screenshot: bool = True) -> BrowserStateSummary:
 		"""Update and return state."""
 
 		page = await self.get_current_page()
 
 		# Check if current page is still valid, if not switch to another available page
 		try:
-			# Test if page is still accessible
-			await page.evaluate('1')
+			# Test if page is still accessible, the same round-trip gets the title and scroll position
+			probe = await self.probe_page(page)
 		except Exception as e:
 			logger.debug(f'👋  Current page is no longer accessible: {type(e).__name__}: {e}')
 			raise BrowserError('Browser closed: no valid pages available')
@@ -1773,18 +1943,17 @@ class BrowserSession(BaseModel):
 			# 		)
 			# 	)
 
-			screenshot_b64 = await self.take_screenshot()
-			pixels_above, pixels_below = await self.get_scroll_info(page)
+			screenshot_b64 = await self.take_screenshot() if include_screenshot else None
 
 			self.browser_state_summary = BrowserStateSummary(
 				element_tree=content.element_tree,
 				selector_map=content.selector_map,
 				url=page.url,
-				title=await page.title(),
+				title=probe.title,
 				tabs=tabs_info,
 				screenshot=screenshot_b64,
-				pixels_above=pixels_above,
-				pixels_below=pixels_below,
+				pixels_above=probe.pixels_above,
+				pixels_below=probe.pixels_below,
 			)
 
 			return self.browser_state_summary
@@ -1798,9 +1967,11 @@ class BrowserSession(BaseModel):
 	# region - Browser Actions
 	@require_initialization
 	@time_execution_async('--take_screenshot')
-	async def take_screenshot(self, full_page: bool = False) -> str:
+	async def take_screenshot(self, full_page: bool = False, max_tiles: int = TILED_SCREENSHOT_MAX_TILES) -> str:
 		"""
 		Returns a base64 encoded screenshot of the current page.
+		Long full-page screenshots are stitched from at most `max_tiles` viewport-sized tiles if Pillow is installed,
+		taller pages are cut off at the bottom. If the tiled capture fails, a single capture is tried instead.
 		"""
 		assert self.agent_current_page is not None, 'Agent current page is not set'
 
@@ -1809,6 +1980,15 @@ class BrowserSession(BaseModel):
 			timeout=5000,
 		)  # page has already loaded by this point, this is extra for previous action animations/frame loads to settle
 
+		# long pages are captured tile by tile, a single full-page capture of them times out and allocates one huge bitmap
+		if full_page and importlib.util.find_spec('PIL') is not None:
+			probe = await self.probe_page(page)
+			if probe.scroll_height > probe.viewport_height * TILED_SCREENSHOT_MIN_VIEWPORTS:
+				try:
+					return await self.take_stitched_screenshot(max_tiles=max_tiles)
+				except Exception as e:
+					logger.warning(f'⚠️ Failed to take a tiled full-page screenshot, falling back to one capture: {e}')
+
 		# 0. Attempt full-page screenshot (sometimes times out for huge pages)
 		try:
 			screenshot = await page.screenshot(
@@ -1819,7 +1999,7 @@ class BrowserSession(BaseModel):
 				caret='initial',
 			)
 
-			screenshot_b64 = base64.b64encode(screenshot).decode('utf-8')
+			screenshot_b64 = (await run_cpu_bound(base64.b64encode, screenshot)).decode('utf-8')
 			return screenshot_b64
 		except Exception as e:
 			logger.error(f'❌  Failed to take full-page screenshot: {e} falling back to viewport-only screenshot')
@@ -1856,9 +2036,9 @@ class BrowserSession(BaseModel):
 				# animations='disabled',   # these can cause CSP errors on some pages, leading to a red herring "waiting for fonts to load" error
 				# caret='initial',
 			)
-			# TODO: manually take multiple clipped screenshots to capture the full height and stitch them together?
+			# for the full height, see take_stitched_screenshot()
 
-			screenshot_b64 = base64.b64encode(screenshot).decode('utf-8')
+			screenshot_b64 = (await run_cpu_bound(base64.b64encode, screenshot)).decode('utf-8')
 			return screenshot_b64
 
 		finally:
@@ -1871,6 +2051,75 @@ class BrowserSession(BaseModel):
 				# await page.set_viewport_size(None)  # unfortunately this is not supported by playwright
 				pass
 
+	@require_initialization
+	async def take_screenshot_tiles(self, max_tiles: int = TILED_SCREENSHOT_MAX_TILES) -> AsyncIterator[ScreenshotTile]:
+		"""
+		Yields viewport-sized screenshot tiles of the full page from top to bottom, at most `max_tiles` of them.
+		Every tile is a separate clipped capture of the page, so only one tile is held in memory at a time
+		and no single capture is big enough to time out. The page is not scrolled.
+		This is the bounded-memory way to capture long pages, process each tile as it is yielded.
+		"""
+		page = await self.get_current_page()
+		probe = await self.probe_page(page)
+		width, tile_height = probe.viewport_width, probe.viewport_height
+		page_height = min(probe.scroll_height, tile_height * max_tiles)
+		truncated = probe.scroll_height > page_height
+		if truncated:
+			logger.warning(
+				f'⚠️ Page is {probe.scroll_height}px tall, only the top {page_height}px ({max_tiles} viewports) are captured'
+			)
+
+		for top in range(0, page_height, tile_height):
+			height = min(tile_height, page_height - top)
+			screenshot = await page.screenshot(
+				full_page=True,  # makes the clip relative to the page instead of the viewport
+				clip={'x': 0, 'y': top, 'width': width, 'height': height},
+				scale='css',
+				timeout=15000,
+				animations='disabled',
+				caret='initial',
+			)
+			yield ScreenshotTile(
+				top=top,
+				width=width,
+				height=height,
+				page_height=page_height,
+				truncated=truncated,
+				screenshot=(await run_cpu_bound(base64.b64encode, screenshot)).decode('utf-8'),
+			)
+
+	@require_initialization
+	@time_execution_async('--take_stitched_screenshot')
+	async def take_stitched_screenshot(self, max_tiles: int = TILED_SCREENSHOT_MAX_TILES) -> str:
+		"""
+		Returns a base64 encoded full-page screenshot stitched together from take_screenshot_tiles(), needs Pillow.
+		Each tile is decoded and pasted as soon as it is captured, but the result is allocated at the full captured height.
+		Pages taller than `max_tiles` viewports are cut off at the bottom (a warning is logged), use take_screenshot_tiles()
+		directly to process long pages with bounded memory.
+		"""
+		from PIL import Image
+
+		stitched = None
+
+		def paste(tile: ScreenshotTile) -> None:
+			nonlocal stitched
+			if stitched is None:
+				stitched = Image.new('RGB', (tile.width, tile.page_height), 'white')
+			with Image.open(io.BytesIO(base64.b64decode(tile.screenshot))) as image:
+				stitched.paste(image.convert('RGB'), (0, tile.top))
+
+		async for tile in self.take_screenshot_tiles(max_tiles=max_tiles):
+			await run_cpu_bound(paste, tile)
+
+		assert stitched is not None, 'Page has no height to take a screenshot of'
+
+		def encode() -> str:
+			buffer = io.BytesIO()
+			stitched.save(buffer, format='PNG')
+			return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+		return await run_cpu_bound(encode)
+
 	# region - User Actions
 
 	@staticmethod
@@ -2067,6 +2316,100 @@ class BrowserSession(BaseModel):
 
 		return not is_hidden and bbox is not None and bbox['width'] > 0 and bbox['height'] > 0
 
+	@require_initialization
+	async def get_frame_for_element(self, element: DOMElementNode) -> Frame | None:
+		"""
+		Returns the frame that holds the element, following the iframe ancestors known from the DOM tree.
+		Returns None if an iframe on the way cannot be resolved (e.g. it is inside a shadow root or has been removed).
+		"""
+		page = await self.get_current_page()
+		iframes: list[DOMElementNode] = []
+		current = element.parent
+		while current is not None:
+			if current.tag_name == 'iframe':
+				iframes.append(current)
+			current = current.parent
+
+		frame = page.main_frame
+		for iframe in reversed(iframes):
+			iframe_handle = await frame.query_selector('//' + iframe.xpath)
+			frame = await iframe_handle.content_frame() if iframe_handle else None
+			if frame is None:
+				return None
+		return frame
+
+	@require_initialization
+	@time_execution_async('--evaluate_in_frames')
+	async def evaluate_in_frames(
+		self,
+		script: str,
+		arg: Any = None,
+		element: DOMElementNode | None = None,
+		frames: list[Frame] | None = None,
+		timeout: float = 2.0,
+	) -> list[tuple[Frame, Any]]:
+		"""
+		Evaluates a script in several frames of the current page concurrently, each bounded by `timeout` seconds.
+
+		If `element` is given, only the frame holding it is evaluated first, and the other frames are only tried if it returns nothing.
+		Returns (frame, result) for every frame that returned a non-null result, in page order. Frames that throw or time out are skipped.
+		"""
+		page = await self.get_current_page()
+		frames = list(page.frames) if frames is None else frames
+
+		async def evaluate(frame: Frame) -> Any:
+			try:
+				return await asyncio.wait_for(frame.evaluate(script, arg), timeout=timeout)
+			except Exception as e:
+				logger.debug(f'Frame evaluation failed in {frame.url}: {type(e).__name__}: {e}')
+				return None
+
+		if element is not None:
+			try:
+				target_frame = await self.get_frame_for_element(element)
+			except Exception as e:
+				logger.debug(f'Failed to resolve the frame of {element.xpath}: {type(e).__name__}: {e}')
+				target_frame = None
+			if target_frame is not None:
+				result = await evaluate(target_frame)
+				if result is not None:
+					return [(target_frame, result)]
+				frames = [frame for frame in frames if frame is not target_frame]
+
+		results = await asyncio.gather(*(evaluate(frame) for frame in frames))
+		return [(frame, result) for frame, result in zip(frames, results) if result is not None]
+
+	@require_initialization
+	@time_execution_async('--get_locate_element_by_ref')
+	async def get_locate_element_by_ref(self, element: DOMElementNode) -> ElementHandle | None:
+		"""
+		Resolves an element through the per-snapshot reference table that buildDomTree.js keeps by highlight index.
+		Lookup, visibility check and scrolling into view happen in a single round-trip.
+		Returns None if the element is not in the current snapshot of the page (e.g. after navigation or a DOM change).
+		"""
+		if element.highlight_index is None:
+			return None
+
+		page = await self.get_current_page()
+		handle = await page.evaluate_handle(
+			"""({ index, xpath }) => {
+				const entry = (window._browserUseElementRefs || [])[index];
+				const el = entry && entry.xpath === xpath ? entry.ref.deref() : null;
+				if (!el || !el.isConnected) return null;
+
+				const rect = el.getBoundingClientRect();
+				const isVisible = rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+				const inViewport = rect.top >= 0 && rect.left >= 0 && rect.bottom <= window.innerHeight && rect.right <= window.innerWidth;
+				if (isVisible && !inViewport) el.scrollIntoView({ block: 'center', inline: 'center' });
+				return el;
+			}""",
+			{'index': element.highlight_index, 'xpath': element.xpath},
+		)
+		element_handle = handle.as_element()
+		if element_handle is None:
+			await handle.dispose()
+		return element_handle
+
 	@require_initialization
 	@time_execution_async('--get_locate_element')
 	async def get_locate_element(self, element: DOMElementNode) -> ElementHandle | None:
@@ -2086,6 +2429,16 @@ class BrowserSession(BaseModel):
 
 		# Process all iframe parents in sequence
 		iframes = [item for item in parents if item.tag_name == 'iframe']
+
+		# Fast path: elements of the top document resolve by highlight index, selectors are only built if that misses
+		if not iframes:
+			try:
+				element_handle = await self.get_locate_element_by_ref(element)
+				if element_handle is not None:
+					return element_handle
+			except Exception as e:
+				logger.debug(f'Element reference lookup failed, falling back to css selector: {type(e).__name__}: {e}')
+
 		for parent in iframes:
 			css_selector = self._enhanced_css_selector_for_element(
 				parent,
@@ -2251,6 +2604,35 @@ class BrowserSession(BaseModel):
 			logger.debug(f'❌  Failed to input text into element: {repr(element_node)}. Error: {str(e)}')
 			raise BrowserError(f'Failed to input text into index {element_node.highlight_index}')
 
+	@require_initialization
+	@time_execution_async('--fill_element_nodes')
+	async def _fill_element_nodes(self, fields: list[tuple[DOMElementNode, str]]) -> list[str | None]:
+		"""
+		Fill several form fields in one page.evaluate round-trip, returns an error message or None for each field.
+		Fields are resolved through the snapshot reference table and set with native input/change events.
+		Text fields that are in iframes or not in the table are typed one by one with _input_text_element_node.
+		"""
+		page = await self.get_current_page()
+		in_iframe = [_has_iframe_ancestor(node) for node, _ in fields]
+		batch = [
+			{'index': node.highlight_index, 'xpath': node.xpath, 'value': value}
+			for (node, value), skip in zip(fields, in_iframe)
+			if not skip and node.highlight_index is not None
+		]
+		batch_errors = iter(await page.evaluate(FILL_FORM_FIELDS_JS, batch) if batch else [])
+
+		errors: list[str | None] = []
+		for (node, value), skip in zip(fields, in_iframe):
+			error = 'not found' if skip or node.highlight_index is None else next(batch_errors)
+			if error == 'not found' and node.tag_name != 'select':
+				try:
+					await self._input_text_element_node(node, value)
+					error = None
+				except Exception as e:
+					error = str(e)
+			errors.append(error)
+		return errors
+
 	@require_initialization
 	@time_execution_async('--switch_to_tab')
 	async def switch_to_tab(self, page_id: int) -> Page:
@@ -2429,48 +2811,64 @@ class BrowserSession(BaseModel):
 			logger.debug(f'Error in find_file_upload_element_by_index: {e}')
 			return None
 
+	@require_initialization
+	async def probe_page(self, page: Page, include_transfer_size: bool = False) -> PageProbe:
+		"""
+		Get url, title, scroll position, viewport and document size (and optionally the bytes transferred)
+		of a page in a single page.evaluate round-trip instead of one call per metric.
+		"""
+		metrics = await page.evaluate(PAGE_PROBE_JS, include_transfer_size)
+		return PageProbe(**metrics)
+
 	@require_initialization
 	async def get_scroll_info(self, page: Page) -> tuple[int, int]:
 		"""Get scroll position information for the current page."""
-		scroll_y = await page.evaluate('window.scrollY')
-		viewport_height = await page.evaluate('window.innerHeight')
-		total_height = await page.evaluate('document.documentElement.scrollHeight')
-		pixels_above = scroll_y
-		pixels_below = total_height - (scroll_y + viewport_height)
-		return pixels_above, pixels_below
+		probe = await self.probe_page(page)
+		return probe.pixels_above, probe.pixels_below
 
 	@require_initialization
-	async def _scroll_container(self, pixels: int) -> None:
-		"""Scroll the element that truly owns vertical scroll.Starts at the focused node ➜ climbs to the first big, scroll-enabled ancestor otherwise picks the first scrollable element or the root, then calls `element.scrollBy` (or `window.scrollBy` for the root) by the supplied pixel value."""
-
-		# An element can *really* scroll if: overflow-y is auto|scroll|overlay, it has more content than fits, its own viewport is not a postage stamp (more than 50 % of window).
-		SMART_SCROLL_JS = """(dy) => {
+	async def _scroll_container(
+		self, pixels: int | None = None, pages: float = 1.0, element: ElementHandle | None = None
+	) -> None:
+		"""Scroll the element that truly owns vertical scroll.Starts at `element` (or the focused node) ➜ climbs to the first scroll-enabled ancestor, otherwise picks the first big scroll container found by the last DOM snapshot or the root, then calls `element.scrollBy` (or `window.scrollBy` for the root) by the supplied pixel value.
+		If pixels is None, scrolls by `pages` times the window height, measured in the same round-trip."""
+
+		# An element can *really* scroll if: overflow-y is auto|scroll|overlay, it has more content than fits, and when picked implicitly
+		# its own viewport is not a postage stamp (more than 50 % of window). buildDomTree.js records the containers it meets in
+		# window._browserUseScrollContainers, so only the ancestors of the start node are styled here instead of the whole page.
+		SMART_SCROLL_JS = """({ pixels, pages, target }) => {
+			const dy = pixels ?? pages * window.innerHeight;
 			const bigEnough = el => el.clientHeight >= window.innerHeight * 0.5;
+			const cached = window._browserUseScrollContainers;
+			const known = new Set(cached || []);
 			const canScroll = el =>
 				el &&
-				/(auto|scroll|overlay)/.test(getComputedStyle(el).overflowY) &&
 				el.scrollHeight > el.clientHeight &&
-				bigEnough(el);
+				(known.has(el) || /(auto|scroll|overlay)/.test(getComputedStyle(el).overflowY));
+			const isRoot = el => el === document.scrollingElement || el === document.documentElement || el === document.body;
 
-			let el = document.activeElement;
-			while (el && !canScroll(el) && el !== document.body) el = el.parentElement;
+			let el = target || document.activeElement;
+			while (el && !isRoot(el) && !(canScroll(el) && (target || bigEnough(el)))) el = el.parentElement;
 
-			el = canScroll(el)
-					? el
-					: [...document.querySelectorAll('*')].find(canScroll)
-					|| document.scrollingElement
-					|| document.documentElement;
+			if (!target && (!el || isRoot(el))) {
+				el = cached
+					? cached.find(c => c.isConnected && c.ownerDocument === document && c.scrollHeight > c.clientHeight && bigEnough(c))
+					: [...document.querySelectorAll('*')].find(c => canScroll(c) && bigEnough(c));  // no snapshot taken yet
+			}
 
-			if (el === document.scrollingElement ||
-				el === document.documentElement ||
-				el === document.body) {
+			if (!el || isRoot(el)) {
 				window.scrollBy(0, dy);
 			} else {
 				el.scrollBy({ top: dy, behavior: 'auto' });
 			}
 		}"""
-		page = await self.get_current_page()
-		await page.evaluate(SMART_SCROLL_JS, pixels)
+		args = {'pixels': pixels, 'pages': pages}
+		if element is not None:
+			# evaluate in the element's own frame so containers inside iframes scroll too
+			await element.evaluate(f'(target, args) => ({SMART_SCROLL_JS})({{ ...args, target }})', args)
+		else:
+			page = await self.get_current_page()
+			await page.evaluate(SMART_SCROLL_JS, {**args, 'target': None})
 
 	# --- DVD Screensaver Loading Animation Helper ---
 	async def _show_dvd_screensaver_loading_animation(self, page: Page) -> None:
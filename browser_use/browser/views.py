@@ -1,7 +1,9 @@
+import base64
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from browser_use.dom.history_tree_processor.service import DOMHistoryElement
 from browser_use.dom.views import DOMState
@@ -17,6 +19,40 @@ class TabInfo(BaseModel):
 	parent_page_id: int | None = None  # parent page that contains this popup or cross-origin iframe
 
 
+class PageProbe(BaseModel):
+	"""Page metrics collected in one page.evaluate round-trip, see BrowserSession.probe_page()"""
+
+	url: str = ''
+	title: str = ''
+	scroll_x: int = 0
+	scroll_y: int = 0
+	viewport_width: int = 0
+	viewport_height: int = 0
+	scroll_width: int = 0
+	scroll_height: int = 0
+	device_pixel_ratio: float = 1.0
+	transfer_bytes: int | None = None  # only collected when asked for, walks the performance entries
+
+	@property
+	def pixels_above(self) -> int:
+		return self.scroll_y
+
+	@property
+	def pixels_below(self) -> int:
+		return self.scroll_height - (self.scroll_y + self.viewport_height)
+
+
+class ScreenshotTile(BaseModel):
+	"""One viewport-sized tile of a full-page screenshot, see BrowserSession.take_screenshot_tiles()"""
+
+	top: int  # css pixels from the top of the page
+	width: int
+	height: int
+	page_height: int  # css pixels covered by all tiles of the capture together
+	truncated: bool = False  # the page is taller than max_tiles viewports, the rest of it is not captured
+	screenshot: str = Field(repr=False)  # base64 encoded png
+
+
 @dataclass
 class BrowserStateSummary(DOMState):
 	"""The summary of the browser's current state designed for an LLM to process"""
@@ -43,11 +79,23 @@ class BrowserStateHistory:
 	tabs: list[TabInfo]
 	interacted_element: list[DOMHistoryElement | None] | list[None]
 	screenshot: str | None = None
+	screenshot_path: str | None = None  # PNG file the screenshot was moved to, to free memory, see get_screenshot()
+
+	def get_screenshot(self) -> str | None:
+		"""The screenshot as base64, read back from screenshot_path if it is no longer kept in memory"""
+		if self.screenshot is None and self.screenshot_path:
+			try:
+				return base64.b64encode(Path(self.screenshot_path).read_bytes()).decode('utf-8')
+			except OSError:
+				return None
+		return self.screenshot
 
 	def to_dict(self) -> dict[str, Any]:
 		data = {}
 		data['tabs'] = [tab.model_dump() for tab in self.tabs]
 		data['screenshot'] = self.screenshot
+		if self.screenshot_path:
+			data['screenshot_path'] = self.screenshot_path
 		data['interacted_element'] = [el.to_dict() if el else None for el in self.interacted_element]
 		data['url'] = self.url
 		data['title'] = self.title
@@ -0,0 +1,4 @@
+from browser_use.controller.extraction.service import ContentExtractor, ExtractionCache, read_page_content
+from browser_use.controller.extraction.views import ChunkExtraction, ExtractionSettings, PageContent
+
+__all__ = ['ChunkExtraction', 'ContentExtractor', 'ExtractionCache', 'ExtractionSettings', 'PageContent', 'read_page_content']
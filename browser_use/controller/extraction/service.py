@@ -0,0 +1,411 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator
+from functools import cache
+from importlib import resources
+from pathlib import Path
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.prompts import PromptTemplate
+from playwright.async_api import Page
+
+from browser_use.agent.message_manager.utils import extract_json_from_model_output
+from browser_use.browser import BrowserSession
+from browser_use.controller.extraction.views import ChunkExtraction, ExtractionSettings, PageContent
+from browser_use.utils import run_cpu_bound, time_execution_async
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_PROMPT = PromptTemplate(
+	input_variables=['goal', 'page'],
+	template='Your task is to extract the content of the page. You will be given a page and a goal and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format. Extraction goal: {goal}, Page: {page}',
+)
+
+CHUNK_EXTRACTION_PROMPT = PromptTemplate(
+	input_variables=['goal', 'page'],
+	template='Your task is to extract the content of one part of a longer page. You will be given the part and a goal and you should extract all relevant information around this goal from this part only. If the goal is vague, summarize the part. Respond in json format with the keys "content" (the extracted information, empty if nothing in this part is relevant) and "complete" (true only if this part alone fully answers the goal). Extraction goal: {goal}, Page part: {page}',
+)
+
+REDUCE_PROMPT = PromptTemplate(
+	input_variables=['goal', 'extractions'],
+	template='Your task is to combine information extracted from consecutive parts of one page into one answer. You will be given a goal and the extractions of the parts in page order; merge them, remove duplicates and keep all relevant information around the goal. Respond in json format. Extraction goal: {goal}, Extractions: {extractions}',
+)
+
+# HTML is several times longer than the markdown it converts to, HTML blocks are this many times the markdown chunk size
+HTML_CHARS_PER_MARKDOWN_CHAR = 4
+
+# Splits the document into consecutive HTML blocks of at most maxChars, descending only into elements that are too big.
+# Rows and items of a split table or list are packed into copies of their ancestors' tags from the table or list down,
+# so no block is left with bare <tr> or <li> fragments that markdownify can't render as a table or list.
+HTML_BLOCKS_JS = """(maxChars) => {
+	const CONTAINER_TAGS = new Set(['TABLE', 'THEAD', 'TBODY', 'TFOOT', 'UL', 'OL', 'DL']);
+	const blocks = [];
+	const flush = wrap => {
+		if (wrap.parts.length) blocks.push(wrap.open + wrap.parts.join('') + wrap.close);
+		wrap.parts = [];
+		wrap.length = 0;
+	};
+	const emit = (html, wrap) => {
+		if (!wrap) {
+			blocks.push(html);
+			return;
+		}
+		if (wrap.parts.length && wrap.length + html.length > wrap.budget) flush(wrap);
+		wrap.parts.push(html);
+		wrap.length += html.length;
+	};
+	const visit = (node, wrap) => {
+		if (node.nodeType === Node.TEXT_NODE) {
+			if (node.textContent.trim()) emit(node.textContent.replace(/&/g, '&amp;').replace(/</g, '&lt;'), wrap);
+			return;
+		}
+		if (node.nodeType !== Node.ELEMENT_NODE) return;
+		const html = node.outerHTML;
+		if (html.length <= maxChars || node.childNodes.length === 0) {
+			emit(html, wrap);
+			return;
+		}
+		if (wrap || CONTAINER_TAGS.has(node.tagName)) {
+			// inside a table or list every element that is split is re-opened around each block of its children
+			const close = `</${node.localName}>`;
+			const open = html.slice(0, html.length - node.innerHTML.length - close.length);
+			if (wrap) flush(wrap);
+			const inner = { open: (wrap ? wrap.open : '') + open, close: close + (wrap ? wrap.close : ''), parts: [], length: 0 };
+			inner.budget = maxChars - inner.open.length - inner.close.length;
+			for (const child of node.childNodes) visit(child, inner);
+			flush(inner);
+			return;
+		}
+		for (const child of node.childNodes) visit(child, wrap);
+	};
+	visit(document.documentElement, null);
+	return blocks;
+}"""
+
+
+class MarkdownChunker:
+	"""Packs streamed markdown into chunks of at most chunk_chars, cutting before a heading where possible, else at a paragraph, line or word"""
+
+	SEPARATORS = (('\n#', 1), ('\n\n', 2), ('\n', 1), (' ', 1))  # separator, offset of the cut within it
+
+	def __init__(self, chunk_chars: int):
+		self.chunk_chars = chunk_chars
+		self._buffer = ''
+
+	def feed(self, markdown: str) -> list[str]:
+		"""Add markdown, returns the chunks that are full"""
+		self._buffer += markdown
+		chunks = []
+		while len(self._buffer) > self.chunk_chars:
+			cut = self._find_cut(self._buffer)
+			chunks.append(self._buffer[:cut])
+			self._buffer = self._buffer[cut:]
+		return chunks
+
+	def flush(self) -> list[str]:
+		"""Returns the last, partially filled chunk"""
+		rest, self._buffer = self._buffer, ''
+		return [rest] if rest.strip() else []
+
+	def _find_cut(self, text: str) -> int:
+		# only cut in the second half of a chunk, so chunks do not end up tiny
+		for separator, offset in self.SEPARATORS:
+			index = text.rfind(separator, self.chunk_chars // 2, self.chunk_chars)
+			if index != -1:
+				return index + offset
+		return self.chunk_chars
+
+
+def split_markdown(markdown: str, chunk_chars: int) -> list[str]:
+	"""Split markdown into chunks of at most chunk_chars, preferring to cut before headings"""
+	chunker = MarkdownChunker(chunk_chars)
+	return chunker.feed(markdown) + chunker.flush()
+
+
+@cache
+def _html_to_markdown_js() -> str:
+	return resources.files('browser_use.dom').joinpath('htmlToMarkdown.js').read_text()
+
+
+@time_execution_async('--read_page_content')
+async def read_page_content(
+	page: Page, browser_session: BrowserSession, include_links: bool = False, settings: ExtractionSettings | None = None
+) -> PageContent:
+	"""Reads the page and its iframes, converted to markdown in the browser or as HTML blocks for markdownify"""
+	settings = settings or ExtractionSettings()
+
+	# manually append iframe text into the content so it's readable by the LLM (includes cross-origin iframes)
+	# all iframes are read concurrently, slow or hung frames are skipped after the timeout
+	iframes = [iframe for iframe in page.frames if iframe.url != page.url and not iframe.url.startswith('data:')]
+
+	if settings.converter == 'browser':
+		script, arg = _html_to_markdown_js(), {'includeLinks': include_links}
+		try:
+			markdown, frame_results = await asyncio.gather(
+				page.evaluate(script, arg),
+				browser_session.evaluate_in_frames(script, arg, frames=iframes, timeout=5.0),
+			)
+			return PageContent(blocks=[markdown], iframes=[(iframe.url, md) for iframe, md in frame_results], is_markdown=True)
+		except Exception as e:
+			logger.debug(f'In-browser markdown conversion failed, falling back to markdownify: {type(e).__name__}: {e}')
+
+	blocks, frame_results = await asyncio.gather(
+		page.evaluate(HTML_BLOCKS_JS, settings.chunk_chars * HTML_CHARS_PER_MARKDOWN_CHAR),
+		browser_session.evaluate_in_frames('() => document.documentElement.outerHTML', frames=iframes, timeout=5.0),
+	)
+	return PageContent(blocks=blocks, iframes=[(iframe.url, iframe_html) for iframe, iframe_html in frame_results])
+
+
+async def stream_page_markdown(page_content: PageContent, include_links: bool = False) -> AsyncIterator[str]:
+	"""
+	Yields the page as markdown block by block, followed by its iframes. HTML blocks are converted one by one, so
+	extraction can start before the whole page is converted. Markdown converted in the browser is a single block per
+	document that is yielded as is.
+	"""
+	if page_content.is_markdown:
+		for block in page_content.blocks:
+			yield block
+		for url, iframe_markdown in page_content.iframes:
+			yield f'\n\nIFRAME {url}:\n{iframe_markdown}'
+		return
+
+	import markdownify
+
+	strip = []
+	if not include_links:
+		strip = ['a', 'img']
+
+	for block in page_content.blocks:
+		# markdownify is pure Python and slow on big pages, run it off the event loop if a CPU executor is configured
+		yield await run_cpu_bound(markdownify.markdownify, block, strip=strip)
+
+	for url, iframe_html in page_content.iframes:
+		yield f'\n\nIFRAME {url}:\n' + await run_cpu_bound(markdownify.markdownify, iframe_html)
+
+
+# scripts, styles and comments never reach the markdown, but often differ between loads of the same page (nonces, timestamps)
+_NON_CONTENT_HTML_RE = re.compile(r'<(script|style|noscript)\b[^>]*>.*?</\1\s*>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def hash_page_content(page_content: PageContent) -> str:
+	"""Hash of the page content, ignoring whitespace and markup that does not end up in the markdown"""
+	digest = hashlib.sha256()
+	for text in [*page_content.blocks, *(f'IFRAME {url}: {content}' for url, content in page_content.iframes)]:
+		digest.update(_WHITESPACE_RE.sub(' ', _NON_CONTENT_HTML_RE.sub('', text)).encode())
+		digest.update(b'\0')
+	return digest.hexdigest()
+
+
+def get_model_id(llm: BaseChatModel) -> str:
+	model = getattr(llm, 'model_name', None) or getattr(llm, 'model', None) or 'Unknown'
+	return f'{llm.__class__.__name__}:{model}'
+
+
+class ExtractionCache:
+	"""
+	LRU cache of extract_content results with a time to live, keyed by page content, goal, include_links and model.
+	If cache_dir is set, results are also written there as json files, so they survive restarts and are shared between processes.
+	"""
+
+	def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600, cache_dir: str | Path | None = None):
+		self.max_entries = max_entries
+		self.ttl_seconds = ttl_seconds
+		self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+		self.hits = 0
+		self.misses = 0
+		self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()  # key -> (stored_at, result), oldest first
+
+	@classmethod
+	def from_settings(cls, settings: ExtractionSettings) -> 'ExtractionCache':
+		return cls(max_entries=settings.cache_max_entries, ttl_seconds=settings.cache_ttl_seconds, cache_dir=settings.cache_dir)
+
+	@property
+	def enabled(self) -> bool:
+		return self.max_entries > 0 or self.cache_dir is not None
+
+	@property
+	def hit_rate(self) -> float:
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+
+	@staticmethod
+	def make_key(content_hash: str, goal: str, include_links: bool, model_id: str) -> str:
+		return hashlib.sha256(json.dumps([content_hash, goal.strip(), include_links, model_id]).encode()).hexdigest()
+
+	def get(self, key: str) -> str | None:
+		entry = self._entries.get(key) or self._read_from_disk(key)
+		if entry is None or time.time() - entry[0] > self.ttl_seconds:
+			self._entries.pop(key, None)
+			self.misses += 1
+			return None
+
+		self.hits += 1
+		self._remember(key, entry)
+		return entry[1]
+
+	def set(self, key: str, result: str) -> None:
+		entry = (time.time(), result)
+		self._remember(key, entry)
+		if self.cache_dir is not None:
+			try:
+				self.cache_dir.mkdir(parents=True, exist_ok=True)
+				path = self.cache_dir / f'{key}.json'
+				tmp_path = path.with_suffix('.tmp')
+				tmp_path.write_text(json.dumps({'stored_at': entry[0], 'result': result}))
+				tmp_path.replace(path)
+			except OSError as e:
+				logger.debug(f'Failed to write extraction cache entry to {self.cache_dir}: {type(e).__name__}: {e}')
+
+	def _remember(self, key: str, entry: tuple[float, str]) -> None:
+		if self.max_entries <= 0:
+			return
+		self._entries[key] = entry
+		self._entries.move_to_end(key)
+		while len(self._entries) > self.max_entries:
+			self._entries.popitem(last=False)
+
+	def _read_from_disk(self, key: str) -> tuple[float, str] | None:
+		if self.cache_dir is None:
+			return None
+		path = self.cache_dir / f'{key}.json'
+		try:
+			data = json.loads(path.read_text())
+		except (OSError, ValueError):
+			return None
+		if time.time() - data['stored_at'] > self.ttl_seconds:
+			path.unlink(missing_ok=True)
+			return None
+		return data['stored_at'], data['result']
+
+
+def _parse_chunk_extraction(text: str) -> ChunkExtraction:
+	try:
+		parsed = extract_json_from_model_output(text)
+	except Exception:
+		return ChunkExtraction(content=text)
+	content = parsed.get('content', '')
+	return ChunkExtraction(
+		content=content if isinstance(content, str) else json.dumps(content),
+		complete=bool(parsed.get('complete', False)),
+	)
+
+
+class ContentExtractor:
+	"""
+	Extracts the information relevant to a goal from page markdown with the page extraction LLM.
+
+	Pages that fit into one chunk are extracted with a single prompt. Longer pages are map-reduced: chunks are extracted
+	concurrently, and the partial results are combined with a reduce prompt. With the markdownify converter, chunks are
+	extracted as soon as they are converted. The in-browser converter returns the whole page at once, so there all
+	chunks are available right away and only the map-reduce applies.
+	"""
+
+	def __init__(self, llm: BaseChatModel, settings: ExtractionSettings | None = None):
+		self.llm = llm
+		self.settings = settings or ExtractionSettings()
+		self.chunks: list[str] = []  # markdown seen so far, used as fallback content if the LLM fails
+		self.failed_chunks = 0  # chunk extractions that raised, the output of the last extract() is partial if > 0
+
+	@property
+	def content(self) -> str:
+		return ''.join(self.chunks)
+
+	@time_execution_async('--extract_content')
+	async def extract(self, goal: str, markdown_parts: AsyncIterable[str]) -> str:
+		chunker = MarkdownChunker(self.settings.chunk_chars)
+		semaphore = asyncio.Semaphore(self.settings.max_concurrency)
+		satisfied = asyncio.Event()
+		tasks: list[asyncio.Task[ChunkExtraction | None]] = []
+
+		def add_chunk(chunk: str) -> None:
+			self.chunks.append(chunk)
+			if len(self.chunks) == 1:
+				return  # hold back the first chunk until we know the page does not fit into one
+			if not tasks:
+				tasks.append(asyncio.create_task(self._extract_chunk(goal, self.chunks[0], semaphore, satisfied)))
+			tasks.append(asyncio.create_task(self._extract_chunk(goal, chunk, semaphore, satisfied)))
+
+		try:
+			async for part in markdown_parts:
+				for chunk in chunker.feed(part):
+					add_chunk(chunk)
+				await asyncio.sleep(0)  # let started chunk extractions send their requests while the rest is converted
+				if satisfied.is_set():
+					break
+			else:
+				for chunk in chunker.flush():
+					add_chunk(chunk)
+		except BaseException:
+			for task in tasks:
+				task.cancel()
+			raise
+
+		if not tasks:
+			output = await self.llm.ainvoke(EXTRACTION_PROMPT.format(goal=goal, page=self.content))
+			return str(output.content)
+
+		logger.debug(f'📄  Extracting content from {len(tasks)} chunks of {self.settings.chunk_chars} chars')
+		results = await asyncio.gather(*tasks, return_exceptions=True)
+		errors = [result for result in results if isinstance(result, BaseException)]
+		extractions = [result for result in results if isinstance(result, ChunkExtraction)]
+		self.failed_chunks = len(errors)
+		if errors and not extractions:
+			raise errors[0]
+		for error in errors:
+			logger.debug(f'Chunk extraction failed: {type(error).__name__}: {error}')
+		if errors:
+			logger.warning(f'⚠️ {len(errors)}/{len(tasks)} chunk extractions failed, the extracted content is partial')
+
+		if self.settings.early_exit:
+			complete = next((extraction for extraction in extractions if extraction.complete), None)
+			if complete is not None:
+				return complete.content
+
+		return await self._reduce(goal, [extraction.content for extraction in extractions if extraction.content.strip()])
+
+	async def _extract_chunk(
+		self, goal: str, chunk: str, semaphore: asyncio.Semaphore, satisfied: asyncio.Event
+	) -> ChunkExtraction | None:
+		async with semaphore:
+			if satisfied.is_set():
+				return None  # an earlier chunk already answered the goal
+			output = await self.llm.ainvoke(CHUNK_EXTRACTION_PROMPT.format(goal=goal, page=chunk))
+		extraction = _parse_chunk_extraction(str(output.content))
+		if extraction.complete and self.settings.early_exit:
+			satisfied.set()
+		return extraction
+
+	async def _reduce(self, goal: str, extractions: list[str]) -> str:
+		if not extractions:
+			return 'No content relevant to the extraction goal was found on the page'
+		if len(extractions) == 1:
+			return extractions[0]
+
+		# combine in groups that fit into one chunk, and reduce the group results again until one is left
+		groups: list[list[str]] = [[]]
+		group_chars = 0
+		for extraction in extractions:
+			if groups[-1] and group_chars + len(extraction) > self.settings.chunk_chars:
+				groups.append([])
+				group_chars = 0
+			groups[-1].append(extraction)
+			group_chars += len(extraction)
+
+		if len(groups) in (1, len(extractions)):
+			# everything fits into one prompt, or no two extractions fit together and grouping would not shrink the list
+			output = await self.llm.ainvoke(REDUCE_PROMPT.format(goal=goal, extractions='\n\n---\n\n'.join(extractions)))
+			return str(output.content)
+
+		semaphore = asyncio.Semaphore(self.settings.max_concurrency)
+
+		async def reduce_group(group: list[str]) -> str:
+			async with semaphore:
+				return await self._reduce(goal, group)
+
+		return await self._reduce(goal, list(await asyncio.gather(*(reduce_group(group) for group in groups))))
@@ -0,0 +1,31 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class ExtractionSettings(BaseModel):
+	"""Options for the extract_content action"""
+
+	chunk_chars: int = 40_000  # pages with more markdown than this are extracted chunk by chunk and the results reduced
+	max_concurrency: int = 4  # chunk extraction LLM calls in flight at once
+	early_exit: bool = True  # stop extracting further chunks once one chunk fully answers the goal
+	# 'browser' converts the rendered DOM to markdown in the page and skips hidden content, 'markdownify' converts the raw HTML in Python
+	converter: Literal['browser', 'markdownify'] = 'browser'
+	cache_max_entries: int = 256  # extraction results kept in memory, 0 disables the in-memory cache
+	cache_ttl_seconds: float = 3600
+	cache_dir: str | None = None  # directory to also persist extraction results in, e.g. ~/.cache/browseruse/extractions
+
+
+class ChunkExtraction(BaseModel):
+	"""What the page extraction LLM found in one chunk of a page"""
+
+	content: str = ''
+	complete: bool = False  # the chunk alone fully answers the extraction goal
+
+
+class PageContent(BaseModel):
+	"""A page as read for extraction, either as HTML still to be converted or as markdown already converted in the browser"""
+
+	blocks: list[str]  # consecutive HTML blocks of the main document, or its whole markdown as one block
+	iframes: list[tuple[str, str]] = []  # (url, content) of each readable iframe
+	is_markdown: bool = False
@@ -15,6 +15,7 @@ from browser_use.browser import BrowserSession
 from browser_use.controller.registry.views import (
 	ActionModel,
 	ActionRegistry,
+	ActionSideEffect,
 	RegisteredAction,
 	SpecialActionParameters,
 )
@@ -23,7 +24,7 @@ from browser_use.telemetry.views import (
 	ControllerRegisteredFunctionsTelemetryEvent,
 	RegisteredFunction,
 )
-from browser_use.utils import match_url_with_domain_pattern, time_execution_async
+from browser_use.utils import get_domain_matcher, time_execution_async
 
 Context = TypeVar('Context')
 
@@ -37,6 +38,8 @@ class Registry(Generic[Context]):
 		self.registry = ActionRegistry()
 		self.telemetry = ProductTelemetry()
 		self.exclude_actions = exclude_actions if exclude_actions is not None else []
+		# JSON schemas of the actions reported to telemetry, computed once per action instead of on every step
+		self._registered_functions: dict[str, RegisteredFunction] = {}
 
 	def _get_special_param_types(self) -> dict[str, type]:
 		"""Get the expected types for special parameters from SpecialActionParameters"""
@@ -60,13 +63,14 @@ class Registry(Generic[Context]):
 		func: Callable,
 		description: str,
 		param_model: type[BaseModel] | None = None,
-	) -> tuple[Callable, type[BaseModel]]:
+	) -> tuple[Callable, type[BaseModel], frozenset[str]]:
 		"""
 		Normalize action function to accept only kwargs.
 
 		Returns:
 			- Normalized function that accepts (*_, params: ParamModel, **special_params)
 			- The param model to use for registration
+			- The names of the special params the function takes
 		"""
 		sig = signature(func)
 		parameters = list(sig.parameters.values())
@@ -147,7 +151,27 @@ class Registry(Generic[Context]):
 					__base__=ActionModel,
 				)
 
-		# Step 4: Create normalized wrapper function
+		# Step 4: Precompute the dispatch plan, so calls walk this list instead of re-inspecting the signature
+		# Type 1 pattern: the first param is the param model itself
+		takes_param_model = param_model_provided and bool(parameters) and parameters[0].name not in special_param_names
+		call_plan: list[tuple[str, str, Any]] = []  # (source, name, default), source is 'params', 'special' or 'action'
+		for i, param in enumerate(parameters):
+			if takes_param_model and i == 0:
+				call_plan.append(('params', param.name, param.default))
+			elif param.name in special_param_names:
+				call_plan.append(('special', param.name, param.default))
+			else:
+				call_plan.append(('action', param.name, param.default))
+		action_param_names = [param.name for param in action_params]
+		unpacks_params = any(source == 'action' for source, _, _ in call_plan)
+		is_coroutine = iscoroutinefunction(func)
+
+		def missing_special_param(name: str) -> ValueError:
+			if name in ('browser_session', 'page_extraction_llm'):
+				return ValueError(f'Action {func.__name__} requires {name} but none provided.')
+			return ValueError(f"{func.__name__}() missing required special parameter '{name}'")
+
+		# Step 5: Create normalized wrapper function
 		@functools.wraps(func)
 		async def normalized_wrapper(*args, params: BaseModel | None = None, **kwargs):
 			"""Normalized action that only accepts kwargs"""
@@ -155,70 +179,42 @@ class Registry(Generic[Context]):
 			if args:
 				raise TypeError(f'{func.__name__}() does not accept positional arguments, only keyword arguments are allowed')
 
-			# Prepare arguments for original function
-			call_args = []
-			call_kwargs = {}
-
-			# Handle Type 1 pattern (first arg is the param model)
-			if param_model_provided and parameters and parameters[0].name not in special_param_names:
+			if takes_param_model:
 				if params is None:
 					raise ValueError(f"{func.__name__}() missing required 'params' argument")
-				# For Type 1, we'll use the params object as first argument
-				pass
-			else:
-				# Type 2 pattern - need to unpack params
-				# If params is None, try to create it from kwargs
-				if params is None and action_params:
-					# Extract action params from kwargs
-					action_kwargs = {}
-					for param in action_params:
-						if param.name in kwargs:
-							action_kwargs[param.name] = kwargs[param.name]
-					if action_kwargs:
-						# Use the param_model which has the correct types defined
-						params = param_model(**action_kwargs)
-
-			# Build call_args by iterating through original function parameters in order
-			params_dict = params.model_dump() if params is not None else {}
-
-			for i, param in enumerate(parameters):
-				# Skip first param for Type 1 pattern (it's the model itself)
-				if param_model_provided and i == 0 and param.name not in special_param_names:
+			elif params is None and action_param_names:
+				# Type 2 pattern called without params, try to create them from kwargs
+				action_kwargs = {name: kwargs[name] for name in action_param_names if name in kwargs}
+				if action_kwargs:
+					# Use the param_model which has the correct types defined
+					params = param_model(**action_kwargs)
+
+			params_dict = params.model_dump() if unpacks_params and params is not None else {}
+
+			# Build call_args in the order of the original function parameters
+			call_args = []
+			for source, name, default in call_plan:
+				if source == 'params':
 					call_args.append(params)
-				elif param.name in special_param_names:
-					# This is a special parameter
-					if param.name in kwargs:
-						value = kwargs[param.name]
+				elif source == 'special':
+					if name in kwargs:
 						# Check if required special param is None
-						if value is None and param.default == Parameter.empty:
-							if param.name == 'browser_session':
-								raise ValueError(f'Action {func.__name__} requires browser_session but none provided.')
-							elif param.name == 'page_extraction_llm':
-								raise ValueError(f'Action {func.__name__} requires page_extraction_llm but none provided.')
-							else:
-								raise ValueError(f"{func.__name__}() missing required special parameter '{param.name}'")
-						call_args.append(value)
-					elif param.default != Parameter.empty:
-						call_args.append(param.default)
+						if kwargs[name] is None and default is Parameter.empty:
+							raise missing_special_param(name)
+						call_args.append(kwargs[name])
+					elif default is not Parameter.empty:
+						call_args.append(default)
 					else:
-						# Special param is required but not provided
-						if param.name == 'browser_session':
-							raise ValueError(f'Action {func.__name__} requires browser_session but none provided.')
-						elif param.name == 'page_extraction_llm':
-							raise ValueError(f'Action {func.__name__} requires page_extraction_llm but none provided.')
-						else:
-							raise ValueError(f"{func.__name__}() missing required special parameter '{param.name}'")
+						raise missing_special_param(name)
+				elif name in params_dict:
+					call_args.append(params_dict[name])
+				elif default is not Parameter.empty:
+					call_args.append(default)
 				else:
-					# This is an action parameter
-					if param.name in params_dict:
-						call_args.append(params_dict[param.name])
-					elif param.default != Parameter.empty:
-						call_args.append(param.default)
-					else:
-						raise ValueError(f"{func.__name__}() missing required parameter '{param.name}'")
+					raise ValueError(f"{func.__name__}() missing required parameter '{name}'")
 
 			# Call original function with positional args
-			if iscoroutinefunction(func):
+			if is_coroutine:
 				return await func(*call_args)
 			else:
 				return await asyncio.to_thread(func, *call_args)
@@ -235,7 +231,7 @@ class Registry(Generic[Context]):
 
 		normalized_wrapper.__signature__ = sig.replace(parameters=new_params)
 
-		return normalized_wrapper, param_model
+		return normalized_wrapper, param_model, frozenset(sp.name for sp in special_params)
 
 	# @time_execution_sync('--create_param_model')
 	def _create_param_model(self, function: Callable) -> type[BaseModel]:
@@ -261,8 +257,12 @@ class Registry(Generic[Context]):
 		domains: list[str] | None = None,
 		allowed_domains: list[str] | None = None,
 		page_filter: Callable[[Any], bool] | None = None,
+		side_effect: ActionSideEffect = ActionSideEffect.PAGE_MUTATING,
 	):
-		"""Decorator for registering actions"""
+		"""
+		Decorator for registering actions.
+		side_effect declares what the action changes, consecutive READ_ONLY and EXTERNAL actions of a step run concurrently.
+		"""
 		# Handle aliases: domains and allowed_domains are the same parameter
 		if allowed_domains is not None and domains is not None:
 			raise ValueError("Cannot specify both 'domains' and 'allowed_domains' - they are aliases for the same parameter")
@@ -275,7 +275,9 @@ class Registry(Generic[Context]):
 				return func
 
 			# Normalize the function signature
-			normalized_func, actual_param_model = self._normalize_action_function_signature(func, description, param_model)
+			normalized_func, actual_param_model, special_param_names = self._normalize_action_function_signature(
+				func, description, param_model
+			)
 
 			action = RegisteredAction(
 				name=func.__name__,
@@ -284,6 +286,8 @@ class Registry(Generic[Context]):
 				param_model=actual_param_model,
 				domains=final_domains,
 				page_filter=page_filter,
+				special_param_names=special_param_names,
+				side_effect=side_effect,
 			)
 			self.registry.actions[func.__name__] = action
 
@@ -296,7 +300,7 @@ class Registry(Generic[Context]):
 	async def execute_action(
 		self,
 		action_name: str,
-		params: dict,
+		params: dict | BaseModel,
 		browser_session: BrowserSession | None = None,
 		page_extraction_llm: BaseChatModel | None = None,
 		sensitive_data: dict[str, str | dict[str, str]] | None = None,
@@ -304,18 +308,27 @@ class Registry(Generic[Context]):
 		#
 		context: Context | None = None,
 	) -> Any:
-		"""Execute a registered action with simplified parameter handling"""
+		"""
+		Execute a registered action with simplified parameter handling.
+		params can be a dict or an instance of the action's param model, which is used as is without validating it again.
+		"""
 		if action_name not in self.registry.actions:
 			raise ValueError(f'Action {action_name} not found')
 
 		action = self.registry.actions[action_name]
 		try:
-			# Create the validated Pydantic model
-			try:
-				validated_params = action.param_model(**params)
-			except Exception as e:
-				raise ValueError(f'Invalid parameters {params} for action {action_name}: {type(e)}: {e}') from e
-
+			if isinstance(params, action.param_model):
+				validated_params = params
+			else:
+				if isinstance(params, BaseModel):
+					params = params.model_dump(exclude_unset=True)
+				# Create the validated Pydantic model
+				try:
+					validated_params = action.param_model(**params)
+				except Exception as e:
+					raise ValueError(f'Invalid parameters {params} for action {action_name}: {type(e)}: {e}') from e
+
+			has_sensitive_data = False
 			if sensitive_data:
 				# Get current URL if browser_session is provided
 				current_url = None
@@ -325,7 +338,10 @@ class Registry(Generic[Context]):
 					else:
 						current_page = await browser_session.get_current_page()
 						current_url = current_page.url if current_page else None
-				validated_params = self._replace_sensitive_data(validated_params, sensitive_data, current_url)
+				replaced_params = self._replace_sensitive_data(validated_params, sensitive_data, current_url)
+				# the same params object is returned if no placeholder was replaced
+				has_sensitive_data = replaced_params is not validated_params
+				validated_params = replaced_params
 
 			# Build special context dict
 			special_context = {
@@ -335,15 +351,16 @@ class Registry(Generic[Context]):
 				'browser_context': browser_session,  # legacy support
 				'page_extraction_llm': page_extraction_llm,
 				'available_file_paths': available_file_paths,
-				'has_sensitive_data': action_name == 'input_text' and bool(sensitive_data),
+				'has_sensitive_data': has_sensitive_data,  # actions must not echo their params if True
 			}
 
 			# Handle async page parameter if needed
-			if browser_session:
-				# Check if function signature includes 'page' parameter
-				sig = signature(action.function)
-				if 'page' in sig.parameters:
-					special_context['page'] = await browser_session.get_current_page()
+			special_param_names = action.special_param_names
+			if special_param_names is None:
+				# registered without the decorator, check the function signature instead
+				special_param_names = signature(action.function).parameters.keys()
+			if browser_session and 'page' in special_param_names:
+				special_context['page'] = await browser_session.get_current_page()
 
 			# All functions are now normalized to accept kwargs only
 			# Call with params and unpacked special context
@@ -379,6 +396,10 @@ class Registry(Generic[Context]):
 		Returns:
 			BaseModel: The parameter object with placeholders replaced by actual values
 		"""
+		# most actions carry no placeholder, the json dump is much cheaper than dumping and walking the params in python
+		if '<secret>' not in params.model_dump_json():
+			return params
+
 		secret_pattern = re.compile(r'<secret>(.*?)</secret>')
 
 		# Set to track all missing placeholders across the full object
@@ -389,14 +410,19 @@ class Registry(Generic[Context]):
 		# Process sensitive data based on format and current URL
 		applicable_secrets = {}
 
+		# New format: {domain_pattern: {key: value}}, only include secrets for domains that match the current URL.
+		# All domain patterns are compiled into one cached matcher and the URL is looked up once
+		matched_domains: set[str] = set()
+		if current_url and current_url != 'about:blank':
+			domain_patterns = tuple(key for key, content in sensitive_data.items() if isinstance(content, dict))
+			if domain_patterns:
+				# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
+				matched_domains = set(get_domain_matcher(domain_patterns).match_all(current_url))
+
 		for domain_or_key, content in sensitive_data.items():
 			if isinstance(content, dict):
-				# New format: {domain_pattern: {key: value}}
-				# Only include secrets for domains that match the current URL
-				if current_url and current_url != 'about:blank':
-					# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
-					if match_url_with_domain_pattern(current_url, domain_or_key):
-						applicable_secrets.update(content)
+				if domain_or_key in matched_domains:
+					applicable_secrets.update(content)
 			else:
 				# Old format: {key: value}, expose to all domains (only allowed for legacy reasons)
 				applicable_secrets[domain_or_key] = content
@@ -434,6 +460,8 @@ class Registry(Generic[Context]):
 		if all_missing_placeholders:
 			logger.warning(f'Missing or empty keys in sensitive_data dictionary: {", ".join(all_missing_placeholders)}')
 
+		if not replaced_placeholders:
+			return params  # nothing changed, no need to validate the params again
 		return type(params).model_validate(processed_params)
 
 	# @time_execution_sync('--create_action_model')
@@ -471,14 +499,17 @@ class Registry(Generic[Context]):
 			for name, action in available_actions.items()
 		}
 
-		self.telemetry.capture(
-			ControllerRegisteredFunctionsTelemetryEvent(
-				registered_functions=[
-					RegisteredFunction(name=name, params=action.param_model.model_json_schema())
-					for name, action in available_actions.items()
-				]
+		if self.telemetry.enabled:
+			for name, action in available_actions.items():
+				if name not in self._registered_functions:
+					self._registered_functions[name] = RegisteredFunction(
+						name=name, params=action.param_model.model_json_schema()
+					)
+			self.telemetry.capture(
+				ControllerRegisteredFunctionsTelemetryEvent(
+					registered_functions=[self._registered_functions[name] for name in available_actions]
+				)
 			)
-		)
 
 		return create_model('ActionModel', __base__=ActionModel, **fields)  # type:ignore
 
@@ -1,4 +1,5 @@
 from collections.abc import Callable
+from enum import Enum
 from typing import TYPE_CHECKING
 
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -11,6 +12,20 @@ if TYPE_CHECKING:
 	from browser_use.agent.service import Context
 
 
+class ActionSideEffect(str, Enum):
+	"""What an action changes, decides which actions of one step may run concurrently"""
+
+	PAGE_MUTATING = 'page_mutating'  # changes the current page, e.g. click, input, navigation
+	TAB_SCOPED = 'tab_scoped'  # opens, closes or switches tabs, which changes the page later actions run on
+	READ_ONLY = 'read_only'  # only reads the current page, e.g. extracting content
+	EXTERNAL = 'external'  # does not touch the browser, e.g. calling an API
+
+	@property
+	def runs_concurrently(self) -> bool:
+		"""Whether consecutive actions of this kind may run at the same time"""
+		return self in (ActionSideEffect.READ_ONLY, ActionSideEffect.EXTERNAL)
+
+
 class RegisteredAction(BaseModel):
 	"""Model for a registered action"""
 
@@ -23,6 +38,10 @@ class RegisteredAction(BaseModel):
 	domains: list[str] | None = None  # e.g. ['*.google.com', 'www.bing.com', 'yahoo.*]
 	page_filter: Callable[[Page], bool] | None = None
 
+	# names of the special params (browser_session, page, ...) the function takes, None if unknown
+	special_param_names: frozenset[str] | None = None
+	side_effect: ActionSideEffect = ActionSideEffect.PAGE_MUTATING
+
 	model_config = ConfigDict(arbitrary_types_allowed=True)
 
 	def prompt_description(self) -> str:
@@ -94,12 +113,9 @@ class ActionRegistry(BaseModel):
 			return True
 
 		# Use the centralized URL matching logic from utils
-		from browser_use.utils import match_url_with_domain_pattern
+		from browser_use.utils import get_domain_matcher
 
-		for domain_pattern in domains:
-			if match_url_with_domain_pattern(url, domain_pattern):
-				return True
-		return False
+		return get_domain_matcher(tuple(domains)).match(url) is not None
 
 	@staticmethod
 	def _match_page_filter(page_filter: Callable[[Page], bool] | None, page: Page) -> bool:
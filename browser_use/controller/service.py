@@ -6,7 +6,6 @@ import re
 from typing import Generic, TypeVar, cast
 
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.prompts import PromptTemplate
 from playwright.async_api import ElementHandle, Page
 
 # from lmnr.sdk.laminar import Laminar
@@ -14,12 +13,23 @@ from pydantic import BaseModel
 
 from browser_use.agent.views import ActionModel, ActionResult
 from browser_use.browser import BrowserSession
+from browser_use.controller.extraction.service import (
+	ContentExtractor,
+	ExtractionCache,
+	get_model_id,
+	hash_page_content,
+	read_page_content,
+	stream_page_markdown,
+)
+from browser_use.controller.extraction.views import ExtractionSettings
 from browser_use.controller.registry.service import Registry
+from browser_use.controller.registry.views import ActionSideEffect
 from browser_use.controller.views import (
 	ClickElementAction,
 	CloseTabAction,
 	DoneAction,
 	DragDropAction,
+	FillFormAction,
 	GoToUrlAction,
 	InputTextAction,
 	NoParamsAction,
@@ -30,7 +40,7 @@ from browser_use.controller.views import (
 	SendKeysAction,
 	SwitchTabAction,
 )
-from browser_use.utils import time_execution_sync
+from browser_use.utils import run_cpu_bound, time_execution_sync
 
 logger = logging.getLogger(__name__)
 
@@ -43,8 +53,11 @@ class Controller(Generic[Context]):
 		self,
 		exclude_actions: list[str] = [],
 		output_model: type[BaseModel] | None = None,
+		extraction_settings: ExtractionSettings | None = None,
 	):
 		self.registry = Registry[Context](exclude_actions)
+		self.extraction_settings = extraction_settings or ExtractionSettings()
+		self.extraction_cache = ExtractionCache.from_settings(self.extraction_settings)
 
 		"""Register all default browser actions"""
 
@@ -179,6 +192,31 @@ class Controller(Generic[Context]):
 			logger.debug(f'Element xpath: {element_node.xpath}')
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
+		@self.registry.action(
+			'Fill several form fields at once: text inputs, selects (option text) and checkboxes/radios (true/false)',
+			param_model=FillFormAction,
+		)
+		async def fill_form(params: FillFormAction, browser_session: BrowserSession, has_sensitive_data: bool = False):
+			selector_map = await browser_session.get_selector_map()
+			missing = [field.index for field in params.fields if field.index not in selector_map]
+			if missing:
+				raise Exception(f'Element indexes {missing} do not exist - retry or use alternative actions')
+
+			fields = [(selector_map[field.index], field.value) for field in params.fields]
+			errors = await browser_session._fill_element_nodes(fields)
+
+			filled = [field for field, error in zip(params.fields, errors) if error is None]
+			failed = [(field, error) for field, error in zip(params.fields, errors) if error is not None]
+			msg = f'📝  Filled {len(filled)}/{len(params.fields)} form fields'
+			if filled and not has_sensitive_data:  # never echo the values if any of them was a secret
+				msg += ': ' + ', '.join(f'{field.index}={field.value!r}' for field in filled)
+			for field, error in failed:
+				msg += f'\nFailed to fill index {field.index}: {error}'
+			logger.info(msg)
+			if len(failed) == len(params.fields):
+				return ActionResult(error=msg)
+			return ActionResult(extracted_content=msg, include_in_memory=True)
+
 		# Save PDF
 		@self.registry.action('Save the current page as a PDF file')
 		async def save_pdf(page: Page):
@@ -193,7 +231,7 @@ class Controller(Generic[Context]):
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
 		# Tab Management Actions
-		@self.registry.action('Switch tab', param_model=SwitchTabAction)
+		@self.registry.action('Switch tab', param_model=SwitchTabAction, side_effect=ActionSideEffect.TAB_SCOPED)
 		async def switch_tab(params: SwitchTabAction, browser_session: BrowserSession):
 			await browser_session.switch_to_tab(params.page_id)
 			# Wait for tab to be ready and ensure references are synchronized
@@ -203,14 +241,16 @@ class Controller(Generic[Context]):
 			logger.info(msg)
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
-		@self.registry.action('Open a specific url in new tab', param_model=OpenTabAction)
+		@self.registry.action(
+			'Open a specific url in new tab', param_model=OpenTabAction, side_effect=ActionSideEffect.TAB_SCOPED
+		)
 		async def open_tab(params: OpenTabAction, browser_session: BrowserSession):
 			await browser_session.create_new_tab(params.url)
 			msg = f'🔗  Opened new tab with {params.url}'
 			logger.info(msg)
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
-		@self.registry.action('Close an existing tab', param_model=CloseTabAction)
+		@self.registry.action('Close an existing tab', param_model=CloseTabAction, side_effect=ActionSideEffect.TAB_SCOPED)
 		async def close_tab(params: CloseTabAction, browser_session: BrowserSession):
 			await browser_session.switch_to_tab(params.page_id)
 			page = await browser_session.get_current_page()
@@ -225,42 +265,45 @@ class Controller(Generic[Context]):
 		# Content Actions
 		@self.registry.action(
 			'Extract page content to retrieve specific information from the page, e.g. all company names, a specific description, all information about xyc, 4 links with companies in structured format. Use include_links true if the goal requires links',
+			side_effect=ActionSideEffect.READ_ONLY,
 		)
 		async def extract_content(
 			goal: str,
 			page: Page,
+			browser_session: BrowserSession,
 			page_extraction_llm: BaseChatModel,
 			include_links: bool = False,
 		):
-			import markdownify
-
-			strip = []
-			if not include_links:
-				strip = ['a', 'img']
-
-			content = markdownify.markdownify(await page.content(), strip=strip)
-
-			# manually append iframe text into the content so it's readable by the LLM (includes cross-origin iframes)
-			for iframe in page.frames:
-				if iframe.url != page.url and not iframe.url.startswith('data:'):
-					content += f'\n\nIFRAME {iframe.url}:\n'
-					content += markdownify.markdownify(await iframe.content())
+			page_content = await read_page_content(page, browser_session, include_links, self.extraction_settings)
+
+			# the same goal on an unchanged page (e.g. after a retry or a scroll) is answered from the cache
+			cache_key = None
+			if self.extraction_cache.enabled:
+				content_hash = await run_cpu_bound(hash_page_content, page_content)
+				cache_key = self.extraction_cache.make_key(content_hash, goal, include_links, get_model_id(page_extraction_llm))
+				output = self.extraction_cache.get(cache_key)
+				if output is not None:
+					msg = f'📄  Extracted from page\n: {output}\n'
+					logger.info(msg)
+					return ActionResult(extracted_content=msg, include_in_memory=True)
 
-			prompt = 'Your task is to extract the content of the page. You will be given a page and a goal and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format. Extraction goal: {goal}, Page: {page}'
-			template = PromptTemplate(input_variables=['goal', 'page'], template=prompt)
+			extractor = ContentExtractor(page_extraction_llm, self.extraction_settings)
 			try:
-				output = await page_extraction_llm.ainvoke(template.format(goal=goal, page=content))
-				msg = f'📄  Extracted from page\n: {output.content}\n'
+				output = await extractor.extract(goal, stream_page_markdown(page_content, include_links=include_links))
+				if cache_key is not None and not extractor.failed_chunks:  # don't serve a partial result for the whole TTL
+					self.extraction_cache.set(cache_key, output)
+				msg = f'📄  Extracted from page\n: {output}\n'
 				logger.info(msg)
 				return ActionResult(extracted_content=msg, include_in_memory=True)
 			except Exception as e:
 				logger.debug(f'Error extracting content: {e}')
-				msg = f'📄  Extracted from page\n: {content}\n'
+				msg = f'📄  Extracted from page\n: {extractor.content}\n'
 				logger.info(msg)
 				return ActionResult(extracted_content=msg)
 
 		@self.registry.action(
 			'Get the accessibility tree of the page in the format "role name" with the number_of_elements to return',
+			side_effect=ActionSideEffect.READ_ONLY,
 		)
 		async def get_ax_tree(number_of_elements: int, page: Page):
 			node = await page.accessibility.snapshot(interesting_only=True)
@@ -280,48 +323,49 @@ class Controller(Generic[Context]):
 			logger.info(msg)
 			return ActionResult(extracted_content=msg, include_in_memory=False)
 
-		@self.registry.action(
-			'Scroll down the page by pixel amount - if none is given, scroll one page',
-			param_model=ScrollAction,
-		)
-		async def scroll_down(params: ScrollAction, browser_session: BrowserSession):
+		async def _scroll(params: ScrollAction, browser_session: BrowserSession, direction: int) -> ActionResult:
 			"""
-			(a) Use browser._scroll_container for container-aware scrolling.
+			(a) Use browser._scroll_container for container-aware scrolling, starting at the indexed element if given.
 			(b) If that JavaScript throws, fall back to window.scrollBy().
 			"""
 			page = await browser_session.get_current_page()
-			dy = params.amount or await page.evaluate('() => window.innerHeight')
+			# None = one page, the window height is measured in the scroll call itself
+			dy = direction * params.amount if params.amount else None
+
+			element = None
+			if params.index is not None:
+				if params.index not in await browser_session.get_selector_map():
+					raise Exception(f'Element with index {params.index} does not exist - retry or use alternative actions')
+				element = await browser_session.get_element_by_index(params.index)
 
 			try:
-				await browser_session._scroll_container(dy)
+				await browser_session._scroll_container(dy, pages=direction, element=element)
 			except Exception as e:
 				# Hard fallback: always works on root scroller
-				await page.evaluate('(y) => window.scrollBy(0, y)', dy)
+				await page.evaluate(
+					'({ y, pages }) => window.scrollBy(0, y ?? pages * window.innerHeight)', {'y': dy, 'pages': direction}
+				)
 				logger.debug('Smart scroll failed; used window.scrollBy fallback', exc_info=e)
 
 			amount_str = f'{params.amount} pixels' if params.amount is not None else 'one page'
-			msg = f'🔍 Scrolled down the page by {amount_str}'
+			target_str = f'container of element {params.index}' if params.index is not None else 'the page'
+			msg = f'🔍 Scrolled {"down" if direction > 0 else "up"} {target_str} by {amount_str}'
 			logger.info(msg)
 			return ActionResult(extracted_content=msg, include_in_memory=True)
 
 		@self.registry.action(
-			'Scroll up the page by pixel amount - if none is given, scroll one page',
+			'Scroll down the page by pixel amount - if none is given, scroll one page. Pass index to scroll the container holding that element instead',
 			param_model=ScrollAction,
 		)
-		async def scroll_up(params: ScrollAction, browser_session: BrowserSession):
-			page = await browser_session.get_current_page()
-			dy = -(params.amount or await page.evaluate('() => window.innerHeight'))
-
-			try:
-				await browser_session._scroll_container(dy)
-			except Exception as e:
-				await page.evaluate('(y) => window.scrollBy(0, y)', dy)
-				logger.debug('Smart scroll failed; used window.scrollBy fallback', exc_info=e)
+		async def scroll_down(params: ScrollAction, browser_session: BrowserSession):
+			return await _scroll(params, browser_session, direction=1)
 
-			amount_str = f'{params.amount} pixels' if params.amount is not None else 'one page'
-			msg = f'🔍 Scrolled up the page by {amount_str}'
-			logger.info(msg)
-			return ActionResult(extracted_content=msg, include_in_memory=True)
+		@self.registry.action(
+			'Scroll up the page by pixel amount - if none is given, scroll one page. Pass index to scroll the container holding that element instead',
+			param_model=ScrollAction,
+		)
+		async def scroll_up(params: ScrollAction, browser_session: BrowserSession):
+			return await _scroll(params, browser_session, direction=-1)
 
 		# send keys
 		@self.registry.action(
@@ -389,57 +433,49 @@ class Controller(Generic[Context]):
 
 		@self.registry.action(
 			description='Get all options from a native dropdown',
+			side_effect=ActionSideEffect.READ_ONLY,
 		)
 		async def get_dropdown_options(index: int, browser_session: BrowserSession) -> ActionResult:
 			"""Get all options from a native dropdown"""
-			page = await browser_session.get_current_page()
 			selector_map = await browser_session.get_selector_map()
 			dom_element = selector_map[index]
 
 			try:
-				# Frame-aware approach since we know it works
+				# Frame-aware approach: the frame holding the element is tried first, all frames concurrently otherwise
 				all_options = []
-				frame_index = 0
-
-				for frame in page.frames:
-					try:
-						options = await frame.evaluate(
-							"""
-							(xpath) => {
-								const select = document.evaluate(xpath, document, null,
-									XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-								if (!select) return null;
-
-								return {
-									options: Array.from(select.options).map(opt => ({
-										text: opt.text, //do not trim, because we are doing exact match in select_dropdown_option
-										value: opt.value,
-										index: opt.index
-									})),
-									id: select.id,
-									name: select.name
-								};
-							}
-						""",
-							dom_element.xpath,
-						)
-
-						if options:
-							logger.debug(f'Found dropdown in frame {frame_index}')
-							logger.debug(f'Dropdown ID: {options["id"]}, Name: {options["name"]}')
-
-							formatted_options = []
-							for opt in options['options']:
-								# encoding ensures AI uses the exact string in select_dropdown_option
-								encoded_text = json.dumps(opt['text'])
-								formatted_options.append(f'{opt["index"]}: text={encoded_text}')
+				frame_results = await browser_session.evaluate_in_frames(
+					"""
+					(xpath) => {
+						const select = document.evaluate(xpath, document, null,
+							XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+						if (!select) return null;
+
+						return {
+							options: Array.from(select.options).map(opt => ({
+								text: opt.text, //do not trim, because we are doing exact match in select_dropdown_option
+								value: opt.value,
+								index: opt.index
+							})),
+							id: select.id,
+							name: select.name
+						};
+					}
+				""",
+					dom_element.xpath,
+					element=dom_element,
+				)
 
-							all_options.extend(formatted_options)
+				for frame, options in frame_results:
+					logger.debug(f'Found dropdown in frame {frame.url}')
+					logger.debug(f'Dropdown ID: {options["id"]}, Name: {options["name"]}')
 
-					except Exception as frame_e:
-						logger.debug(f'Frame {frame_index} evaluation failed: {str(frame_e)}')
+					formatted_options = []
+					for opt in options['options']:
+						# encoding ensures AI uses the exact string in select_dropdown_option
+						encoded_text = json.dumps(opt['text'])
+						formatted_options.append(f'{opt["index"]}: text={encoded_text}')
 
-					frame_index += 1
+					all_options.extend(formatted_options)
 
 				if all_options:
 					msg = '\n'.join(all_options)
@@ -466,7 +502,6 @@ class Controller(Generic[Context]):
 			browser_session: BrowserSession,
 		) -> ActionResult:
 			"""Select dropdown option by the text of the option you want to select"""
-			page = await browser_session.get_current_page()
 			selector_map = await browser_session.get_selector_map()
 			dom_element = selector_map[index]
 
@@ -480,69 +515,58 @@ class Controller(Generic[Context]):
 			logger.debug(f'Element attributes: {dom_element.attributes}')
 			logger.debug(f'Element tag: {dom_element.tag_name}')
 
-			xpath = '//' + dom_element.xpath
+			# First verify we can find the dropdown, in the frame holding it or in any frame
+			find_dropdown_js = """
+				(xpath) => {
+					try {
+						const select = document.evaluate(xpath, document, null,
+							XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+						if (!select) return null;
+						if (select.tagName.toLowerCase() !== 'select') {
+							return {
+								error: `Found element but it's a ${select.tagName}, not a SELECT`,
+								found: false
+							};
+						}
+						return {
+							id: select.id,
+							name: select.name,
+							found: true,
+							tagName: select.tagName,
+							optionCount: select.options.length,
+							currentValue: select.value,
+							availableOptions: Array.from(select.options).map(o => o.text.trim())
+						};
+					} catch (e) {
+						return {error: e.toString(), found: false};
+					}
+				}
+			"""
 
 			try:
-				frame_index = 0
-				for frame in page.frames:
+				frame_results = await browser_session.evaluate_in_frames(find_dropdown_js, dom_element.xpath, element=dom_element)
+				for frame, dropdown_info in frame_results:
+					if not dropdown_info.get('found'):
+						logger.error(f'Frame {frame.url} error: {dropdown_info.get("error")}')
+						continue
+
+					logger.debug(f'Found dropdown in frame {frame.url}: {dropdown_info}')
+
 					try:
-						logger.debug(f'Trying frame {frame_index} URL: {frame.url}')
-
-						# First verify we can find the dropdown in this frame
-						find_dropdown_js = """
-							(xpath) => {
-								try {
-									const select = document.evaluate(xpath, document, null,
-										XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-									if (!select) return null;
-									if (select.tagName.toLowerCase() !== 'select') {
-										return {
-											error: `Found element but it's a ${select.tagName}, not a SELECT`,
-											found: false
-										};
-									}
-									return {
-										id: select.id,
-										name: select.name,
-										found: true,
-										tagName: select.tagName,
-										optionCount: select.options.length,
-										currentValue: select.value,
-										availableOptions: Array.from(select.options).map(o => o.text.trim())
-									};
-								} catch (e) {
-									return {error: e.toString(), found: false};
-								}
-							}
-						"""
-
-						dropdown_info = await frame.evaluate(find_dropdown_js, dom_element.xpath)
-
-						if dropdown_info:
-							if not dropdown_info.get('found'):
-								logger.error(f'Frame {frame_index} error: {dropdown_info.get("error")}')
-								continue
-
-							logger.debug(f'Found dropdown in frame {frame_index}: {dropdown_info}')
-
-							# "label" because we are selecting by text
-							# nth(0) to disable error thrown by strict mode
-							# timeout=1000 because we are already waiting for all network events, therefore ideally we don't need to wait a lot here (default 30s)
-							selected_option_values = (
-								await frame.locator('//' + dom_element.xpath).nth(0).select_option(label=text, timeout=1000)
-							)
+						# "label" because we are selecting by text
+						# nth(0) to disable error thrown by strict mode
+						# timeout=1000 because we are already waiting for all network events, therefore ideally we don't need to wait a lot here (default 30s)
+						selected_option_values = (
+							await frame.locator('//' + dom_element.xpath).nth(0).select_option(label=text, timeout=1000)
+						)
 
-							msg = f'selected option {text} with value {selected_option_values}'
-							logger.info(msg + f' in frame {frame_index}')
+						msg = f'selected option {text} with value {selected_option_values}'
+						logger.info(msg + f' in frame {frame.url}')
 
-							return ActionResult(extracted_content=msg, include_in_memory=True)
+						return ActionResult(extracted_content=msg, include_in_memory=True)
 
 					except Exception as frame_e:
-						logger.error(f'Frame {frame_index} attempt failed: {str(frame_e)}')
-						logger.error(f'Frame type: {type(frame)}')
-						logger.error(f'Frame URL: {frame.url}')
-
-					frame_index += 1
+						logger.error(f'Frame {frame.url} attempt failed: {str(frame_e)}')
 
 				msg = f"Could not select option '{text}' in any frame"
 				logger.info(msg)
@@ -865,8 +889,9 @@ class Controller(Generic[Context]):
 	) -> ActionResult:
 		"""Execute an action"""
 
-		for action_name, params in action.model_dump(exclude_unset=True).items():
-			if params is not None:
+		# pass the already validated param models on, instead of dumping and validating them again
+		for action_name, params in action:
+			if action_name in action.model_fields_set and params is not None:
 				# with Laminar.start_as_current_span(
 				# 	name=action_name,
 				# 	input={
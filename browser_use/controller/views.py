@@ -21,6 +21,15 @@ class InputTextAction(BaseModel):
 	xpath: str | None = None
 
 
+class FormField(BaseModel):
+	index: int
+	value: str  # text to type, option text for a select, true/false for a checkbox or radio
+
+
+class FillFormAction(BaseModel):
+	fields: list[FormField]
+
+
 class DoneAction(BaseModel):
 	text: str
 	success: bool
@@ -40,6 +49,7 @@ class CloseTabAction(BaseModel):
 
 class ScrollAction(BaseModel):
 	amount: int | None = None  # The number of pixels to scroll. If None, scroll down/up one page
+	index: int | None = None  # Index of an element inside the container to scroll, e.g. a list or modal. If None, the page
 
 
 class SendKeysAction(BaseModel):
@@ -210,6 +210,30 @@
    */
   const DOM_HASH_MAP = {};
 
+  /**
+   * Visible elements that own a vertical scrollbar, in document order.
+   * Exposed as window._browserUseScrollContainers so scroll actions can target them without rescanning the page.
+   *
+   * @type {Element[]}
+   */
+  const SCROLL_CONTAINERS = [];
+
+  /**
+   * Highlighted elements of this snapshot, indexed by highlight index, with the xpath they were reported with.
+   * Exposed as window._browserUseElementRefs so actions can resolve an index in one call; the table is replaced by
+   * every snapshot and dropped with the document on navigation.
+   *
+   * @type {Array<{ref: WeakRef<Element>, xpath: string}>}
+   */
+  const ELEMENT_REFS = [];
+
+  /**
+   * Documents walked by this snapshot, the top document and accessible iframe documents.
+   *
+   * @type {Document[]}
+   */
+  const SNAPSHOT_DOCUMENTS = [document];
+
   const ID = { current: 0 };
 
   const HIGHLIGHT_CONTAINER_ID = "playwright-highlight-container";
@@ -643,6 +667,15 @@
    * 
    * One of the things we tried at the beginning was also to use event listeners, and other fancy class, style stuff -> what actually worked best was just combining most things with computed cursor style :)
    */
+  /**
+   * Checks if an element can scroll its own content vertically.
+   */
+  function isScrollContainer(element) {
+    if (element.scrollHeight <= element.clientHeight) return false;
+    const style = getCachedComputedStyle(element);
+    return !!style && /(auto|scroll|overlay)/.test(style.overflowY);
+  }
+
   function isInteractiveElement(element) {
     if (!element || element.nodeType !== Node.ELEMENT_NODE) {
       return false;
@@ -1190,6 +1223,7 @@
       // regardless of viewport status
       if (nodeData.isInViewport || viewportExpansion === -1) {
         nodeData.highlightIndex = highlightIndex++;
+        ELEMENT_REFS[nodeData.highlightIndex] = { ref: new WeakRef(node), xpath: nodeData.xpath };
 
         if (doHighlightElements) {
           if (focusHighlightIndex >= 0) {
@@ -1331,6 +1365,10 @@
     if (node.nodeType === Node.ELEMENT_NODE) {
       nodeData.isVisible = isElementVisible(node); // isElementVisible uses offsetWidth/Height, which is fine
       if (nodeData.isVisible) {
+        if (isScrollContainer(node)) {
+          nodeData.isScrollable = true;
+          SCROLL_CONTAINERS.push(node);
+        }
         nodeData.isTopElement = isTopElement(node);
         if (nodeData.isTopElement) {
           nodeData.isInteractive = isInteractiveElement(node);
@@ -1349,6 +1387,7 @@
         try {
           const iframeDoc = node.contentDocument || node.contentWindow?.document;
           if (iframeDoc) {
+            SNAPSHOT_DOCUMENTS.push(iframeDoc);
             for (const child of iframeDoc.childNodes) {
               const domElement = buildDomTree(child, node, false);
               if (domElement) nodeData.children.push(domElement);
@@ -1406,6 +1445,74 @@
   // After all functions are defined, wrap them with performance measurement
   // Remove buildDomTree from here as we measure it separately
   highlightElement = measureTime(highlightElement);
+  /**
+   * Lets actions check whether the interactive part of the page changed since this snapshot without taking a new one.
+   * A MutationObserver watches for changes outside the highlight overlay. Any added element counts as a change, as it
+   * may be interactive in ways only the full snapshot detects (cursor:pointer, framework click handlers). For other
+   * changes, a digest of the snapshot's elements and of all rendered interactive candidates is recomputed and compared.
+   * Exposed as window._browserUseHasChanged, replaced by every snapshot and dropped with the document on navigation.
+   */
+  function installChangeProbe() {
+    const CANDIDATE_SELECTOR =
+      "a[href], button, input, select, textarea, summary, [role], [onclick], [contenteditable], [tabindex]";
+
+    // added scripts and styles (e.g. of analytics) are never interactive themselves
+    const NON_CONTENT_TAGS = new Set(["SCRIPT", "STYLE", "LINK", "META", "NOSCRIPT", "TEMPLATE"]);
+
+    const isRendered = element =>
+      element.checkVisibility ? element.checkVisibility({ visibilityProperty: true }) : element.getClientRects().length > 0;
+
+    function digest() {
+      let hash = 0;
+      const add = text => {
+        for (let i = 0; i < text.length; i++) hash = (Math.imul(hash, 31) + text.charCodeAt(i)) | 0;
+      };
+      for (const entry of ELEMENT_REFS) {
+        const element = entry?.ref.deref();
+        add(element?.isConnected ? `${isRendered(element)}${element.disabled};` : "gone;");
+      }
+      for (const doc of SNAPSHOT_DOCUMENTS) {
+        for (const element of doc.querySelectorAll(CANDIDATE_SELECTOR)) {
+          if (isRendered(element)) add(`${element.tagName};`);
+        }
+      }
+      return hash;
+    }
+
+    function isOverlayRecord(record) {
+      if (record.attributeName === "browser-user-highlight-id") return true;
+      const target = record.target.nodeType === Node.ELEMENT_NODE ? record.target : record.target.parentElement;
+      if (target?.closest(`#${HIGHLIGHT_CONTAINER_ID}`)) return true;
+      const nodes = [...record.addedNodes, ...record.removedNodes];
+      return nodes.length > 0 && nodes.every(node => node.id === HIGHLIGHT_CONTAINER_ID);
+    }
+
+    window._browserUseMutationObserver?.disconnect();
+    let mutations = 0;
+    let addedElements = false;
+    const countMutations = records => {
+      for (const record of records) {
+        if (isOverlayRecord(record)) continue;
+        mutations++;
+        if ([...record.addedNodes].some(node => node.nodeType === Node.ELEMENT_NODE && !NON_CONTENT_TAGS.has(node.tagName))) {
+          addedElements = true;
+        }
+      }
+    };
+    const observer = new MutationObserver(countMutations);
+    for (const doc of SNAPSHOT_DOCUMENTS) {
+      observer.observe(doc, { subtree: true, childList: true, attributes: true });
+    }
+    window._browserUseMutationObserver = observer;
+
+    const snapshotDigest = digest();
+    window._browserUseHasChanged = () => {
+      // deliver records still queued for the observer callback
+      countMutations(observer.takeRecords());
+      return addedElements || (mutations > 0 && digest() !== snapshotDigest);
+    };
+  }
+
   isInteractiveElement = measureTime(isInteractiveElement);
   isElementVisible = measureTime(isElementVisible);
   isTopElement = measureTime(isTopElement);
@@ -1415,6 +1522,10 @@
 
   const rootId = buildDomTree(document.body);
 
+  window._browserUseScrollContainers = SCROLL_CONTAINERS;
+  window._browserUseElementRefs = ELEMENT_REFS;
+  installChangeProbe();
+
   // Clear the cache before starting
   DOM_CACHE.clearCache();
 
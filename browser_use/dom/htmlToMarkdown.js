@@ -0,0 +1,140 @@
+(
+  args = {
+    includeLinks: false,
+  }
+) => {
+  const { includeLinks } = args;
+
+  // Same elements buildDomTree.js never accepts, their content is never page text
+  const SKIPPED_TAGS = new Set(["script", "style", "link", "meta", "noscript", "template", "svg", "head", "iframe", "object"]);
+
+  const BLOCK_TAGS = new Set([
+    "address", "article", "aside", "body", "dd", "details", "dialog", "div", "dl", "dt", "fieldset", "figcaption",
+    "figure", "footer", "form", "header", "hgroup", "html", "legend", "main", "nav", "p", "section", "summary",
+  ]);
+
+  /**
+   * Checks if an element renders at all, with the same style checks as buildDomTree.js's isElementVisible.
+   * Size is checked through client rects so that empty containers around floated or positioned children are kept.
+   */
+  function isRendered(element) {
+    const style = window.getComputedStyle(element);
+    if (style.display === "none" || style.visibility === "hidden") return false;
+    if (style.display === "contents") return true;
+    return element.getClientRects().length > 0;
+  }
+
+  function escapeInline(text) {
+    return text.replace(/([*_])/g, "\\$1");
+  }
+
+  function wrap(marker, text) {
+    const trimmed = text.trim();
+    return trimmed ? `${marker}${trimmed}${marker}` : "";
+  }
+
+  function block(text) {
+    const trimmed = text.trim();
+    return trimmed ? `\n\n${trimmed}\n\n` : "";
+  }
+
+  function children(node, context) {
+    let out = "";
+    for (const child of node.childNodes) out += convert(child, context);
+    if (node.shadowRoot) {
+      for (const child of node.shadowRoot.childNodes) out += convert(child, context);
+    }
+    return out;
+  }
+
+  function convertList(element, context) {
+    const ordered = element.tagName.toLowerCase() === "ol";
+    const indent = "  ".repeat(context.listDepth);
+    let number = Number(element.getAttribute("start") || 1);
+    let out = "";
+    for (const item of element.children) {
+      if (item.tagName.toLowerCase() !== "li" || !isRendered(item)) continue;
+      const marker = ordered ? `${number++}.` : "*";
+      const text = children(item, { ...context, listDepth: context.listDepth + 1 })
+        .trim()
+        .replace(/\n{2,}/g, "\n");
+      if (text) out += `${indent}${marker} ${text}\n`;
+    }
+    return context.listDepth ? `\n${out}` : block(out);
+  }
+
+  function convertTable(element, context) {
+    const rows = [];
+    for (const row of element.querySelectorAll("tr")) {
+      if (row.closest("table") !== element || !isRendered(row)) continue;
+      const cells = [...row.children]
+        .filter(cell => /^t[hd]$/i.test(cell.tagName) && isRendered(cell))
+        .map(cell => children(cell, context).replace(/\s+/g, " ").replace(/\|/g, "\\|").trim());
+      if (cells.length) rows.push(cells);
+    }
+    if (!rows.length) return "";
+    const width = Math.max(...rows.map(cells => cells.length));
+    const lines = rows.map(cells => `| ${[...cells, ...Array(width - cells.length).fill("")].join(" | ")} |`);
+    lines.splice(1, 0, `| ${Array(width).fill("---").join(" | ")} |`);
+    return block(lines.join("\n"));
+  }
+
+  function convert(node, context) {
+    if (node.nodeType === Node.TEXT_NODE) {
+      if (context.pre) return node.textContent;
+      return escapeInline(node.textContent.replace(/\s+/g, " "));
+    }
+    if (node.nodeType !== Node.ELEMENT_NODE) return "";
+
+    const tagName = node.tagName.toLowerCase();
+    if (SKIPPED_TAGS.has(tagName) || !isRendered(node)) return "";
+
+    switch (tagName) {
+      case "h1": case "h2": case "h3": case "h4": case "h5": case "h6": {
+        const text = children(node, context).replace(/\s+/g, " ").trim();
+        return text ? `\n\n${"#".repeat(Number(tagName[1]))} ${text}\n\n` : "";
+      }
+      case "br":
+        return "\n";
+      case "hr":
+        return "\n\n---\n\n";
+      case "strong": case "b":
+        return wrap("**", children(node, context));
+      case "em": case "i":
+        return wrap("*", children(node, context));
+      case "code":
+        return context.pre ? node.textContent : wrap("`", node.textContent);
+      case "pre":
+        return block("```\n" + children(node, { ...context, pre: true }).replace(/\n+$/, "") + "\n```");
+      case "blockquote":
+        return block(children(node, context).trim().replace(/^/gm, "> "));
+      case "ul": case "ol":
+        return convertList(node, context);
+      case "li":
+        return block(children(node, context));
+      case "table":
+        return convertTable(node, context);
+      case "a": {
+        const text = children(node, context).trim();
+        const href = node.getAttribute("href");
+        if (!includeLinks || !href || href.startsWith("javascript:")) return text;
+        return `[${text}](${node.href})`;
+      }
+      case "img": {
+        if (!includeLinks) return "";
+        const src = node.getAttribute("src");
+        return src ? `![${escapeInline(node.getAttribute("alt") || "")}](${node.src})` : "";
+      }
+      default:
+        return BLOCK_TAGS.has(tagName) ? block(children(node, context)) : children(node, context);
+    }
+  }
+
+  const root = document.body || document.documentElement;
+  const markdown = convert(root, { pre: false, listDepth: 0 });
+  const title = document.title ? `${document.title}\n\n` : "";
+  return (title + markdown)
+    .replace(/[ \t]+\n/g, "\n")
+    .replace(/\n{3,}/g, "\n\n")
+    .trim();
+}
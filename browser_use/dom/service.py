@@ -14,7 +14,7 @@ from browser_use.dom.views import (
 	DOMTextNode,
 	SelectorMap,
 )
-from browser_use.utils import time_execution_async
+from browser_use.utils import run_cpu_bound, time_execution_async
 
 logger = logging.getLogger(__name__)
 
@@ -68,9 +68,6 @@ class DomService:
 		focus_element: int,
 		viewport_expansion: int,
 	) -> tuple[DOMElementNode, SelectorMap]:
-		if await self.page.evaluate('1+1') != 2:
-			raise ValueError('The page cannot evaluate javascript code properly')
-
 		if self.page.url == 'about:blank':
 			# short-circuit if the page is a new empty tab for speed, no need to inject buildDomTree.js
 			return (
@@ -102,6 +99,10 @@ class DomService:
 			logger.error('Error evaluating JavaScript: %s', e)
 			raise
 
+		# validate the result itself instead of spending a separate round-trip on a 1+1 probe beforehand
+		if not isinstance(eval_page, dict) or 'map' not in eval_page or 'rootId' not in eval_page:
+			raise ValueError('The page cannot evaluate javascript code properly')
+
 		# Only log performance metrics in debug mode
 		if debug_mode and 'perfMetrics' in eval_page:
 			perf = eval_page['perfMetrics']
@@ -133,6 +134,13 @@ class DomService:
 	async def _construct_dom_tree(
 		self,
 		eval_page: dict,
+	) -> tuple[DOMElementNode, SelectorMap]:
+		# pure Python work proportional to the page size, run it off the event loop if a CPU executor is configured
+		return await run_cpu_bound(self._construct_dom_tree_sync, eval_page)
+
+	def _construct_dom_tree_sync(
+		self,
+		eval_page: dict,
 	) -> tuple[DOMElementNode, SelectorMap]:
 		js_node_map = eval_page['map']
 		js_root_id = eval_page['rootId']
@@ -210,6 +218,7 @@ class DomService:
 			is_in_viewport=node_data.get('isInViewport', False),
 			highlight_index=node_data.get('highlightIndex'),
 			shadow_root=node_data.get('shadowRoot', False),
+			is_scrollable=node_data.get('isScrollable', False),
 			parent=None,
 			viewport_info=viewport_info,
 		)
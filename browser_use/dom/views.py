@@ -67,6 +67,7 @@ class DOMElementNode(DOMBaseNode):
 	is_top_element: bool = False
 	is_in_viewport: bool = False
 	shadow_root: bool = False
+	is_scrollable: bool = False
 	highlight_index: int | None = None
 	viewport_coordinates: CoordinateSet | None = None
 	page_coordinates: CoordinateSet | None = None
@@ -89,6 +90,7 @@ class DOMElementNode(DOMBaseNode):
 			'is_top_element': self.is_top_element,
 			'is_in_viewport': self.is_in_viewport,
 			'shadow_root': self.shadow_root,
+			'is_scrollable': self.is_scrollable,
 			'highlight_index': self.highlight_index,
 			'viewport_coordinates': self.viewport_coordinates,
 			'page_coordinates': self.page_coordinates,
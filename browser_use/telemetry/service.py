@@ -1,17 +1,16 @@
+import atexit
 import logging
 import os
+import queue
+import threading
+from collections.abc import Callable
 from pathlib import Path
 
-from dotenv import load_dotenv
-from posthog import Posthog
 from uuid_extensions import uuid7str
 
 from browser_use.telemetry.views import BaseTelemetryEvent
 from browser_use.utils import singleton
 
-load_dotenv()
-
-
 logger = logging.getLogger(__name__)
 
 
@@ -28,12 +27,79 @@ def xdg_cache_home() -> Path:
 	return default
 
 
+class TelemetryWorker:
+	"""
+	Sends telemetry events from a background thread, so capturing an event never blocks the caller.
+
+	Events wait in a bounded queue; when it is full new events are dropped and counted instead of slowing the agent
+	down. Events with a coalesce_key are sent only once per key, e.g. the same set of registered actions that is
+	reported on every step.
+	"""
+
+	def __init__(self, send: Callable[[BaseTelemetryEvent], None], max_queue_size: int = 1000):
+		self._send = send
+		self._queue: queue.Queue[BaseTelemetryEvent | threading.Event] = queue.Queue(maxsize=max_queue_size)
+		self._coalesce_keys: set[str] = set()
+		self._lock = threading.Lock()
+		self._thread: threading.Thread | None = None
+		self.events_sent = 0
+		self.events_dropped = 0
+		self.events_coalesced = 0
+		self.events_failed = 0
+
+	def submit(self, event: BaseTelemetryEvent) -> None:
+		key = event.coalesce_key
+		with self._lock:
+			if key is not None:
+				if key in self._coalesce_keys:
+					self.events_coalesced += 1
+					return
+				self._coalesce_keys.add(key)
+			if self._thread is None:
+				self._thread = threading.Thread(target=self._run, name='browser_use_telemetry', daemon=True)
+				self._thread.start()
+
+		try:
+			self._queue.put_nowait(event)
+		except queue.Full:
+			self.events_dropped += 1
+			if self.events_dropped == 1 or self.events_dropped % 100 == 0:
+				logger.debug(f'Telemetry queue is full, dropped {self.events_dropped} events so far')
+
+	def flush(self, timeout: float = 5.0) -> bool:
+		"""Waits until the events submitted so far have been sent, returns False if that took longer than timeout"""
+		if self._thread is None:
+			return True
+		done = threading.Event()
+		try:
+			self._queue.put(done, timeout=timeout)
+		except queue.Full:
+			return False
+		return done.wait(timeout)
+
+	def _run(self) -> None:
+		while True:
+			item = self._queue.get()
+			if isinstance(item, threading.Event):
+				item.set()
+				continue
+			try:
+				self._send(item)
+				self.events_sent += 1
+			except Exception as e:
+				self.events_failed += 1
+				logger.error(f'Failed to send telemetry event {item.name}: {e}')
+
+
 @singleton
 class ProductTelemetry:
 	"""
 	Service for capturing anonymized telemetry data.
 
 	If the environment variable `ANONYMIZED_TELEMETRY=False`, anonymized telemetry will be disabled.
+
+	Events are handed to a TelemetryWorker thread, which also creates the PostHog client and reads the user id file,
+	so capture() does no I/O on the caller's thread.
 	"""
 
 	USER_ID_PATH = str(xdg_cache_home() / 'browser_use' / 'telemetry_user_id')
@@ -44,15 +110,35 @@ class ProductTelemetry:
 	_curr_user_id = None
 
 	def __init__(self) -> None:
-		telemetry_disabled = os.getenv('ANONYMIZED_TELEMETRY', 'true').lower() == 'false'
+		self.enabled = os.getenv('ANONYMIZED_TELEMETRY', 'true').lower() != 'false'
 		self.debug_logging = os.getenv('BROWSER_USE_LOGGING_LEVEL', 'info').lower() == 'debug'
+		self._posthog_client = None
+		self._worker: TelemetryWorker | None = None
 
-		if telemetry_disabled:
-			self._posthog_client = None
-		else:
+		if self.enabled:
 			logger.info(
 				'Anonymized telemetry enabled. See https://docs.browser-use.com/development/telemetry for more information.'
 			)
+			max_queue_size = int(os.getenv('BROWSER_USE_TELEMETRY_QUEUE_SIZE', '1000'))
+			self._worker = TelemetryWorker(self._direct_capture, max_queue_size=max_queue_size)
+			# send what is still queued when the process exits, but never hold up the exit for long
+			atexit.register(self.flush, timeout=1.0)
+		else:
+			logger.debug('Telemetry disabled')
+
+	def capture(self, event: BaseTelemetryEvent) -> None:
+		if self._worker is None:
+			return
+
+		if self.debug_logging:
+			logger.debug(f'Telemetry event: {event.name} {event.properties}')
+		self._worker.submit(event)
+
+	def _get_posthog_client(self):
+		"""Creates the PostHog client on first use, on the worker thread"""
+		if self._posthog_client is None:
+			from posthog import Posthog  # deferred, it is slow to import and not needed when telemetry is disabled
+
 			self._posthog_client = Posthog(
 				project_api_key=self.PROJECT_API_KEY,
 				host=self.HOST,
@@ -64,43 +150,32 @@ class ProductTelemetry:
 			if not self.debug_logging:
 				posthog_logger = logging.getLogger('posthog')
 				posthog_logger.disabled = True
-
-		if self._posthog_client is None:
-			logger.debug('Telemetry disabled')
-
-	def capture(self, event: BaseTelemetryEvent) -> None:
-		if self._posthog_client is None:
-			return
-
-		if self.debug_logging:
-			logger.debug(f'Telemetry event: {event.name} {event.properties}')
-		self._direct_capture(event)
+		return self._posthog_client
 
 	def _direct_capture(self, event: BaseTelemetryEvent) -> None:
 		"""
-		Should not be thread blocking because posthog magically handles it
+		Runs on the worker thread, posthog queues the event again and sends it in batches from its own thread
 		"""
-		if self._posthog_client is None:
+		self._get_posthog_client().capture(
+			self.user_id,
+			event.name,
+			{**event.properties, **POSTHOG_EVENT_SETTINGS},
+		)
+
+	def flush(self, timeout: float = 5.0) -> None:
+		if self._worker is None:
+			logger.debug('Telemetry disabled, skipping flush.')
 			return
 
-		try:
-			self._posthog_client.capture(
-				self.user_id,
-				event.name,
-				{**event.properties, **POSTHOG_EVENT_SETTINGS},
-			)
-		except Exception as e:
-			logger.error(f'Failed to send telemetry event {event.name}: {e}')
-
-	def flush(self) -> None:
+		if not self._worker.flush(timeout=timeout):
+			logger.debug(f'Telemetry events were still queued after {timeout}s, skipping flush.')
+			return
 		if self._posthog_client:
 			try:
 				self._posthog_client.flush()
 				logger.debug('PostHog client telemetry queue flushed.')
 			except Exception as e:
 				logger.error(f'Failed to flush PostHog client: {e}')
-		else:
-			logger.debug('PostHog client not available, skipping flush.')
 
 	@property
 	def user_id(self) -> str:
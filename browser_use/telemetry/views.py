@@ -15,6 +15,11 @@ class BaseTelemetryEvent(ABC):
 	def properties(self) -> dict[str, Any]:
 		return {k: v for k, v in asdict(self).items() if k != 'name'}
 
+	@property
+	def coalesce_key(self) -> str | None:
+		"""Events with the same key are sent only once per process, None sends every event"""
+		return None
+
 
 @dataclass
 class RegisteredFunction:
@@ -27,6 +32,11 @@ class ControllerRegisteredFunctionsTelemetryEvent(BaseTelemetryEvent):
 	registered_functions: list[RegisteredFunction]
 	name: str = 'controller_registered_functions'
 
+	@property
+	def coalesce_key(self) -> str | None:
+		# reported on every step, but only changes when actions are registered or filtered by page
+		return f'{self.name}:{",".join(sorted(f.name for f in self.registered_functions))}'
+
 
 @dataclass
 class AgentTelemetryEvent(BaseTelemetryEvent):
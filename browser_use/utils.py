@@ -4,9 +4,10 @@ import os
 import platform
 import signal
 import time
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
 from fnmatch import fnmatch
-from functools import wraps
+from functools import lru_cache, partial, wraps
 from sys import stderr
 from typing import Any, ParamSpec, TypeVar
 from urllib.parse import urlparse
@@ -340,6 +341,41 @@ def time_execution_async(
 	return decorator
 
 
+# Executor for CPU-bound per-step work (DOM tree construction, element serialization, hashing, base64, markdownify)
+_cpu_executor: Executor | None = None
+_cpu_executor_from_env = False
+
+
+def set_cpu_executor(executor: Executor | None) -> None:
+	"""
+	Run CPU-bound per-step work in this executor instead of on the event loop, e.g. a ThreadPoolExecutor(4).
+	None runs it inline on the loop (the default, unless BROWSER_USE_CPU_THREADS=N is set in the environment).
+	The work operates on in-memory DOM trees with parent pointers, so thread executors are the right fit.
+	"""
+	global _cpu_executor, _cpu_executor_from_env
+	_cpu_executor = executor
+	_cpu_executor_from_env = True  # an explicit choice always wins over the env var
+
+
+def get_cpu_executor() -> Executor | None:
+	"""Get the executor set with set_cpu_executor(), or one created from BROWSER_USE_CPU_THREADS"""
+	global _cpu_executor, _cpu_executor_from_env
+	if not _cpu_executor_from_env:
+		_cpu_executor_from_env = True
+		threads = int(os.getenv('BROWSER_USE_CPU_THREADS', '0') or 0)
+		if threads > 0:
+			_cpu_executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='browser_use_cpu')
+	return _cpu_executor
+
+
+async def run_cpu_bound(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+	"""Run a CPU-bound function in the configured executor so the event loop stays responsive, or inline if none is set"""
+	executor = get_cpu_executor()
+	if executor is None:
+		return func(*args, **kwargs)
+	return await asyncio.get_running_loop().run_in_executor(executor, partial(func, *args, **kwargs))
+
+
 def singleton(cls):
 	instance = [None]
 
@@ -400,83 +436,146 @@ def match_url_with_domain_pattern(url: str, domain_pattern: str, log_warnings: b
 	Returns:
 		bool: True if the URL matches the pattern, False otherwise
 	"""
-	try:
-		# Note: about:blank should be handled at the callsite, not here
-		if url == 'about:blank':
-			return False
-
-		parsed_url = urlparse(url)
+	return get_domain_matcher((domain_pattern,), log_warnings=log_warnings).match(url) is not None
+
+
+@lru_cache(maxsize=1024)
+def _parse_scheme_and_host(url: str) -> tuple[str, str] | None:
+	"""The lowercased scheme and hostname of a URL, None if it has no scheme or hostname"""
+	parsed_url = urlparse(url)
+	scheme = parsed_url.scheme.lower() if parsed_url.scheme else ''
+	domain = parsed_url.hostname.lower() if parsed_url.hostname else ''
+	return (scheme, domain) if scheme and domain else None
+
+
+class _HostRules:
+	"""The domain patterns for one scheme pattern, split by how they are matched"""
+
+	def __init__(self) -> None:
+		self.any_host: list[str] = []  # patterns like https://*
+		self.exact: dict[str, list[str]] = {}  # host -> patterns
+		self.parent_domains: dict[str, list[str]] = {}  # example.com -> [*.example.com], matches it and its subdomains
+		self.globs: list[tuple[str, str]] = []  # (glob, pattern) for anything else, e.g. a.*.example.com
+
+	def matches(self, domain: str) -> Iterator[str]:
+		"""Yields the patterns matching the domain, the cheapest lookups first"""
+		yield from self.any_host
+		yield from self.exact.get(domain, ())
+		if self.parent_domains:
+			# look up the domain and each parent domain, e.g. a.b.example.com, b.example.com, example.com, com
+			candidate = domain
+			while True:
+				yield from self.parent_domains.get(candidate, ())
+				dot = candidate.find('.')
+				if dot == -1:
+					break
+				candidate = candidate[dot + 1 :]
+		for glob, pattern in self.globs:
+			if fnmatch(domain, glob):
+				yield pattern
+
+
+class DomainMatcher:
+	"""
+	A list of domain patterns compiled for matching many URLs against them. SECURITY CRITICAL.
 
-		# Extract only the hostname and scheme components
-		scheme = parsed_url.scheme.lower() if parsed_url.scheme else ''
-		domain = parsed_url.hostname.lower() if parsed_url.hostname else ''
+	Accepts the same patterns as match_url_with_domain_pattern() and matches a URL exactly when that function would
+	match it against any of the patterns, but each URL is parsed once and exact and *.domain patterns are hash
+	lookups, so the cost does not grow with the number of patterns. Unsafe patterns never match.
+	Use get_domain_matcher() to reuse compiled matchers.
+	"""
 
-		if not scheme or not domain:
-			return False
+	def __init__(self, patterns: Iterable[str], log_warnings: bool = False):
+		self.patterns = tuple(patterns)
+		self._schemes: dict[str, _HostRules] = {}  # rules by literal scheme, e.g. https
+		self._scheme_globs: dict[str, _HostRules] = {}  # rules by scheme glob, e.g. http*
+		for pattern in self.patterns:
+			self._add(pattern, log_warnings)
 
-		# Normalize the domain pattern
-		domain_pattern = domain_pattern.lower()
+	def _add(self, domain_pattern: str, log_warnings: bool) -> None:
+		pattern = domain_pattern.lower()
 
 		# Handle pattern with scheme
-		if '://' in domain_pattern:
-			pattern_scheme, pattern_domain = domain_pattern.split('://', 1)
+		if '://' in pattern:
+			pattern_scheme, pattern_domain = pattern.split('://', 1)
 		else:
 			pattern_scheme = 'https'  # Default to matching only https for security
-			pattern_domain = domain_pattern
+			pattern_domain = pattern
 
-		# Handle port in pattern (we strip ports from patterns since we already
-		# extracted only the hostname from the URL)
+		# Handle port in pattern (we strip ports from patterns since we only match hostnames)
 		if ':' in pattern_domain and not pattern_domain.startswith(':'):
 			pattern_domain = pattern_domain.split(':', 1)[0]
 
-		# If scheme doesn't match, return False
-		if not fnmatch(scheme, pattern_scheme):
-			return False
-
-		# Check for exact match
-		if pattern_domain == '*' or domain == pattern_domain:
-			return True
-
-		# Handle glob patterns
-		if '*' in pattern_domain:
-			# Check for unsafe glob patterns
-			# First, check for patterns like *.*.domain which are unsafe
-			if pattern_domain.count('*.') > 1 or pattern_domain.count('.*') > 1:
-				if log_warnings:
-					logger = logging.getLogger(__name__)
-					logger.error(f'⛔️ Multiple wildcards in pattern=[{domain_pattern}] are not supported')
-				return False  # Don't match unsafe patterns
-
-			# Check for wildcards in TLD part (example.*)
-			if pattern_domain.endswith('.*'):
-				if log_warnings:
-					logger = logging.getLogger(__name__)
-					logger.error(f'⛔️ Wildcard TLDs like in pattern=[{domain_pattern}] are not supported for security')
-				return False  # Don't match unsafe patterns
-
-			# Then check for embedded wildcards
-			bare_domain = pattern_domain.replace('*.', '')
-			if '*' in bare_domain:
-				if log_warnings:
-					logger = logging.getLogger(__name__)
-					logger.error(f'⛔️ Only *.domain style patterns are supported, ignoring pattern=[{domain_pattern}]')
-				return False  # Don't match unsafe patterns
-
-			# Special handling so that *.google.com also matches bare google.com
+		is_scheme_glob = any(c in pattern_scheme for c in '*?[')
+		rules = (self._scheme_globs if is_scheme_glob else self._schemes).setdefault(pattern_scheme, _HostRules())
+
+		if pattern_domain == '*':
+			rules.any_host.append(domain_pattern)
+			return
+		if '*' not in pattern_domain:
+			rules.exact.setdefault(pattern_domain, []).append(domain_pattern)
+			return
+
+		# Check for unsafe glob patterns
+		# First, check for patterns like *.*.domain which are unsafe
+		if pattern_domain.count('*.') > 1 or pattern_domain.count('.*') > 1:
+			if log_warnings:
+				logger.error(f'⛔️ Multiple wildcards in pattern=[{domain_pattern}] are not supported')
+			return
+
+		# Check for wildcards in TLD part (example.*)
+		if pattern_domain.endswith('.*'):
+			if log_warnings:
+				logger.error(f'⛔️ Wildcard TLDs like in pattern=[{domain_pattern}] are not supported for security')
+			return
+
+		# Then check for embedded wildcards
+		if '*' in pattern_domain.replace('*.', ''):
+			if log_warnings:
+				logger.error(f'⛔️ Only *.domain style patterns are supported, ignoring pattern=[{domain_pattern}]')
+			return
+
+		# *.google.com also matches bare google.com
+		parent_domain = pattern_domain[2:]
+		if pattern_domain.startswith('*.') and not any(c in parent_domain for c in '*?['):
+			rules.parent_domains.setdefault(parent_domain, []).append(domain_pattern)
+		else:
 			if pattern_domain.startswith('*.'):
-				parent_domain = pattern_domain[2:]
-				if domain == parent_domain or fnmatch(domain, parent_domain):
-					return True
-
-			# Normal case: match domain against pattern
-			if fnmatch(domain, pattern_domain):
-				return True
-
-		return False
-	except Exception as e:
-		logger = logging.getLogger(__name__)
-		logger.error(f'⛔️ Error matching URL {url} with pattern {domain_pattern}: {type(e).__name__}: {e}')
-		return False
+				rules.globs.append((parent_domain, domain_pattern))
+			rules.globs.append((pattern_domain, domain_pattern))
+
+	def match(self, url: str) -> str | None:
+		"""Returns the first pattern that matches the URL, None if none does"""
+		return next(self._matches(url), None)
+
+	def match_all(self, url: str) -> list[str]:
+		"""Returns every pattern that matches the URL, each once"""
+		return list(dict.fromkeys(self._matches(url)))
+
+	def _matches(self, url: str) -> Iterator[str]:
+		try:
+			# Note: about:blank should be handled at the callsite, not here
+			if url == 'about:blank':
+				return
+			scheme_and_host = _parse_scheme_and_host(url)
+			if scheme_and_host is None:
+				return
+			scheme, domain = scheme_and_host
+
+			rules = self._schemes.get(scheme)
+			if rules:
+				yield from rules.matches(domain)
+			for scheme_glob, rules in self._scheme_globs.items():
+				if fnmatch(scheme, scheme_glob):
+					yield from rules.matches(domain)
+		except Exception as e:
+			logger.error(f'⛔️ Error matching URL {url} with patterns {self.patterns}: {type(e).__name__}: {e}')
+
+
+@lru_cache(maxsize=256)
+def get_domain_matcher(patterns: tuple[str, ...], log_warnings: bool = False) -> DomainMatcher:
+	"""A compiled DomainMatcher for the patterns, reused while the same patterns keep being matched"""
+	return DomainMatcher(patterns, log_warnings=log_warnings)
 
 
 def merge_dicts(a: dict, b: dict, path: tuple[str, ...] = ()):
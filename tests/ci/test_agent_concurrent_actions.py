@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from browser_use.agent.service import Agent
+from browser_use.agent.views import ActionResult
+from browser_use.browser import BrowserSession
+from browser_use.controller.registry.views import ActionSideEffect
+from browser_use.controller.service import Controller
+
+
+@pytest.fixture
+async def browser_session():
+	browser_session = BrowserSession(headless=True, user_data_dir=None, wait_between_actions=0)
+	await browser_session.start()
+	yield browser_session
+	await browser_session.stop()
+
+
+@pytest.fixture
+def agent(browser_session):
+	controller = Controller()
+	events = []
+
+	@controller.action('Fetch a record from the API', side_effect=ActionSideEffect.EXTERNAL)
+	async def fetch_record(key: str):
+		events.append(f'start {key}')
+		await asyncio.sleep(0.2)
+		events.append(f'end {key}')
+		if key == 'missing':
+			raise ValueError(f'no record {key}')
+		return ActionResult(extracted_content=key)
+
+	@controller.action('Record a note')
+	async def note(text: str):
+		events.append(f'note {text}')
+		return ActionResult(extracted_content=text)
+
+	llm = FakeListChatModel(responses=['unused'])
+	llm._verified_api_keys = True
+	agent = Agent(task='Test task', llm=llm, browser_session=browser_session, controller=controller, tool_calling_method='raw')
+	agent.events = events
+	return agent
+
+
+async def test_external_actions_run_concurrently(agent):
+	ActionModel = agent.ActionModel
+	actions = [
+		ActionModel(fetch_record={'key': 'a'}),
+		ActionModel(fetch_record={'key': 'b'}),
+		ActionModel(note={'text': 'between'}),  # page mutating by default, waits for the fetches
+		ActionModel(fetch_record={'key': 'c'}),
+		ActionModel(done={'text': 'finished', 'success': True}),
+		ActionModel(fetch_record={'key': 'never'}),
+	]
+
+	results = await agent.multi_act(actions)
+
+	assert [r.extracted_content for r in results] == ['a', 'b', 'between', 'c', 'finished']
+	assert agent.events == ['start a', 'start b', 'end a', 'end b', 'note between', 'start c', 'end c']
+
+
+async def test_concurrent_action_error_keeps_other_results(agent):
+	ActionModel = agent.ActionModel
+	actions = [
+		ActionModel(fetch_record={'key': 'missing'}),
+		ActionModel(fetch_record={'key': 'b'}),
+		ActionModel(note={'text': 'after'}),
+	]
+
+	results = await agent.multi_act(actions)
+
+	# the failed action is reported in order, next to the result of the action that ran with it
+	assert 'no record missing' in results[0].error
+	assert results[1].extracted_content == 'b'
+	assert len(results) == 2
+	assert sorted(agent.events) == ['end b', 'end missing', 'start b', 'start missing']
+
+
+async def test_all_failing_concurrent_batch_counts_as_step_failure(agent):
+	response = json.dumps(
+		{
+			'current_state': {'evaluation_previous_goal': '', 'memory': '', 'next_goal': 'fetch'},
+			'action': [{'fetch_record': {'key': 'missing'}}, {'fetch_record': {'key': 'missing'}}],
+		}
+	)
+	agent.llm.responses = [response, response]
+
+	await agent.step()
+	await agent.step()
+
+	# like a single raising action, so an LLM repeating failing batches still reaches max_failures
+	assert agent.state.consecutive_failures == 2
+	assert all(result.error for result in agent.state.last_result)
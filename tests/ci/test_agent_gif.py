@@ -0,0 +1,64 @@
+import base64
+import io
+import shutil
+
+import pytest
+
+from browser_use.agent.gif import create_history_gif
+from browser_use.agent.views import AgentHistory, AgentHistoryList
+from browser_use.browser.views import BrowserStateHistory
+
+Image = pytest.importorskip('PIL.Image')
+
+COLORS = [(200, 30, 30), (30, 200, 30), (30, 30, 200), (200, 200, 30), (30, 200, 200), (200, 30, 200)]
+
+
+def solid_screenshot(color: tuple[int, int, int]) -> str:
+	buffer = io.BytesIO()
+	Image.new('RGB', (640, 400), color).save(buffer, format='PNG')
+	return base64.b64encode(buffer.getvalue()).decode()
+
+
+def make_history() -> AgentHistoryList:
+	history = AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[],
+				state=BrowserStateHistory(
+					url='https://example.com',
+					title='Example',
+					tabs=[],
+					interacted_element=[None],
+					screenshot=solid_screenshot(color),
+				),
+			)
+			for color in COLORS
+		]
+	)
+	history.history[2].state.screenshot = None  # steps without a screenshot are skipped
+	return history
+
+
+@pytest.mark.parametrize('workers', [0, 3])
+def test_gif_frames_are_rendered_in_order(tmp_path, workers):
+	output_path = tmp_path / 'history.gif'
+	create_history_gif('Test task', make_history(), output_path=str(output_path), show_goals=False, workers=workers)
+
+	with Image.open(output_path) as gif:
+		assert gif.n_frames == 1 + len(COLORS) - 1  # task frame and every step with a screenshot
+		frame_colors = []
+		for index in range(1, gif.n_frames):
+			gif.seek(index)
+			frame_colors.append(gif.convert('RGB').getpixel((320, 200)))
+
+	expected = [color for i, color in enumerate(COLORS) if i != 2]
+	assert all(max(abs(a - b) for a, b in zip(got, want)) < 16 for got, want in zip(frame_colors, expected))
+
+
+@pytest.mark.skipif(not shutil.which('ffmpeg'), reason='ffmpeg is not installed')
+def test_video_output(tmp_path):
+	output_path = tmp_path / 'history.mp4'
+	create_history_gif('Test task', make_history(), output_path=str(output_path), show_goals=False, duration=500)
+
+	assert output_path.stat().st_size > 0
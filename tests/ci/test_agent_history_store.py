@@ -0,0 +1,99 @@
+import base64
+import json
+
+from browser_use.agent.history import HistoryWriter, ScreenshotRetention, iter_history, load_history
+from browser_use.agent.views import ActionResult, AgentBrain, AgentHistory, AgentHistoryList, AgentOutput, StepMetadata
+from browser_use.browser.views import BrowserStateHistory, TabInfo
+from browser_use.controller.service import Controller
+
+ActionModel = Controller().registry.create_action_model()
+OutputModel = AgentOutput.type_with_custom_actions(ActionModel)
+
+SCREENSHOT = base64.b64encode(b'\x89PNG fake screenshot bytes').decode()
+
+
+def make_step(step: int, screenshot: str | None = SCREENSHOT) -> AgentHistory:
+	return AgentHistory(
+		model_output=OutputModel(
+			current_state=AgentBrain(evaluation_previous_goal='ok', memory='', next_goal=f'goal {step}'),
+			action=[ActionModel(go_to_url={'url': f'https://example.com/{step}'})],
+		),
+		result=[ActionResult(extracted_content=f'step {step}', include_in_memory=True)],
+		state=BrowserStateHistory(
+			url=f'https://example.com/{step}',
+			title='Example',
+			tabs=[TabInfo(page_id=0, url=f'https://example.com/{step}', title='Example')],
+			interacted_element=[None],
+			screenshot=screenshot,
+		),
+		metadata=StepMetadata(step_start_time=step, step_end_time=step + 1, input_tokens=100, step_number=step),
+	)
+
+
+def test_steps_are_appended_and_streamed_back(tmp_path):
+	with HistoryWriter(tmp_path / 'run') as writer:
+		for step in range(3):
+			writer.append(make_step(step, screenshot=SCREENSHOT if step != 1 else None))
+
+	lines = (tmp_path / 'run' / 'history.jsonl').read_text().splitlines()
+	assert len(lines) == 3
+	assert json.loads(lines[0])['state']['screenshot'] is None  # screenshots are referenced, not inlined
+	assert len(list((tmp_path / 'run' / 'screenshots').iterdir())) == 1  # identical screenshots are stored once
+
+	steps = list(iter_history(tmp_path / 'run', OutputModel))
+	assert [s.model_output.current_state.next_goal for s in steps] == ['goal 0', 'goal 1', 'goal 2']
+	assert [s.state.screenshot for s in steps] == [SCREENSHOT, None, SCREENSHOT]
+	assert steps[2].model_output.action[0].model_dump(exclude_none=True) == {'go_to_url': {'url': 'https://example.com/2'}}
+
+	history = load_history(tmp_path / 'run' / 'history.jsonl', OutputModel, load_screenshots=False)
+	assert history.urls() == [f'https://example.com/{step}' for step in range(3)]
+	assert history.screenshots() == [None, None, None]
+
+
+def test_partly_written_step_is_skipped(tmp_path):
+	writer = HistoryWriter(tmp_path)
+	writer.append(make_step(0))
+	writer.close()
+	with open(tmp_path / 'history.jsonl', 'a') as f:
+		f.write('{"model_output": {"current_sta')
+
+	# a later writer, e.g. of a resumed run, keeps appending after the broken line
+	with HistoryWriter(tmp_path) as writer:
+		writer.append(make_step(1))
+
+	assert [s.metadata.step_number for s in iter_history(tmp_path, OutputModel)] == [0, 1]
+
+
+def test_screenshot_retention_spills_older_screenshots(tmp_path):
+	history = AgentHistoryList(history=[])
+	retention = ScreenshotRetention(keep_last=2, spill_dir=tmp_path)
+	for step in range(5):
+		history.history.append(make_step(step))
+		retention.apply(history)
+
+	in_memory = [item.state.screenshot is not None for item in history.history]
+	assert in_memory == [False, False, False, True, True]
+	assert len(list(tmp_path.iterdir())) == 1  # the same image is spilled once
+	assert history.screenshots() == [SCREENSHOT] * 5  # spilled screenshots are read back on demand
+	assert json.loads(json.dumps(history.model_dump()))['history'][0]['state']['screenshot_path']
+
+	# without a spill directory older screenshots are dropped
+	dropped = AgentHistoryList(history=[make_step(step) for step in range(3)])
+	ScreenshotRetention(keep_last=1).apply(dropped)
+	assert dropped.screenshots() == [None, None, SCREENSHOT]
+
+
+def test_history_directory_with_a_dot_is_rerun_from_jsonl(tmp_path):
+	from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+	from browser_use.agent.service import Agent
+
+	with HistoryWriter(tmp_path / 'runs' / 'v1.2') as writer:
+		writer.append(make_step(0))
+
+	llm = FakeListChatModel(responses=['unused'])
+	llm._verified_api_keys = True  # type: ignore
+	agent = Agent(task='rerun', llm=llm, tool_calling_method='raw')
+	steps = list(agent._load_history_to_rerun(tmp_path / 'runs' / 'v1.2'))
+
+	assert [s.state.url for s in steps] == ['https://example.com/0']
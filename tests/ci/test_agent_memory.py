@@ -0,0 +1,132 @@
+import asyncio
+import threading
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from browser_use.agent.memory.service import Memory
+from browser_use.agent.memory.views import MemoryConfig
+from browser_use.agent.message_manager.service import MessageManager, MessageManagerSettings
+from browser_use.agent.service import Agent
+from browser_use.agent.views import MessageManagerState
+
+
+class SlowMemory(Memory):
+	"""Memory with a blocking summarizer in place of mem0, which needs an embedder and a vector store"""
+
+	def __init__(self, message_manager: MessageManager):
+		self.message_manager = message_manager
+		self.config = MemoryConfig(memory_interval=2)
+		self.release = threading.Event()
+		self.thread_name = None
+
+	def _create(self, messages: list[BaseMessage], current_step: int) -> str | None:
+		self.thread_name = threading.current_thread().name
+		self.release.wait(timeout=5)
+		return f'summary of {len(messages)} messages at step {current_step}'
+
+
+def make_message_manager() -> MessageManager:
+	message_manager = MessageManager(
+		task='Test task',
+		system_message=SystemMessage(content='System message'),
+		settings=MessageManagerSettings(),
+		state=MessageManagerState(),
+	)
+	for step in range(3):
+		message_manager._add_message_with_tokens(HumanMessage(content=f'Action result: {step}'))
+		message_manager._add_message_with_tokens(AIMessage(content=f'plan {step}'))
+		message_manager.add_tool_message(content='')
+	return message_manager
+
+
+async def test_background_procedural_memory_does_not_block_loop():
+	message_manager = make_message_manager()
+	memory = SlowMemory(message_manager)
+
+	task = asyncio.create_task(memory.acreate_procedural_memory(current_step=10))
+	await asyncio.sleep(0.05)
+
+	# the loop keeps running and the agent keeps adding messages while the summary is created
+	assert not task.done()
+	message_manager._add_message_with_tokens(HumanMessage(content='Action result: added meanwhile'))
+
+	memory.release.set()
+	await task
+
+	assert memory.thread_name.startswith('browser_use_memory')
+	history = message_manager.state.history
+	contents = [m.message.content for m in history.messages]
+	memory_messages = [m for m in history.messages if m.metadata.message_type == 'memory']
+	assert len(memory_messages) == 1
+	assert memory_messages[0].message.content == 'summary of 6 messages at step 10'
+
+	# processed messages are gone, the one added meanwhile stays after the memory
+	assert 'Action result: 0' not in contents
+	assert contents[-1] == 'Action result: added meanwhile'
+	assert contents.index('summary of 6 messages at step 10') < contents.index('Action result: added meanwhile')
+	assert history.current_tokens == sum(m.metadata.tokens for m in history.messages)
+
+
+async def test_background_procedural_memory_survives_state_message_removal():
+	message_manager = make_message_manager()
+	memory = SlowMemory(message_manager)
+
+	# the snapshot is taken when the task is started, before the step adds its state message
+	assert memory.start_background_procedural_memory(current_step=10)
+	assert not memory.start_background_procedural_memory(current_step=11)
+	message_manager._add_message_with_tokens(HumanMessage(content='Current state'))
+
+	# the summary resolves while the LLM is called, before the state message is removed again
+	memory.release.set()
+	await memory._background_task
+	message_manager._remove_last_state_message()
+
+	history = message_manager.state.history
+	contents = [m.message.content for m in history.messages]
+	assert 'Current state' not in contents
+	assert 'Action result: 0' in contents  # not swapped in before the step boundary
+
+	# the next step applies it, the state message was neither summarized nor is the memory removable as a state message
+	assert memory.apply_background_procedural_memory()
+	contents = [m.message.content for m in history.messages]
+	assert contents[-1] == 'summary of 6 messages at step 10'
+	assert 'Action result: 0' not in contents
+	message_manager._remove_last_state_message()
+	assert [m.message.content for m in history.messages][-1] == 'summary of 6 messages at step 10'
+	assert history.current_tokens == sum(m.metadata.tokens for m in history.messages)
+
+
+async def test_history_is_not_compacted_while_procedural_memory_is_pending():
+	llm = FakeListChatModel(responses=['unused'])
+	llm._verified_api_keys = True
+	agent = Agent(task='Test task', llm=llm, enable_memory=False, tool_calling_method='raw')
+	message_manager = agent._message_manager
+	agent.enable_memory = True
+	agent.memory = memory = SlowMemory(message_manager)
+	for step in range(3):
+		message_manager._add_message_with_tokens(HumanMessage(content=f'Action result: {step} ' + 'details ' * 50))
+		message_manager._add_message_with_tokens(AIMessage(content=f'plan {step}'))
+		message_manager.add_tool_message(content='')
+	message_manager.settings.compaction_max_tokens = message_manager.state.history.current_tokens - 1
+	message_manager.settings.compaction_keep_last_steps = 1
+
+	# the memory covers the same old steps as compaction would, so the history is left alone until it is applied
+	agent.state.n_steps = 2
+	agent._consolidate_history()
+	history = message_manager.state.history
+	assert memory.creating_procedural_memory
+	assert not any(m.metadata.message_type == 'compacted' for m in history.messages)
+
+	message_manager._add_message_with_tokens(HumanMessage(content='Action result: added meanwhile'))
+	memory.release.set()
+	await memory._background_task
+	agent.state.n_steps = 3
+	agent._consolidate_history()
+
+	# one summary of the old steps, not a memory next to a compacted copy of the same steps
+	types = [m.metadata.message_type for m in history.messages]
+	assert not memory.creating_procedural_memory
+	assert types.count('memory') == 1 and 'compacted' not in types
+	assert 'Action result: 0' not in [m.message.content for m in history.messages]
+	assert history.current_tokens == sum(m.metadata.tokens for m in history.messages)
@@ -0,0 +1,155 @@
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from pytest_httpserver import HTTPServer
+
+from browser_use.agent.replay import BatchReplayer, ReplayMetrics, ReplayResult
+from browser_use.agent.views import ActionResult, AgentBrain, AgentHistory, AgentHistoryList, AgentOutput, ReplayStepStats
+from browser_use.browser import BrowserSession
+from browser_use.browser.views import BrowserStateHistory
+from browser_use.controller.service import Controller
+
+controller = Controller()
+
+
+@controller.action('Check that the page has the expected title')
+async def check_title(title: str, browser_session: BrowserSession):
+	page = await browser_session.get_current_page()
+	if await page.title() != title:
+		raise ValueError(f'expected title {title!r}, got {await page.title()!r}')
+	return ActionResult(extracted_content=title)
+
+
+@controller.action('Report the tabs, cookies and local storage of the browser')
+async def report_state(browser_session: BrowserSession):
+	page = await browser_session.get_current_page()
+	storage = await page.evaluate('() => [document.cookie, localStorage.length]')
+	return ActionResult(extracted_content=f'{len(browser_session.browser_context.pages)} {storage}')
+
+
+ActionModel = controller.registry.create_action_model()
+OutputModel = AgentOutput.type_with_custom_actions(ActionModel)
+
+
+def make_history(*actions: dict) -> AgentHistoryList:
+	return AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=OutputModel(
+					current_state=AgentBrain(evaluation_previous_goal='', memory='', next_goal=f'step {i}'),
+					action=[ActionModel(**action)],
+				),
+				result=[],
+				state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[None]),
+			)
+			for i, action in enumerate(actions)
+		]
+	)
+
+
+@pytest.fixture
+def base_url():
+	server = HTTPServer()
+	server.start()
+	for page in ('home', 'about'):
+		server.expect_request(f'/{page}').respond_with_data(
+			f'<html><head><title>{page}</title></head><body><h1>{page}</h1></body></html>', content_type='text/html'
+		)
+	server.expect_request('/dirty').respond_with_data(
+		"<html><script>document.cookie = 'cart=1'; localStorage.setItem('cart', '1')</script></html>", content_type='text/html'
+	)
+	yield f'http://{server.host}:{server.port}'
+	server.stop()
+
+
+@pytest.fixture
+async def browser_sessions():
+	sessions = [BrowserSession(headless=True, user_data_dir=None, keep_alive=True) for _ in range(2)]
+	yield sessions
+	for session in sessions:
+		await session.kill()
+
+
+async def test_batch_replay_reports_step_stats(base_url, browser_sessions, tmp_path):
+	llm = FakeListChatModel(responses=['unused'])
+	llm._verified_api_keys = True
+	replayer = BatchReplayer(
+		llm=llm,
+		browser_sessions=browser_sessions,
+		controller=controller,
+		tool_calling_method='raw',
+		max_retries=2,
+		retry_timeout=0.5,
+	)
+
+	for page in ('home', 'about'):
+		replayer.submit(make_history({'go_to_url': {'url': f'{base_url}/{page}'}}, {'check_title': {'title': page}}), name=page)
+	broken = make_history({'go_to_url': {'url': f'{base_url}/home'}}, {'check_title': {'title': 'about'}}, {'wait': {}})
+	broken.save_to_file(tmp_path / 'broken.json')
+	replayer.submit(tmp_path / 'broken.json')
+
+	results = {result.name: result for result in await replayer.run()}
+
+	assert results['home'].success and results['about'].success
+	assert [step.actions for step in results['home'].steps] == [['go_to_url'], ['check_title']]
+	assert all(step.attempts == 1 and step.seconds > 0 for step in results['home'].steps)
+
+	assert not results['broken'].success
+	assert [step.error is not None for step in results['broken'].steps] == [False, True]  # stops at the failed step
+	assert results['broken'].steps[1].attempts == 2
+
+	metrics = replayer.metrics
+	assert (metrics.passed, metrics.failed, metrics.total_steps, metrics.failed_steps) == (2, 1, 6, 1)
+
+
+async def test_batch_replay_resets_the_session_between_replays(base_url, browser_sessions):
+	llm = FakeListChatModel(responses=['unused'])
+	llm._verified_api_keys = True
+	replayer = BatchReplayer(llm=llm, browser_sessions=browser_sessions[:1], controller=controller, tool_calling_method='raw')
+
+	replayer.submit(
+		make_history({'go_to_url': {'url': f'{base_url}/dirty'}}, {'open_tab': {'url': f'{base_url}/about'}}), name='dirty'
+	)
+	replayer.submit(make_history({'go_to_url': {'url': f'{base_url}/home'}}, {'report_state': {}}), name='clean')
+
+	results = {result.name: result for result in await replayer.run()}
+
+	assert results['dirty'].success and results['clean'].success
+	# one tab, no cookie and no local storage left over from the previous replay on the same browser
+	assert results['clean'].results[-1].extracted_content == "1 ['', 0]"
+
+
+async def test_retry_waits_without_a_change_probe(browser_sessions):
+	from browser_use.agent.service import Agent
+
+	llm = FakeListChatModel(responses=['unused'])
+	llm._verified_api_keys = True
+	agent = Agent(task='Replay', llm=llm, browser_session=browser_sessions[0], controller=controller, tool_calling_method='raw')
+	await browser_sessions[0].navigate('about:blank')  # no snapshot, so no probe to tell whether the page changed
+
+	start = time.monotonic()
+	await agent._wait_for_interactive_changes(timeout=5, min_wait=0.3)
+
+	assert 0.3 <= time.monotonic() - start < 5
+
+
+def test_replay_metrics():
+	metrics = ReplayMetrics()
+	metrics.add(
+		ReplayResult(
+			replay_id='1',
+			name='flow',
+			steps=[
+				ReplayStepStats(step=1, attempts=1, seconds=0.5),
+				ReplayStepStats(step=2, skipped=True),
+				ReplayStepStats(step=3, attempts=3, match_failures=2, seconds=1.5),
+			],
+		)
+	)
+	metrics.add(ReplayResult(replay_id='2', name='timeout', error='Replay timed out after 1s', timed_out=True))
+
+	assert (metrics.passed, metrics.failed, metrics.timed_out) == (1, 1, 1)
+	assert (metrics.total_steps, metrics.retried_steps, metrics.match_failures) == (2, 1, 2)
+	assert metrics.avg_step_seconds == 1.0
+	assert metrics.max_step_seconds == 1.5
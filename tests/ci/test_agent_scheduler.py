@@ -0,0 +1,150 @@
+import asyncio
+
+from pytest_httpserver import HTTPServer
+
+from browser_use.agent.scheduler import AgentScheduler, ProcessAgentRunner
+from browser_use.agent.scheduler.service import _run_shard
+from browser_use.agent.scheduler.views import ScheduledTask
+from browser_use.agent.views import AgentHistoryList
+from browser_use.browser import BrowserSession
+
+
+class RecordingScheduler(AgentScheduler):
+	"""Scheduler whose tasks sleep instead of driving a real browser and LLM"""
+
+	def __init__(self, **kwargs):
+		super().__init__(llm=None, reset_between_tasks=False, **kwargs)  # type: ignore
+		self.started: list[str] = []
+
+	async def _run_task(self, scheduled: ScheduledTask, browser_session: BrowserSession) -> AgentHistoryList:
+		self.started.append(scheduled.task)
+		async with self.llm_semaphore:
+			await asyncio.sleep(scheduled.agent_kwargs.get('duration', 0.01))
+		if scheduled.agent_kwargs.get('fail'):
+			raise RuntimeError('agent crashed')
+		return AgentHistoryList(history=[])
+
+
+class BrowsingScheduler(AgentScheduler):
+	"""Scheduler whose tasks leave a cookie, local storage and a second tab behind instead of running an agent"""
+
+	def __init__(self, **kwargs):
+		super().__init__(llm=None, **kwargs)  # type: ignore
+		self.states: list[list] = []
+
+	async def _run_task(self, scheduled: ScheduledTask, browser_session: BrowserSession) -> AgentHistoryList:
+		url = scheduled.agent_kwargs['url']
+		page = await browser_session.get_current_page()
+		await page.goto(url)
+		state = await page.evaluate('() => [document.cookie, localStorage.length]')
+		self.states.append([len(browser_session.browser_context.pages), *state])  # type: ignore
+		await page.evaluate("() => { document.cookie = 'cart=1'; localStorage.setItem('cart', '1') }")
+		await browser_session.create_new_tab(url)
+		return AgentHistoryList(history=[])
+
+
+async def test_scheduler_resets_pooled_sessions_between_tasks():
+	server = HTTPServer()
+	server.start()
+	server.expect_request('/shop').respond_with_data('<html><body>shop</body></html>', content_type='text/html')
+	url = f'http://{server.host}:{server.port}/shop'
+	sessions = [BrowserSession(headless=True, user_data_dir=None, keep_alive=True)]
+	try:
+		scheduler = BrowsingScheduler(browser_sessions=sessions)
+		scheduler.submit('first', url=url)
+		scheduler.submit('second', url=url)
+		await scheduler.run()
+		# the second task starts with one tab and without the first task's cookie and local storage
+		assert scheduler.states == [[1, '', 0], [1, '', 0]]
+
+		sharing = BrowsingScheduler(browser_sessions=sessions, reset_between_tasks=False)
+		sharing.submit('third', url=url)
+		await sharing.run()
+		assert sharing.states == [[2, 'cart=1', 1]]
+	finally:
+		await sessions[0].kill()
+		server.stop()
+
+
+async def test_scheduler_runs_by_priority():
+	scheduler = RecordingScheduler(max_browsers=1)
+	scheduler.submit('low', priority=0)
+	scheduler.submit('high', priority=10)
+	scheduler.submit('low 2', priority=0)
+	scheduler.submit('medium', priority=5)
+
+	results = await scheduler.run()
+
+	assert scheduler.started == ['high', 'medium', 'low', 'low 2']
+	assert [r.task for r in results] == ['high', 'medium', 'low', 'low 2']
+	assert scheduler.metrics.completed == 4
+	assert scheduler.metrics.running == 0
+
+
+async def test_scheduler_timeouts_failures_and_metrics():
+	scheduler = RecordingScheduler(max_browsers=3, max_llm_calls=1)
+	scheduler.submit('slow', timeout=0.05, duration=1)
+	scheduler.submit('broken', fail=True)
+	scheduler.submit('ok')
+
+	results = {r.task: r for r in await scheduler.run()}
+
+	assert results['slow'].timed_out and not results['slow'].success
+	assert results['broken'].error == 'RuntimeError: agent crashed'
+	assert results['ok'].error is None
+	metrics = scheduler.metrics
+	assert (metrics.submitted, metrics.completed, metrics.failed, metrics.timed_out) == (3, 1, 1, 1)
+	assert metrics.finished == 3
+	assert metrics.tasks_per_minute > 0
+	assert len(scheduler.browser_sessions) == 3
+	assert all(session.browser_profile.keep_alive for session in scheduler.browser_sessions)
+
+
+def make_no_llm():
+	"""LLM factory for the worker processes, Agent creation fails fast without a real LLM"""
+	return None
+
+
+def test_process_runner_shards_round_robin_by_priority():
+	runner = ProcessAgentRunner(llm_factory=make_no_llm, processes=2)
+	for i in range(5):
+		runner.submit(f'task {i}', priority=i)
+
+	shards = runner.shard()
+
+	assert [[t.task for t in shard] for shard in shards] == [['task 4', 'task 2', 'task 0'], ['task 3', 'task 1']]
+
+
+async def test_process_runner_collects_results_from_workers():
+	collected = []
+	runner = ProcessAgentRunner(llm_factory=make_no_llm, processes=2, on_result=collected.append)
+	task_ids = {runner.submit(f'task {i}') for i in range(3)}
+
+	results = await runner.run()
+
+	# every task reports back through the shared sink, here as a failed Agent() setup
+	assert {r.task_id for r in results} == task_ids
+	assert collected == results == runner.results
+	assert all(r.error and not r.success for r in results)
+	assert runner.metrics.failed == 3
+	assert runner.combined_history().history == []
+
+
+def make_colliding_agent_kwargs():
+	return {'max_steps': 1, 'timeout': 1, 'llm': None, 'use_vision': False}
+
+
+class ListSink(list):
+	def put(self, item):
+		self.append(item)
+
+
+def test_process_runner_shard_ignores_colliding_factory_kwargs():
+	runner = ProcessAgentRunner(llm_factory=make_no_llm, processes=1, agent_kwargs_factory=make_colliding_agent_kwargs)
+	runner.submit('task')
+	sink = ListSink()
+
+	# used to fail with "got multiple values for keyword argument" before any task ran
+	_run_shard(runner.shard()[0], make_no_llm, make_colliding_agent_kwargs, runner.scheduler_kwargs, sink)
+
+	assert [result['task'] for result in sink] == ['task']
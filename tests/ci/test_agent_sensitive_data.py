@@ -1,8 +1,11 @@
+import random
+
 import pytest
 from langchain_core.messages import HumanMessage, SystemMessage
 from pydantic import BaseModel, Field
 
 from browser_use.agent.message_manager.service import MessageManager, MessageManagerSettings
+from browser_use.agent.message_manager.utils import SensitiveDataRedactor
 from browser_use.agent.views import MessageManagerState
 from browser_use.controller.registry.service import Registry
 from browser_use.utils import match_url_with_domain_pattern
@@ -76,6 +79,22 @@ def test_replace_sensitive_data_with_missing_keys(registry, caplog):
 	caplog.clear()
 
 
+def test_replace_sensitive_data_skips_params_without_placeholders(registry, monkeypatch):
+	"""Params without a placeholder are returned as they are, without dumping and walking them"""
+
+	def fail(*args, **kwargs):
+		raise AssertionError('params were dumped')
+
+	monkeypatch.setattr(SensitiveParams, 'model_dump', fail)
+	params = SensitiveParams(text='Please enter your username')
+	assert registry._replace_sensitive_data(params, {'username': 'user123'}) is params
+	assert registry._replace_sensitive_data(params, {'example.com': {'username': 'user123'}}, 'https://example.com') is params
+
+	monkeypatch.undo()
+	params = SensitiveParams(text='Please enter <secret>username</secret>')
+	assert registry._replace_sensitive_data(params, {'username': 'user123'}).text == 'Please enter user123'
+
+
 def test_simple_domain_specific_sensitive_data(registry, caplog):
 	"""Test the basic functionality of domain-specific sensitive data replacement"""
 	# Set log level to capture warnings
@@ -107,6 +126,13 @@ def test_simple_domain_specific_sensitive_data(registry, caplog):
 	assert 'password' in caplog.text  # Only password should be logged as missing
 	caplog.clear()
 
+	# secrets of every matching domain pattern are exposed, not only of the first one
+	sensitive_data = {'*.example.com': {'username': 'example_user'}, 'https://example.com': {'password': 'example_pass'}}
+	result = registry._replace_sensitive_data(params, sensitive_data, 'https://example.com/login')
+	assert 'example_user' in result.text and 'example_pass' in result.text
+	result = registry._replace_sensitive_data(params, sensitive_data, 'https://sub.example.com/login')
+	assert 'example_user' in result.text and '<secret>password</secret>' in result.text
+
 
 def test_match_url_with_domain_pattern():
 	"""Test that the domain pattern matching utility works correctly"""
@@ -261,3 +287,64 @@ def test_filter_sensitive_data(message_manager):
 	assert '<secret>username</secret>' in result.content
 	assert '<secret>password</secret>' in result.content
 	assert '<secret>email</secret>' in result.content
+
+
+@pytest.mark.parametrize('use_regex', [False, True])
+def test_sensitive_data_redactor(monkeypatch, use_regex):
+	"""Test that the redactor replaces leftmost-longest matches in one pass, with either matching strategy"""
+	monkeypatch.setattr(SensitiveDataRedactor, 'REGEX_MIN_SECRETS', 0 if use_regex else 10**9)
+	redactor = SensitiveDataRedactor(
+		{
+			'pin': '1234',
+			'long_pin': '123456',
+			'word': 'secret',  # must not rewrite the <secret> placeholders inserted for other values
+			'example.com': {'token': 'tok.en*[x]', 'key': 'k' * 2000},
+		}
+	)
+
+	text = 'pins 123456 and 1234, word secret, token tok.en*[x], 12345'
+	assert redactor.redact(text) == (
+		'pins <secret>long_pin</secret> and <secret>pin</secret>, word <secret>word</secret>, '
+		'token <secret>token</secret>, <secret>pin</secret>5'
+	)
+	assert redactor.redact('key ' + 'k' * 2001) == 'key <secret>key</secret>k'
+	assert redactor.redact('nothing to hide') == 'nothing to hide'
+
+
+@pytest.mark.parametrize(
+	'sensitive_data,text,expected',
+	[
+		({'k0': 'ccc', 'k1': 'abc'}, 'abcccc', '<secret>k1</secret><secret>k0</secret>'),
+		({'pw': 'aa', 'other': 'ca'}, 'caaa', '<secret>other</secret><secret>pw</secret>'),
+		({'pw': 'aa'}, 'aaaaa', '<secret>pw</secret><secret>pw</secret>a'),
+		({'a': 'aba', 'b': 'bab'}, 'ababab', '<secret>a</secret><secret>b</secret>'),
+	],
+)
+@pytest.mark.parametrize('use_regex', [False, True])
+def test_sensitive_data_redactor_overlapping_secrets(monkeypatch, use_regex, sensitive_data, text, expected):
+	"""Test that overlapping occurrences are redacted and that both matching strategies agree on them"""
+	monkeypatch.setattr(SensitiveDataRedactor, 'REGEX_MIN_SECRETS', 0 if use_regex else 10**9)
+	assert SensitiveDataRedactor(sensitive_data).redact(text) == expected
+
+
+def test_sensitive_data_redactor_strategies_agree(monkeypatch):
+	"""Test that the str.find and the trie regex strategies redact random overlapping secrets the same way"""
+	rng = random.Random(0)
+	for _ in range(300):
+		sensitive_data = {f'k{i}': ''.join(rng.choices('abc', k=rng.randint(1, 4))) for i in range(rng.randint(1, 4))}
+		text = ''.join(rng.choices('abc', k=rng.randint(0, 20)))
+		monkeypatch.setattr(SensitiveDataRedactor, 'REGEX_MIN_SECRETS', 10**9)
+		with_find = SensitiveDataRedactor(sensitive_data).redact(text)
+		monkeypatch.setattr(SensitiveDataRedactor, 'REGEX_MIN_SECRETS', 0)
+		assert SensitiveDataRedactor(sensitive_data).redact(text) == with_find, (sensitive_data, text)
+
+
+def test_filter_sensitive_data_with_many_secrets(message_manager):
+	"""Test that a changed sensitive_data dict is picked up and that large secret sets are redacted"""
+	message_manager.settings.sensitive_data = {f'key_{i}': f'value-{i:04d}' for i in range(1000)}
+	result = message_manager._filter_sensitive_data(HumanMessage(content='a value-0007 b value-0999 c value-1000'))
+	assert result.content == 'a <secret>key_7</secret> b <secret>key_999</secret> c value-1000'
+
+	message_manager.settings.sensitive_data['key_1000'] = 'value-1000'
+	result = message_manager._filter_sensitive_data(HumanMessage(content='c value-1000'))
+	assert result.content == 'c <secret>key_1000</secret>'
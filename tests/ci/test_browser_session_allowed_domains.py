@@ -1,4 +1,5 @@
 from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.utils import DomainMatcher, match_url_with_domain_pattern
 
 
 class TestUrlAllowlistSecurity:
@@ -97,3 +98,58 @@ class TestUrlAllowlistSecurity:
 		# Shouldn't match potentially malicious domains with a similar structure
 		# This demonstrates why the previous pattern was risky and why it's now rejected
 		assert browser_session._is_url_allowed('https://www.google.evil.com') is False
+
+	def test_compiled_matcher_returns_the_matching_pattern(self):
+		"""Test that DomainMatcher matches like the single pattern matching and reports which pattern matched."""
+		patterns = [
+			'example.com',
+			'*.google.com',
+			'http*://docs.python.org',
+			'chrome-extension://*',
+			'a.*.example.org',
+			'*.*.evil.com',  # unsafe, ignored
+			'example.*',  # unsafe, ignored
+			'*google.org',  # unsafe, ignored
+			'localhost:8080',
+		]
+		matcher = DomainMatcher(patterns)
+		cases = {
+			'https://example.com/path': 'example.com',
+			'http://example.com': None,  # patterns without a scheme only match https
+			'https://sub.example.com': None,
+			'https://google.com': '*.google.com',
+			'https://mail.google.com': '*.google.com',
+			'https://google.com.evil.com': None,
+			'https://notgoogle.com': None,
+			'http://docs.python.org': 'http*://docs.python.org',
+			'https://docs.python.org': 'http*://docs.python.org',
+			'chrome-extension://abcdefg': 'chrome-extension://*',
+			'https://a.b.example.org': 'a.*.example.org',
+			'https://x.y.evil.com': None,
+			'https://example.net': None,
+			'https://mygoogle.org': None,
+			'https://localhost:3000': 'localhost:8080',  # ports are ignored
+			'about:blank': None,
+			'not a url': None,
+		}
+		for url, expected in cases.items():
+			assert matcher.match(url) == expected, url
+			assert any(match_url_with_domain_pattern(url, pattern) for pattern in patterns) is (expected is not None), url
+
+		# match_all reports every matching pattern, also equivalent ones
+		matcher = DomainMatcher(['*.example.com', 'https://example.com', 'example.com', 'http*://*', 'other.com'])
+		assert matcher.match_all('https://example.com') == ['https://example.com', 'example.com', '*.example.com', 'http*://*']
+		assert matcher.match_all('http://example.com') == ['http*://*']
+		assert matcher.match_all('about:blank') == []
+
+	def test_large_allowlist(self):
+		"""Test that long allowlists of exact and *.domain patterns are matched correctly."""
+		allowed_domains = [f'site{i}.example.com' for i in range(5000)] + [f'*.tenant{i}.com' for i in range(5000)]
+		browser_session = BrowserSession(browser_profile=BrowserProfile(allowed_domains=allowed_domains))
+
+		assert browser_session._is_url_allowed('https://site4999.example.com/login') is True
+		assert browser_session._is_url_allowed('https://app.tenant1234.com') is True
+		assert browser_session._is_url_allowed('https://tenant1234.com') is True
+		assert browser_session._is_url_allowed('https://site5000.example.com') is False
+		assert browser_session._is_url_allowed('https://tenant1234.com.evil.com') is False
+		assert browser_session._is_url_allowed('http://app.tenant1234.com') is False
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import time
+from collections.abc import Callable
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+from browser_use.browser import BrowserSession
+from browser_use.controller.extraction.service import (
+	HTML_BLOCKS_JS,
+	ContentExtractor,
+	ExtractionCache,
+	hash_page_content,
+	split_markdown,
+)
+from browser_use.controller.extraction.views import ExtractionSettings, PageContent
+
+
+class RecordingChatModel(BaseChatModel):
+	"""Answers each prompt with respond(prompt) after a short delay, and records how many calls overlap"""
+
+	respond: Callable[[str], str]
+	delay: float = 0.01
+	prompts: list[str] = Field(default_factory=list)
+	in_flight: int = 0
+	max_in_flight: int = 0
+
+	@property
+	def _llm_type(self) -> str:
+		return 'recording'
+
+	def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+		raise NotImplementedError
+
+	async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+		prompt = messages[-1].content
+		self.prompts.append(prompt)
+		self.in_flight += 1
+		self.max_in_flight = max(self.max_in_flight, self.in_flight)
+		await asyncio.sleep(self.delay)
+		self.in_flight -= 1
+		return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.respond(prompt)))])
+
+
+async def stream(*parts: str):
+	for part in parts:
+		yield part
+
+
+def make_sections(count: int) -> list[str]:
+	return [f'# Section {i}\n\n' + f'item {i} ' * 40 + '\n\n' for i in range(count)]
+
+
+def test_split_markdown_cuts_before_headings():
+	markdown = ''.join(make_sections(6))
+	chunks = split_markdown(markdown, chunk_chars=500)
+
+	assert ''.join(chunks) == markdown
+	assert all(len(chunk) <= 500 for chunk in chunks)
+	assert all(chunk.startswith('# Section') for chunk in chunks)
+
+
+async def test_html_blocks_keep_split_tables_and_lists_whole():
+	rows = ''.join(f'<tr><td>row {i}</td><td>{"x" * 40}</td></tr>' for i in range(40))
+	items = ''.join(f'<li>item {i} {"y" * 40}</li>' for i in range(40))
+	big_item = '<li>' + ''.join(f'<p>{c * 200}</p>' for c in 'pq') + '</li>'
+	html = f'<h1>Title</h1><table><tbody>{rows}</tbody></table><ul>{items}{big_item}</ul>'
+
+	browser_session = BrowserSession(headless=True, user_data_dir=None)
+	try:
+		await browser_session.start()
+		page = await browser_session.get_current_page()
+		await page.set_content(html)
+		blocks = await page.evaluate(HTML_BLOCKS_JS, 400)
+	finally:
+		await browser_session.kill()
+
+	# every fragment of the split table and list is wrapped in its own table or list, and all rows and items are kept
+	assert len(blocks) > 3
+	for block in blocks:
+		if '<tr>' in block:
+			assert block.startswith('<table><tbody><tr>') and block.endswith('</tr></tbody></table>')
+		if '<li>' in block:
+			assert block.startswith('<ul><li>') and block.endswith('</li></ul>')
+	content = ''.join(blocks)
+	assert all(f'row {i}<' in content and f'item {i} ' in content for i in range(40))
+	assert 'p' * 200 in content and 'q' * 200 in content
+
+
+async def test_small_page_uses_single_prompt():
+	llm = RecordingChatModel(respond=lambda prompt: '{"title": "Small"}')
+	extractor = ContentExtractor(llm, ExtractionSettings(chunk_chars=1000))
+
+	output = await extractor.extract('get the title', stream('# Small\n\nA small page'))
+
+	assert output == '{"title": "Small"}'
+	assert len(llm.prompts) == 1
+	assert llm.prompts[0].startswith('Your task is to extract the content of the page.')
+	assert 'A small page' in llm.prompts[0]
+
+
+async def test_large_page_is_map_reduced_with_bounded_concurrency():
+	def respond(prompt: str) -> str:
+		if prompt.startswith('Your task is to combine'):
+			return 'combined'
+		section = prompt.split('# Section ')[1].split('\n')[0]
+		return json.dumps({'content': f'found {section}', 'complete': False})
+
+	llm = RecordingChatModel(respond=respond)
+	extractor = ContentExtractor(llm, ExtractionSettings(chunk_chars=500, max_concurrency=2))
+
+	output = await extractor.extract('list all items', stream(*make_sections(8)))
+
+	assert output == 'combined'
+	assert llm.max_in_flight == 2
+	assert len(llm.prompts) == len(extractor.chunks) + 1
+	reduce_prompt = llm.prompts[-1]
+	assert reduce_prompt.index('found 0') < reduce_prompt.index('found 7')
+
+
+async def test_early_exit_skips_remaining_chunks():
+	def respond(prompt: str) -> str:
+		return json.dumps({'content': 'the answer', 'complete': '# Section 1\n' in prompt})
+
+	llm = RecordingChatModel(respond=respond)
+	extractor = ContentExtractor(llm, ExtractionSettings(chunk_chars=500, max_concurrency=1))
+
+	output = await extractor.extract('find the answer', stream(*make_sections(20)))
+
+	assert output == 'the answer'
+	# chunks are extracted in order one at a time, nothing after the answering chunk is sent to the LLM
+	assert len(llm.prompts) == 2
+
+
+def test_page_hash_ignores_scripts_and_whitespace():
+	page = PageContent(blocks=['<p>Price:  <b>10</b></p>', '<script>window.nonce = "a1"</script>'])
+	reloaded = PageContent(blocks=['<p>Price:\n<b>10</b></p>', '<script>window.nonce = "b2"</script>'])
+	changed = PageContent(blocks=['<p>Price: <b>12</b></p>'])
+
+	assert hash_page_content(page) == hash_page_content(reloaded)
+	assert hash_page_content(page) != hash_page_content(changed)
+	assert hash_page_content(page) != hash_page_content(
+		PageContent(blocks=page.blocks, iframes=[('https://ads.example', '<p>ad</p>')])
+	)
+
+
+def test_extraction_cache_lru_ttl_and_counters():
+	cache = ExtractionCache(max_entries=2, ttl_seconds=60)
+	keys = [ExtractionCache.make_key('hash', f'goal {i}', False, 'model') for i in range(3)]
+	assert ExtractionCache.make_key('hash', 'goal 0', True, 'model') != keys[0]
+
+	cache.set(keys[0], 'result 0')
+	cache.set(keys[1], 'result 1')
+	assert cache.get(keys[0]) == 'result 0'  # keys[0] is now the most recently used
+	cache.set(keys[2], 'result 2')
+
+	assert cache.get(keys[1]) is None  # least recently used entry was evicted
+	assert cache.get(keys[2]) == 'result 2'
+	assert (cache.hits, cache.misses) == (2, 1)
+
+	cache._entries[keys[2]] = (time.time() - 120, 'result 2')
+	assert cache.get(keys[2]) is None
+
+
+def test_extraction_cache_disk_backend(tmp_path):
+	key = ExtractionCache.make_key('hash', 'goal', False, 'model')
+	ExtractionCache(cache_dir=tmp_path).set(key, 'persisted result')
+
+	# a new cache, e.g. in another process, finds the result on disk even without an in-memory cache
+	cache = ExtractionCache(max_entries=0, cache_dir=tmp_path)
+	assert cache.get(key) == 'persisted result'
+	assert cache.hits == 1
+
+	assert ExtractionCache(cache_dir=tmp_path, ttl_seconds=0).get(key) is None
+	assert not list(tmp_path.iterdir())  # expired entries are removed from disk
+
+
+async def test_failed_chunks_are_counted():
+	def respond(prompt: str) -> str:
+		if prompt.startswith('Your task is to combine'):
+			return 'combined'
+		if '# Section 2\n' in prompt:
+			raise RuntimeError('rate limited')
+		return json.dumps({'content': 'found', 'complete': False})
+
+	llm = RecordingChatModel(respond=respond)
+	extractor = ContentExtractor(llm, ExtractionSettings(chunk_chars=500))
+
+	output = await extractor.extract('list all items', stream(*make_sections(4)))
+
+	# the other chunks are still combined, but the output is flagged as partial so it is not cached
+	assert output == 'combined'
+	assert extractor.failed_chunks == 1
@@ -13,6 +13,8 @@ from browser_use.controller.views import (
 	CloseTabAction,
 	DoneAction,
 	DragDropAction,
+	FillFormAction,
+	FormField,
 	GoToUrlAction,
 	InputTextAction,
 	NoParamsAction,
@@ -49,6 +51,31 @@ class TestControllerIntegration:
 			content_type='text/html',
 		)
 
+		server.expect_request('/scroll_container').respond_with_data(
+			"""
+			<html>
+			<head><title>Scroll Container</title></head>
+			<body style="margin: 0; height: 2000px">
+				<div id="list" style="height: 80vh; overflow-y: auto">
+					<div style="height: 3000px"><button id="first">First item</button></div>
+				</div>
+			</body>
+			</html>
+			""",
+			content_type='text/html',
+		)
+
+		server.expect_request('/buttons').respond_with_data(
+			'<html><head><title>Buttons</title></head><body><button class="btn">First</button><button class="btn">Second</button></body></html>',
+			content_type='text/html',
+		)
+
+		server.expect_request('/iframe_select').respond_with_data(
+			'<html><head><title>Iframe Select</title></head><body><p>Outer</p>'
+			'<iframe srcdoc="<select id=inner><option>Alpha</option><option>Beta</option></select>"></iframe></body></html>',
+			content_type='text/html',
+		)
+
 		server.expect_request('/search').respond_with_data(
 			"""
 			<html>
@@ -149,6 +176,129 @@ class TestControllerIntegration:
 		assert isinstance(result, ActionResult)
 		assert 'Scrolled up' in result.extracted_content
 
+	async def test_scroll_container_actions(self, controller, browser_session, base_url):
+		"""Test that scroll actions target the containers found by the DOM snapshot, by index or implicitly."""
+		await browser_session.navigate(f'{base_url}/scroll_container')
+		state = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+		page = await browser_session.get_current_page()
+
+		# the snapshot found the list as a scroll container
+		assert await page.evaluate('window._browserUseScrollContainers.map(el => el.id)') == ['list']
+		button_index = next(index for index, node in state.selector_map.items() if node.attributes.get('id') == 'first')
+		node = state.selector_map[button_index]
+		while node.parent and not node.is_scrollable:
+			node = node.parent
+		assert node.attributes.get('id') == 'list'
+
+		class ScrollActionModel(ActionModel):
+			scroll_down: ScrollAction | None = None
+
+		# scrolling by the index of an element inside the list scrolls the list, not the window
+		result = await controller.act(
+			ScrollActionModel(scroll_down=ScrollAction(amount=200, index=button_index)), browser_session
+		)
+		assert f'container of element {button_index}' in result.extracted_content
+		assert await page.evaluate('document.getElementById("list").scrollTop') == 200
+		assert await page.evaluate('window.scrollY') == 0
+
+		# without an index the cached container is picked over the window because it is big enough
+		await controller.act(ScrollActionModel(scroll_down=ScrollAction(amount=100)), browser_session)
+		assert await page.evaluate('document.getElementById("list").scrollTop') == 300
+		assert await page.evaluate('window.scrollY') == 0
+
+	async def test_locate_element_by_snapshot_ref(self, browser_session, base_url):
+		"""Test that highlighted elements resolve through the snapshot reference table until the page navigates."""
+		await browser_session.navigate(f'{base_url}/buttons')
+		state = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+		second = next(node for node in state.selector_map.values() if node.get_all_text_till_next_clickable_element() == 'Second')
+
+		element_handle = await browser_session.get_locate_element_by_ref(second)
+		assert element_handle is not None
+		assert await element_handle.evaluate('el => el.textContent') == 'Second'
+
+		# a node whose xpath does not match the snapshot entry at its index is not resolved
+		other = next(node for node in state.selector_map.values() if node is not second)
+		other.highlight_index = second.highlight_index
+		assert await browser_session.get_locate_element_by_ref(other) is None
+
+		# the table goes away with the document
+		await browser_session.navigate(f'{base_url}/page1')
+		assert await browser_session.get_locate_element_by_ref(second) is None
+
+	async def test_interactive_change_probe(self, browser_session, base_url):
+		"""Test that the page probe ignores highlights and non-interactive changes but notices new interactive elements."""
+		await browser_session.navigate(f'{base_url}/buttons')
+		await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+		await browser_session.remove_highlights()
+		assert not await browser_session.has_interactive_changes()
+
+		page = await browser_session.get_current_page()
+		await page.evaluate("() => { document.body.dataset.clicked = 'yes'; document.title = 'Clicked' }")
+		assert not await browser_session.has_interactive_changes()
+
+		await page.evaluate("() => document.body.insertAdjacentHTML('beforeend', '<button>Third</button>')")
+		assert await browser_session.has_interactive_changes()
+
+		await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+		assert not await browser_session.has_interactive_changes()
+		await page.evaluate("() => document.querySelector('.btn').style.display = 'none'")
+		assert await browser_session.has_interactive_changes()
+
+		# added elements count even if only the full snapshot would see that they are clickable, but added scripts do not
+		await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+		await page.evaluate("() => document.head.appendChild(document.createElement('script'))")
+		assert not await browser_session.has_interactive_changes()
+		await page.evaluate(
+			"() => document.body.insertAdjacentHTML('beforeend', '<div style=\"cursor: pointer\">Suggestion</div>')"
+		)
+		assert await browser_session.has_interactive_changes()
+
+		# without a snapshot of the new document any change is possible
+		await browser_session.navigate(f'{base_url}/page1')
+		assert await browser_session.has_interactive_changes()
+
+	async def test_evaluate_in_frames(self, browser_session, base_url):
+		"""Test that frame evaluation targets the frame of an element directly and bounds slow frames by the timeout."""
+		await browser_session.navigate(f'{base_url}/iframe_select')
+		page = await browser_session.get_current_page()
+		await page.wait_for_function('document.querySelector("iframe").contentDocument?.getElementById("inner")')
+		state = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+		select = next(node for node in state.selector_map.values() if node.tag_name == 'select')
+
+		frame = await browser_session.get_frame_for_element(select)
+		assert frame is not None and frame is not page.main_frame
+
+		results = await browser_session.evaluate_in_frames(
+			'(xpath) => document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue?.id ?? null',
+			select.xpath,
+			element=select,
+		)
+		assert results == [(frame, 'inner')]
+
+		# every frame is evaluated concurrently and a hung frame does not block the others
+		start = time.monotonic()
+		results = await browser_session.evaluate_in_frames(
+			'() => window === window.top ? new Promise(() => {}) : document.title || "child"', timeout=0.5
+		)
+		assert time.monotonic() - start < 2
+		assert [result for _, result in results] == ['child']
+
+	async def test_read_page_content_in_browser(self, browser_session, base_url):
+		"""Test that the in-browser converter returns markdown of the rendered page only."""
+		from browser_use.controller.extraction.service import read_page_content
+
+		await browser_session.navigate(f'{base_url}/search')
+		page = await browser_session.get_current_page()
+		await page.evaluate('document.querySelector(".result").style.display = "none"')
+
+		page_content = await read_page_content(page, browser_session)
+
+		assert page_content.is_markdown
+		markdown = page_content.blocks[0]
+		assert markdown.startswith('Search Results\n\n# Search Results')
+		assert 'Result 2' in markdown and 'Result 3' in markdown
+		assert 'Result 1' not in markdown
+
 	async def test_registry_actions(self, controller, browser_session):
 		"""Test that the registry contains the expected default actions."""
 		# Check that common actions are registered
@@ -261,6 +411,94 @@ class TestControllerIntegration:
 			# If it fails due to DOM issues, that's expected in a test environment
 			assert 'Element index' in str(e) or 'does not exist' in str(e)
 
+	async def test_fill_form_action(self, controller, browser_session, base_url, http_server):
+		"""Test that fill_form sets text inputs, selects and checkboxes in one action and reports fields it cannot fill."""
+		http_server.expect_request('/signup').respond_with_data(
+			"""
+			<html>
+			<body>
+				<form>
+					<input type="text" id="name">
+					<textarea id="bio"></textarea>
+					<select id="plan"><option value="free">Free</option><option value="pro">Pro</option></select>
+					<input type="checkbox" id="terms">
+					<input type="radio" name="size" id="small" checked>
+					<input type="radio" name="size" id="large">
+					<input type="text" id="locked" disabled>
+				</form>
+				<script>
+					window.changes = [];
+					document.addEventListener('change', e => window.changes.push(e.target.id));
+				</script>
+			</body>
+			</html>
+			""",
+			content_type='text/html',
+		)
+		await browser_session.navigate(f'{base_url}/signup')
+		state = await browser_session.get_state_summary(cache_clickable_elements_hashes=False)
+		index = {node.attributes.get('id'): i for i, node in state.selector_map.items()}
+
+		class FillFormActionModel(ActionModel):
+			fill_form: FillFormAction | None = None
+
+		fields = [
+			FormField(index=index['name'], value='Ada Lovelace'),
+			FormField(index=index['bio'], value='Mathematician'),
+			FormField(index=index['plan'], value='Pro'),
+			FormField(index=index['terms'], value='true'),
+		]
+		result = await controller.act(FillFormActionModel(fill_form=FillFormAction(fields=fields)), browser_session)
+
+		assert result.error is None
+		assert 'Filled 4/4 form fields' in result.extracted_content
+		page = await browser_session.get_current_page()
+		values = await page.evaluate(
+			"""() => [
+				document.getElementById('name').value,
+				document.getElementById('bio').value,
+				document.getElementById('plan').value,
+				document.getElementById('terms').checked,
+			]"""
+		)
+		assert values == ['Ada Lovelace', 'Mathematician', 'pro', True]
+		assert set(await page.evaluate('window.changes')) == {'name', 'bio', 'plan', 'terms'}
+
+		# values are not echoed if any of them was a secret
+		fields = [FormField(index=index['name'], value='bob'), FormField(index=index['bio'], value='<secret>password</secret>')]
+		result = await controller.act(
+			FillFormActionModel(fill_form=FillFormAction(fields=fields)), browser_session, sensitive_data={'password': 'hunter2'}
+		)
+		assert 'Filled 2/2 form fields' in result.extracted_content
+		assert 'hunter2' not in result.extracted_content and 'bob' not in result.extracted_content
+
+		# a secret that matches no option is not echoed in the error either
+		fields = [FormField(index=index['plan'], value='<secret>password</secret>')]
+		result = await controller.act(
+			FillFormActionModel(fill_form=FillFormAction(fields=fields)), browser_session, sensitive_data={'password': 'hunter2'}
+		)
+		assert 'Filled 0/1 form fields' in result.error
+		assert f'select at index {index["plan"]}' in result.error and 'hunter2' not in result.error
+
+		# a checked radio button can't be unchecked by clicking it, checking the other option works
+		fields = [FormField(index=index['small'], value='false')]
+		result = await controller.act(FillFormActionModel(fill_form=FillFormAction(fields=fields)), browser_session)
+		assert 'cannot be unchecked' in result.error
+		fields = [FormField(index=index['large'], value='true')]
+		result = await controller.act(FillFormActionModel(fill_form=FillFormAction(fields=fields)), browser_session)
+		assert 'Filled 1/1 form fields' in result.extracted_content
+		checked = await page.evaluate(
+			"() => [document.getElementById('small').checked, document.getElementById('large').checked]"
+		)
+		assert checked == [False, True]
+
+		# disabled fields are reported without failing the whole action
+		if 'locked' in index:
+			fields = [FormField(index=index['name'], value='Grace Hopper'), FormField(index=index['locked'], value='x')]
+			result = await controller.act(FillFormActionModel(fill_form=FillFormAction(fields=fields)), browser_session)
+			assert 'Filled 1/2 form fields' in result.extracted_content
+			assert f'Failed to fill index {index["locked"]}' in result.extracted_content
+
 	async def test_error_handling(self, controller, browser_session):
 		"""Test error handling when an action fails."""
 		# Create an action with an invalid index
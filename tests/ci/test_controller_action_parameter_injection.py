@@ -1,5 +1,6 @@
 import asyncio
 import base64
+import io
 
 import pytest
 from pytest_httpserver import HTTPServer
@@ -232,6 +233,68 @@ class TestBrowserContext:
 		assert pixels_above_after_scroll >= 400, 'Page should be scrolled down at least 400px'
 		assert pixels_below_after_scroll < pixels_below_initial, 'Less content should be below viewport after scrolling'
 
+	@pytest.mark.asyncio
+	async def test_probe_page(self, browser_session, base_url):
+		"""Test that probe_page returns all page metrics from a single evaluate call."""
+		await browser_session.navigate(f'{base_url}/scroll_test')
+		page = await browser_session.get_current_page()
+		await browser_session.execute_javascript('window.scrollTo(0, 300)')
+
+		probe = await browser_session.probe_page(page, include_transfer_size=True)
+
+		assert probe.url == page.url
+		assert probe.title == 'Scroll Test'
+		assert probe.scroll_y == 300
+		assert probe.viewport_height == await page.evaluate('window.innerHeight')
+		assert probe.scroll_height >= 3000
+		assert probe.pixels_above == 300
+		assert probe.pixels_below == probe.scroll_height - 300 - probe.viewport_height
+		assert probe.transfer_bytes is not None
+
+		# transfer size is only collected when asked for
+		assert (await browser_session.probe_page(page)).transfer_bytes is None
+
+	@pytest.mark.asyncio
+	async def test_take_screenshot_tiles(self, browser_session, base_url):
+		"""Test that full-page tiles cover the page top to bottom with viewport-sized captures."""
+		await browser_session.navigate(f'{base_url}/scroll_test')
+		page = await browser_session.get_current_page()
+		probe = await browser_session.probe_page(page)
+
+		tiles = [tile async for tile in browser_session.take_screenshot_tiles(max_tiles=100)]
+
+		assert len(tiles) == -(-probe.scroll_height // probe.viewport_height)
+		assert tiles[0].top == 0
+		assert all(later.top == earlier.top + earlier.height for earlier, later in zip(tiles, tiles[1:]))
+		assert tiles[-1].top + tiles[-1].height == probe.scroll_height
+		for tile in tiles:
+			png = base64.b64decode(tile.screenshot)
+			# width and height from the png header
+			assert int.from_bytes(png[16:20], 'big') == tile.width
+			assert int.from_bytes(png[20:24], 'big') == tile.height
+
+		# the page was not scrolled to take them
+		assert (await browser_session.probe_page(page)).scroll_y == 0
+
+		assert not any(tile.truncated for tile in tiles)
+
+		# max_tiles bounds the capture, and the tiles say the page was cut off
+		truncated_tiles = [tile async for tile in browser_session.take_screenshot_tiles(max_tiles=2)]
+		assert len(truncated_tiles) == 2
+		assert all(tile.truncated for tile in truncated_tiles)
+
+	@pytest.mark.asyncio
+	async def test_take_stitched_screenshot(self, browser_session, base_url):
+		"""Test that tiles are stitched into one full-page image."""
+		Image = pytest.importorskip('PIL.Image')
+		await browser_session.navigate(f'{base_url}/scroll_test')
+		probe = await browser_session.probe_page(await browser_session.get_current_page())
+
+		screenshot = await browser_session.take_stitched_screenshot(max_tiles=100)
+
+		with Image.open(io.BytesIO(base64.b64decode(screenshot))) as image:
+			assert image.size == (probe.viewport_width, probe.scroll_height)
+
 	@pytest.mark.asyncio
 	async def test_take_screenshot(self, browser_session, base_url):
 		"""Test that take_screenshot returns a valid base64 encoded image."""
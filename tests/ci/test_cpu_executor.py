@@ -0,0 +1,45 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from browser_use.dom.service import DomService
+from browser_use.utils import get_cpu_executor, run_cpu_bound, set_cpu_executor
+
+
+@pytest.fixture
+def cpu_executor():
+	executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='test_cpu')
+	set_cpu_executor(executor)
+	yield executor
+	set_cpu_executor(None)
+	executor.shutdown()
+
+
+async def test_run_cpu_bound_inline_by_default():
+	set_cpu_executor(None)
+	assert get_cpu_executor() is None
+	assert await run_cpu_bound(threading.current_thread) is threading.current_thread()
+
+
+async def test_run_cpu_bound_uses_configured_executor(cpu_executor):
+	thread = await run_cpu_bound(threading.current_thread)
+	assert thread.name.startswith('test_cpu')
+	assert await run_cpu_bound(sorted, [3, 1, 2], reverse=True) == [3, 2, 1]
+
+
+async def test_construct_dom_tree_off_loop(cpu_executor):
+	eval_page = {
+		'rootId': '1',
+		'map': {
+			'0': {'tagName': 'button', 'xpath': 'html/body/button', 'isVisible': True, 'highlightIndex': 0, 'children': []},
+			'1': {'tagName': 'body', 'xpath': 'html/body', 'isVisible': True, 'children': ['0']},
+		},
+	}
+	dom_service = DomService(page=None)  # type: ignore  # no page needed to build the tree from an evaluated map
+
+	root, selector_map = await dom_service._construct_dom_tree(eval_page)
+
+	assert root.tag_name == 'body'
+	assert selector_map[0].tag_name == 'button'
+	assert selector_map[0].parent is root
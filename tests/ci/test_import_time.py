@@ -0,0 +1,60 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Imported only by the agent, extraction, telemetry and memory code paths, never needed to drive a browser
+HEAVY_MODULES = [
+	'langchain_core',
+	'browser_use.agent.service',
+	'browser_use.controller.service',
+	'markdownify',
+	'posthog',
+	'PIL',
+	'mem0',
+]
+
+
+def import_in_subprocess(statement: str) -> list[str]:
+	"""Runs the import statement in a fresh interpreter, returns which heavy modules it loaded"""
+	script = f"""
+import json, sys
+{statement}
+print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))
+"""
+	output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+	return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+	'statement',
+	[
+		'import browser_use',
+		'from browser_use import BrowserSession, BrowserProfile',
+		'from browser_use.dom.service import DomService',
+		'from browser_use.browser.views import BrowserStateSummary',
+	],
+)
+def test_browser_only_imports_skip_heavy_modules(statement):
+	assert import_in_subprocess(statement) == []
+
+
+def test_agent_import_loads_its_dependencies():
+	# the agent import pays for langchain, the controller and telemetry, the bare package must not
+	loaded = import_in_subprocess('from browser_use import Agent')
+	assert {'langchain_core', 'browser_use.agent.service', 'browser_use.controller.service'} <= set(loaded)
+
+
+def test_lazy_attributes():
+	import browser_use
+	from browser_use.agent.service import Agent
+	from browser_use.browser.session import BrowserSession
+
+	assert browser_use.Agent is Agent
+	assert browser_use.BrowserSession is BrowserSession
+	assert browser_use.Browser is BrowserSession
+	assert set(browser_use.__all__) <= set(dir(browser_use))
+
+	with pytest.raises(AttributeError):
+		browser_use.NotAName
@@ -0,0 +1,85 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from browser_use.agent.message_manager.service import MessageManager, MessageManagerSettings
+from browser_use.agent.views import MessageManagerState
+
+
+@pytest.fixture
+def message_manager():
+	return MessageManager(
+		task='Test task',
+		system_message=SystemMessage(content='System message'),
+		settings=MessageManagerSettings(compaction_max_tokens=2000, compaction_keep_last_steps=2),
+		state=MessageManagerState(),
+	)
+
+
+def add_step(message_manager: MessageManager, step: int) -> None:
+	"""Simulate the messages one agent step leaves behind in the history"""
+	message_manager._add_message_with_tokens(HumanMessage(content=f'Action result: extracted value {step}'))
+	tool_call = {
+		'name': 'AgentOutput',
+		'args': {
+			'current_state': {'evaluation_previous_goal': 'ok', 'memory': 'x' * 600, 'next_goal': f'goal {step}'},
+			'action': [{'click_element_by_index': {'index': step}}],
+		},
+		'id': str(message_manager.state.tool_id),
+		'type': 'tool_call',
+	}
+	message_manager._add_message_with_tokens(AIMessage(content='', tool_calls=[tool_call]))
+	message_manager.add_tool_message(content='')
+
+
+def test_compaction_noop_under_budget(message_manager):
+	add_step(message_manager, 1)
+	messages_before = list(message_manager.state.history.messages)
+
+	assert message_manager.compact_history() is False
+	assert message_manager.state.history.messages == messages_before
+
+
+def test_compaction_keeps_recent_steps_and_results(message_manager):
+	for step in range(1, 21):
+		add_step(message_manager, step)
+	assert message_manager.state.history.current_tokens > 2000
+	init_count = sum(1 for m in message_manager.state.history.messages if m.metadata.message_type == 'init')
+
+	assert message_manager.compact_history() is True
+
+	history = message_manager.state.history
+	assert history.current_tokens <= 2000
+	assert history.current_tokens == sum(m.metadata.tokens for m in history.messages)
+
+	# init messages are untouched and come first
+	assert all(m.metadata.message_type == 'init' for m in history.messages[:init_count])
+
+	# exactly one summary message with the goals, actions and extracted results of older steps
+	summaries = [m for m in history.messages if m.metadata.message_type == 'compacted']
+	assert len(summaries) == 1
+	summary = summaries[0].message.content
+	assert 'Action result: extracted value 18' in summary
+	assert 'goal 18 -> click_element_by_index({"index": 18})' in summary
+	assert 'x' * 600 not in summary
+
+	# the last two steps are verbatim, with matching tool call ids
+	recent = history.messages[-6:]
+	assert [type(m.message) for m in recent] == [HumanMessage, AIMessage, ToolMessage] * 2
+	assert recent[1].message.tool_calls[0]['args']['current_state']['next_goal'] == 'goal 19'
+	assert recent[4].message.tool_calls[0]['id'] == recent[5].message.tool_call_id
+
+
+def test_compaction_is_rolling(message_manager):
+	for step in range(1, 8):
+		add_step(message_manager, step)
+	message_manager.settings.compaction_max_tokens = 1500
+	assert message_manager.compact_history() is True
+
+	for step in range(8, 12):
+		add_step(message_manager, step)
+	assert message_manager.compact_history() is True
+
+	summaries = [m for m in message_manager.state.history.messages if m.metadata.message_type == 'compacted']
+	assert len(summaries) == 1
+	assert 'goal 9 ->' in summaries[0].message.content
+	assert 'goal 10 ->' not in summaries[0].message.content
@@ -0,0 +1,75 @@
+import pytest
+from pydantic import BaseModel
+
+from browser_use.agent.views import ActionResult
+from browser_use.controller.registry import service as registry_service
+from browser_use.controller.registry.service import Registry
+
+
+class SearchParams(BaseModel):
+	query: str
+	limit: int = 10
+
+
+@pytest.fixture
+def registry():
+	registry = Registry()
+	received = []
+
+	@registry.action('Search with a param model', param_model=SearchParams)
+	async def search(params: SearchParams, available_file_paths: list[str]):
+		received.append(params)
+		return ActionResult(extracted_content=f'{params.query} {params.limit} {available_file_paths}')
+
+	@registry.action('Type text')
+	def type_text(text: str, has_sensitive_data: bool = False, repeat: int = 1):
+		return ActionResult(extracted_content=f'{text * repeat} {has_sensitive_data}')
+
+	@registry.action('Needs a browser')
+	async def needs_browser(browser_session):
+		return ActionResult()
+
+	registry.received = received
+	return registry
+
+
+async def test_dispatch_plan_is_precomputed(registry, monkeypatch):
+	def fail(*args, **kwargs):
+		raise AssertionError('the signature is inspected at registration only')
+
+	monkeypatch.setattr(registry_service, 'signature', fail)
+
+	result = await registry.execute_action('search', {'query': 'shoes'}, available_file_paths=['a.txt'])
+	assert result.extracted_content == "shoes 10 ['a.txt']"
+
+	result = await registry.execute_action('type_text', {'text': 'ab', 'repeat': 2})
+	assert result.extracted_content == 'abab False'
+
+	with pytest.raises(RuntimeError, match='requires browser_session but none provided'):
+		await registry.execute_action('needs_browser', {})
+
+
+async def test_validated_params_are_not_validated_again(registry):
+	params = SearchParams(query='shoes', limit=3)
+	await registry.execute_action('search', params, available_file_paths=[])
+	assert registry.received[-1] is params
+
+	# placeholders are replaced in a copy, the original params keep the placeholder
+	params = SearchParams(query='<secret>name</secret>')
+	result = await registry.execute_action('search', params, sensitive_data={'name': 'boots'}, available_file_paths=[])
+	assert result.extracted_content == 'boots 10 []'
+	assert params.query == '<secret>name</secret>'
+
+	with pytest.raises(RuntimeError, match='Invalid parameters'):
+		await registry.execute_action('search', {'limit': 'many'})
+
+
+async def test_has_sensitive_data_is_set_when_a_placeholder_was_replaced(registry):
+	sensitive_data = {'password': 'hunter2'}
+
+	result = await registry.execute_action('type_text', {'text': '<secret>password</secret>'}, sensitive_data=sensitive_data)
+	assert result.extracted_content == 'hunter2 True'
+
+	# not only for input_text, and not when the params contain no secret
+	result = await registry.execute_action('type_text', {'text': 'bob'}, sensitive_data=sensitive_data)
+	assert result.extracted_content == 'bob False'
@@ -0,0 +1,44 @@
+import threading
+import time
+
+from browser_use.telemetry.service import TelemetryWorker
+from browser_use.telemetry.views import ControllerRegisteredFunctionsTelemetryEvent, RegisteredFunction
+
+
+def registered_functions_event(*names: str) -> ControllerRegisteredFunctionsTelemetryEvent:
+	return ControllerRegisteredFunctionsTelemetryEvent(
+		registered_functions=[RegisteredFunction(name=n, params={}) for n in names]
+	)
+
+
+def test_events_are_sent_off_thread_and_coalesced():
+	sent: list[tuple[str, str]] = []
+	worker = TelemetryWorker(lambda event: sent.append((event.name, threading.current_thread().name)))
+
+	for _ in range(10):
+		worker.submit(registered_functions_event('click', 'done'))
+	worker.submit(registered_functions_event('done', 'click'))  # same actions in another order
+	worker.submit(registered_functions_event('click', 'done', 'scroll'))
+
+	assert worker.flush(timeout=5)
+	assert len(sent) == 2
+	assert all(thread == 'browser_use_telemetry' for _, thread in sent)
+	assert (worker.events_sent, worker.events_coalesced, worker.events_dropped) == (2, 10, 0)
+
+
+def test_slow_sender_never_blocks_submit():
+	release = threading.Event()
+	worker = TelemetryWorker(lambda event: release.wait(5), max_queue_size=3)
+
+	start = time.monotonic()
+	for i in range(20):
+		worker.submit(registered_functions_event(f'action_{i}'))
+	assert time.monotonic() - start < 0.5
+
+	# one event is being sent, three wait in the queue, the rest were dropped
+	assert worker.events_dropped >= 20 - 1 - 3
+	assert not worker.flush(timeout=0.1)
+
+	release.set()
+	assert worker.flush(timeout=5)
+	assert worker.events_sent + worker.events_dropped == 20